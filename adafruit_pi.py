@@ -5,20 +5,42 @@
 import py_helper as ph
 from py_helper import DebugMode, CmdLineMode, DbgMsg, Msg, Taggable
 
-# SPI/I2C Libs
-import spidev
-import smbus
+# Microcontroller/Board Control/Circuit Playground Stuff (board, busio, adafruit_motorkit)
+# is imported on demand, only when the robot INI names a type that needs it
 
-# GPIO Zero Stuff
-import gpiozero as gpz
+from robotindustries_pi import *
 
-# Microcontroller/Board Control/Circuit Playground Stuff
-import board
-import digitalio
-import busio
-from adafruit_motorkit import MotorKit
+#
+# Constants
+#
 
-from robotindustries_pi import *
+# Vendor Plugin Declaration, hardware type : (builder, driver modules[, bus kind])
+hardware_types = {
+	"adafruit_motor_control" : ("build_motor_control", [ "board", "busio", "adafruit_motorkit" ], "i2c")
+}
+
+# PCA9685 Registers
+pca_mode1 = 0x00
+pca_mode1_ai = 0x20
+pca_led0_on_l = 0x06
+pca_prescale = 0xFE
+pca_channels = 16
+pca_full = 0x1000
+
+# MODE1 holds restart/sleep state the chip changes itself
+pca_registers = {
+	"mode1" : i2c_register(pca_mode1, 1, True, True),
+	"leds" : i2c_register(pca_led0_on_l, pca_channels * 4),
+	"prescale" : i2c_register(pca_prescale, 1)
+}
+
+# MotorKit DC Motor Channels (pwm, in1, in2)
+motorkit_channels = {
+	"m1": (8, 9, 10),
+	"m2": (13, 11, 12),
+	"m3": (2, 3, 4),
+	"m4": (7, 5, 6)
+}
 
 #
 # Classes
@@ -27,16 +49,111 @@ from robotindustries_pi import *
 class adafruit_motor_control(MotorController):
 	"""Adafruit Motor Class"""
 
+	_pca = None
+	_regs = None
+	_pwm_regs = None
+
 	def __init__(self, name, description=None):
+		if simulated():
+			from ri_sim import SimMotorKit as MotorKit
+		else:
+			from adafruit_motorkit import MotorKit
+
 		super().__init__(name, description, MotorKit())
 
-		m1 = Motor("m1", self.controller.motor1, None, "dc", 1)
-		m2 = Motor("m2", self.controller.motor2, None, "dc", 1)
-		m3 = Motor("m3", self.controller.motor3, None, "dc", 1)
-		m4 = Motor("m4", self.controller.motor4, None, "dc", 1)
+		m1 = Motor(name="m1", motor=self.controller.motor1, motor_type="dc", polarity=1)
+		m2 = Motor(name="m2", motor=self.controller.motor2, motor_type="dc", polarity=1)
+		m3 = Motor(name="m3", motor=self.controller.motor3, motor_type="dc", polarity=1)
+		m4 = Motor(name="m4", motor=self.controller.motor4, motor_type="dc", polarity=1)
 
 		self.motors.extend([ m1, m2, m3, m4 ])
 
+		self._pca = self.controller._pca
+		self._pwm_regs = bytearray(pca_channels * 4)
+
+		i2c_device = self._pca.i2c_device
+
+		self._regs = I2CDevice(i2c_device.device_address, transport=BusDeviceTransport(i2c_device), registers=pca_registers, name=self.name)
+
+		self._read_channels()
+
+		# Block writes across channels need register auto increment
+		mode1 = self._regs.read_byte(pca_mode1)
+
+		if not mode1 & pca_mode1_ai:
+			self._regs.write_byte(pca_mode1, mode1 | pca_mode1_ai)
+
+	def _read_channels(self):
+		"""Load PWM Registers From The PCA9685, Also Seeding The Device Shadow"""
+
+		self._pwm_regs[:] = self._regs.read(pca_led0_on_l, len(self._pwm_regs))
+
+	def _write_channels(self, first, last):
+		"""Write Channels first..last In One Auto Increment Burst, Unchanged Registers Are Not Sent"""
+
+		self._regs.write(pca_led0_on_l + (first * 4), memoryview(self._pwm_regs)[first * 4:(last + 1) * 4])
+
+	def _set_channel(self, channel, duty_cycle):
+		"""Set 16 Bit Duty Cycle In Register Shadow"""
+
+		if duty_cycle == 0xFFFF:
+			on, off = pca_full, 0
+		elif duty_cycle < 0x0010:
+			on, off = 0, pca_full
+		else:
+			on, off = 0, duty_cycle >> 4
+
+		offset = channel * 4
+
+		self._pwm_regs[offset] = on & 0xFF
+		self._pwm_regs[offset + 1] = on >> 8
+		self._pwm_regs[offset + 2] = off & 0xFF
+		self._pwm_regs[offset + 3] = off >> 8
+
+	def _set_throttle(self, channels, throttle):
+		"""Set DC Motor Throttle In Register Shadow, Same Fast Decay Scheme As adafruit_motor"""
+
+		pwm, in1, in2 = channels
+
+		if throttle == 0:
+			positive = negative = 0xFFFF
+		else:
+			duty_cycle = int(0xFFFF * abs(throttle))
+
+			positive, negative = (duty_cycle, 0) if throttle > 0 else (0, duty_cycle)
+
+		self._set_channel(pwm, 0xFFFF)
+		self._set_channel(in1, positive)
+		self._set_channel(in2, negative)
+
+	def apply(self, updates):
+		"""Compute Every Motor's Duty Cycle, Then Write Them In One I2C Transaction"""
+
+		first = last = None
+		others = list()
+
+		for motor, speed in updates:
+			channels = motorkit_channels.get(motor.name)
+
+			if channels is None:
+				others.append((motor, speed))
+				continue
+
+			motor.speed = motor.output(speed)
+
+			self._set_throttle(channels, motor.speed)
+
+			low = min(channels)
+			high = max(channels)
+
+			first = low if first is None or low < first else first
+			last = high if last is None or high > last else last
+
+		if first is not None:
+			self._write_channels(first, last)
+
+		super().apply(others)
+
 	def config(self, element_section=None):
 		"""Config Motor Controller Instance"""
 
@@ -52,46 +169,18 @@ class adafruit_motor_control(MotorController):
 # Functions
 #
 
-def adafruit_build_out(robot):
-	"""Run through elements, pick out Adafruit Hardware and build them out"""
-
-	built_elements = list()
-
-	my_devices = list(["adafruit_motor_control"])
+def build_motor_control(label, description, section):
+	"""Build Adafruit Motor HAT Controller"""
 
-	elements = [
-		robot.elements.motor_controls,
-		robot.elements.cameras,
-		robot.elements.sensors,
-		robot.elements.features ]
+	mc = adafruit_motor_control(label, description)
+	mc.config(section)
 
-	for element in elements:
-		for device in element:
-			section_label = element[device]
+	return mc
 
-			section = robot.get_element_section(section_label)
-
-			if section is not None:
-				if "hardware" in section:
-					description = section.get("description", fallback="No description")
-					device_type = section["hardware"]
-
-					if device_type in my_devices:
-						if device_type == my_devices[0]:
-							mc = adafruit_motor_control(section_label, description)
-							mc.config(section)
-
-							built_elements.append(mc)
-
-							robot.add(mc)
-					else:
-						pass
-				else:
-					DbgMsg("'hardware' not in section")
-			else:
-				DbgMsg(f"Attempt to get element section, {section_label}, from robot INI failed")
+def adafruit_build_out(robot):
+	"""Build Out Only Adafruit Hardware, See Robot.build_out"""
 
-	return built_elements
+	return robot.build_out(vendors=[ __name__ ])
 
 def adafruit_module_tests():
 	"""Test Function"""
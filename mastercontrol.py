@@ -5,38 +5,30 @@
 #
 
 # Python Stuff
+import time
+
+# For --profile-startup, import time counts towards start up
+started = time.perf_counter()
+
 import io
 import os
 import re
 import argparse
 import configparser
-import time
 import random
-import py_helper as ph
 
 # Froms
 
-from signal import pause
 from datetime import datetime
 
 # Py Helper Stoof
 import py_helper as ph
 from py_helper import DebugMode, CmdLineMode, DbgMsg, Msg
 
-# Electronics Stuff
-
-import gpiozero as pgz
-from gpiozero import *
-
-from bluedot import BlueDot
-
-# Robot Industries
+# Robot Industries, vendor modules are loaded from the [main] vendors key
 from robotindustries_pi import *
-import adafruit_pi as ap
-from adafruit_pi import adafruit_motor_control
 
-import sparkfun_pi as sfp
-from sparkfun_pi import SparkfunLumenati3x3
+imported = time.perf_counter()
 
 #
 # Variables
@@ -52,10 +44,59 @@ config = None
 running = True
 robot = None
 
+# BlueDot And The Motor Controller A Held Button Is Driving, Heartbeated Each Tick While Held
+bluedot = None
+held = None
+
 #
 # Functions
 #
 
+def hold_tick(now):
+	"""Heartbeat The Held Drive While BlueDot Reports The Client Connected"""
+
+	# Generated here, so it only covers a dropped connection and a stalled
+	# control loop, client events heartbeat through moved() and the presses
+	mc = held
+
+	if mc is not None and bluedot is not None and bluedot.is_connected:
+		mc.heartbeat()
+
+def hold(mc):
+	"""Button Held On mc, None On Release, hold_tick Only Runs While Held So The Loop Can Idle"""
+
+	global held
+
+	held = mc
+
+	if robot is None:
+		return
+
+	if mc is not None:
+		robot.scheduler.on_tick(hold_tick)
+	else:
+		robot.scheduler.remove_tick(hold_tick)
+
+def moved(pos):
+	"""Client Moved A Finger On A Held Button, Heartbeat The Drive It Holds"""
+
+	mc = held
+
+	if mc is not None:
+		mc.heartbeat()
+
+@tracer.traced(tr_handler)
+def disconnect():
+	"""BlueDot Client Disconnected"""
+
+	DbgMsg("BlueDot disconnected, halting...")
+
+	hold(None)
+
+	for mc in robot.motor_controls.values():
+		mc.halt()
+
+@tracer.traced(tr_handler)
 def exit_press(pos):
 	"""Blue Dot Exit Press Handler"""
 	global running
@@ -64,6 +105,9 @@ def exit_press(pos):
 
 	running = False
 
+	robot.stop()
+
+@tracer.traced(tr_handler)
 def led_press(pos):
 	"""LED Toggle"""
 
@@ -74,6 +118,7 @@ def led_press(pos):
 	else:
 		panel.on()
 
+@tracer.traced(tr_handler)
 def forward_press(pos):
 	"""Forward Press"""
 
@@ -82,6 +127,9 @@ def forward_press(pos):
 
 	mc.forward(1.0)
 
+	hold(mc)
+
+@tracer.traced(tr_handler)
 def forward_release(pos):
 	"""Forward Release"""
 
@@ -90,6 +138,9 @@ def forward_release(pos):
 
 	mc.halt()
 
+	hold(None)
+
+@tracer.traced(tr_handler)
 def reverse_press(pos):
 	"""Reverse Press"""
 
@@ -98,6 +149,9 @@ def reverse_press(pos):
 
 	mc.reverse(1.0)
 
+	hold(mc)
+
+@tracer.traced(tr_handler)
 def reverse_release(pos):
 	"""Reverse Release"""
 
@@ -106,6 +160,9 @@ def reverse_release(pos):
 
 	mc.halt()
 
+	hold(None)
+
+@tracer.traced(tr_handler)
 def left_press(pos):
 	"""Left Press"""
 
@@ -114,6 +171,9 @@ def left_press(pos):
 
 	mc.left_turn(1.0)
 
+	hold(mc)
+
+@tracer.traced(tr_handler)
 def left_release(pos):
 	"""Left Release"""
 
@@ -122,6 +182,9 @@ def left_release(pos):
 
 	mc.halt()
 
+	hold(None)
+
+@tracer.traced(tr_handler)
 def right_press(pos):
 	"""Right Press"""
 
@@ -130,6 +193,9 @@ def right_press(pos):
 
 	mc.right_turn(1.0)
 
+	hold(mc)
+
+@tracer.traced(tr_handler)
 def right_release(pos):
 	"""Right Release"""
 
@@ -138,6 +204,9 @@ def right_release(pos):
 
 	mc.halt()
 
+	hold(None)
+
+@tracer.traced(tr_handler)
 def halt_press(pos):
 	"""Halt Press"""
 
@@ -146,21 +215,27 @@ def halt_press(pos):
 
 	mc.halt()
 
+	hold(None)
+
+@tracer.traced(tr_handler)
 def servo_left(pos):
 	"""Servo Left"""
 
 	DbgMsg("Servo Left...")
 
+@tracer.traced(tr_handler)
 def servo_right(pos):
 	"""Servo Right"""
 
 	DbgMsg("Servo Right...")
 
+@tracer.traced(tr_handler)
 def servo_up(pos):
 	"""Servo Up"""
 
 	DbgMsg("Servo Up ...")
 
+@tracer.traced(tr_handler)
 def servo_down(pos):
 	"""Servo Down"""
 
@@ -168,7 +243,9 @@ def servo_down(pos):
 
 def run(robot, *args, **kwargs):
 	"""Run: Robot Mode"""
-	global running
+	global bluedot
+
+	from bluedot import BlueDot
 
 	#   For
 	# L  H  R X		(motors)
@@ -184,6 +261,7 @@ def run(robot, *args, **kwargs):
 	# Forward
 	bd[1,0].when_pressed = forward_press
 	bd[1,0].when_released = forward_release
+	bd[1,0].when_moved = moved
 	bd[1,0].square = True
 
 	# Halt
@@ -193,16 +271,19 @@ def run(robot, *args, **kwargs):
 	# Reverse
 	bd[1,2].when_pressed = reverse_press
 	bd[1,2].when_released = reverse_release
+	bd[1,2].when_moved = moved
 	bd[1,2].square = True
 
 	# left
 	bd[0,1].when_pressed = left_press
 	bd[0,1].when_released = left_release
+	bd[0,1].when_moved = moved
 	bd[0,1].square = True
 
 	# Right
 	bd[2,1].when_pressed = right_press
 	bd[2,1].when_released = right_release
+	bd[2,1].when_moved = moved
 	bd[2,1].square = True
 
 	# Exit
@@ -215,8 +296,12 @@ def run(robot, *args, **kwargs):
 	bd[2,3].when_pressed = servo_down
 	bd[3,3].when_pressed = servo_right
 
-	while running:
-		pause
+	# A held button only keeps driving while the client is connected
+	bd.when_client_disconnects = disconnect
+
+	bluedot = bd
+
+	# Robot.run hands the main thread to the scheduler once this returns
 
 def make_parser():
 	"""Make Parser"""
@@ -228,6 +313,10 @@ def make_parser():
 	parser_obj.add_argument("-d", "--debug", action="store_true", help="Enter Debug Mode")
 	parser_obj.add_argument("-t", "--test", action="store_true", help="Run test suite")
 	parser_obj.add_argument("-c", "--config", help="Config file for robot")
+	parser_obj.add_argument("--profile-startup", nargs="?", const="startup_profile.json", metavar="FILE",
+		help="Time start up phases, print a table and write JSON report (default startup_profile.json)")
+	parser_obj.add_argument("--web", action="store_true", help="Serve ri_flask with live telemetry beside the robot")
+	parser_obj.add_argument("--trace", action="store_true", help="Trace command latency per stage, print summary on exit")
 
 	return parser_obj
 
@@ -240,9 +329,7 @@ def load_config(config_file=None):
 		config_file = "config.ini"
 
 	if os.path.exists(config_file):
-		config_obj = configparser.ConfigParser()
-
-		config_obj.read(config_file)
+		config_obj = compile_config(config_file)
 
 		if "main" in config_obj:
 			if "debugmode" in config_obj["main"]:
@@ -285,16 +372,67 @@ if __name__ == "__main__":
 	if args.config is not None:
 		config_file = args.config
 
-	config = load_config(config_file)
+	profiler = StartupProfiler(started)
+	profiler.record("imports", "phase", imported - started, 0.0)
+
+	with profiler.phase("load_config"):
+		config = load_config(config_file)
+
+	with profiler.phase("Robot.config"):
+		robot = Robot(config_info=config,run=run)
 
-	robot = Robot(config_info=config,run=run)
+	with profiler.phase("build_out"):
+		built_elements = robot.build_out()
 
-	built_elements = ap.adafruit_build_out(robot)
-	built_elements.extend(sfp.sparkfun_build_out(robot))
+	for report in robot.build_reports:
+		if report.error is None:
+			DbgMsg(f"Built {report.label} ({report.hardware}, {report.vendor}) in {report.driver_seconds + report.build_seconds:0.3f}s")
+		else:
+			Msg(f"Failed to build {report.label} ({report.hardware}) : {report.error}")
+
+	DbgMsg(f"Build out critical path : {' -> '.join(robot.build_critical_path)}")
+
+	if args.profile_startup is not None:
+		def report_startup():
+			"""Scheduler Is Up, Commands Are Accepted From Here On"""
+
+			profiler.mark("ready")
+			profiler.collect(robot)
+			profiler.info["config"] = config_file
+
+			Msg(profiler.table(), ignoreModuleMode=True)
+
+			profiler.save(args.profile_startup)
+
+		if args.test:
+			report_startup()
+		else:
+			robot.scheduler.post(report_startup)
+
+	if args.trace:
+		tracer.enable()
+
+	if args.web:
+		import ri_flask
+
+		webgui = config["webgui"] if "webgui" in config else None
+
+		ri_flask.attach_robot(robot, webgui)
+		ri_flask.serve()
 
 	if args.test:
 		test(config, robot)
 	else:
 		robot.run()
 
+	if tracer.enabled:
+		Msg(tracer.table(), ignoreModuleMode=True)
+
+		for label, mc in robot.motor_controls.items():
+			if mc.watchdog is not None:
+				stats = mc.watchdog.stats()
+				latency = stats["latency"]
+
+				Msg(f"{label} watchdog : {stats['trips']} trips, deadline to halt p99 {latency.get('p99_us', 0.0):.0f}us max {latency.get('max_us', 0.0):.0f}us, realtime {stats['realtime']}", ignoreModuleMode=True)
+
 
@@ -0,0 +1,542 @@
+#!/usr/bin/env python
+
+#
+# Robot Industries - Command Latency Benchmarks On Simulated Hardware
+#
+
+#
+# Imports
+#
+
+# Python Stuff
+import os
+import sys
+import time
+import json
+import argparse
+import threading
+import platform
+
+# Benchmarks always run on the simulation backend, spinning gives the most accurate bus timing
+os.environ.setdefault("RI_BACKEND", "sim")
+os.environ.setdefault("RI_SIM_TIMING", "spin")
+
+import numpy as np
+
+# Py Helper Stoof
+from py_helper import DebugMode, CmdLineMode, Msg
+
+# Robot Industries
+from robotindustries_pi import *
+import ri_sim
+import sparkfun_pi as sfp
+import mastercontrol as mcp
+
+#
+# Variables
+#
+
+config_file = "arwen.ini"
+
+# Regression when p99 grows by more than this fraction over the baseline
+default_threshold = 0.10
+
+# Case Groups, direct calls straight into the write path, loop goes through
+# the running control loop (ramps, SPI transaction queue, command queue)
+g_direct = "direct"
+g_loop = "loop"
+
+# Registered benchmark cases, name : (setup, description, scaled, group, iterations)
+cases = dict()
+
+# INI motion profiles per controller, (shape, accel), restored for loop cases
+profiles = dict()
+
+# Scheduler thread while loop cases run
+loop_thread = None
+
+#
+# Functions
+#
+
+def case(name, description, scaled=False, group=g_direct, iterations=None):
+	"""Register Benchmark Case, Decorated Function Returns An event(iteration) Callable, iterations Caps Slow Cases"""
+
+	def register(setup):
+		cases[name] = (setup, description, scaled, group, iterations)
+
+		return setup
+
+	return register
+
+def make_robot(config_file):
+	"""Build Robot From INI On The Simulated Backend, Starting In Direct Mode"""
+
+	config = compile_config(config_file, use_cache=False)
+
+	DebugMode(False)
+
+	robot = Robot(config_info=config)
+	robot.build_out(parallel=False)
+
+	# No watchdog in either mode, a trip between events would land writes in the next one
+	for label, mc in robot.motor_controls.items():
+		profiles[label] = (mc.profile.shape, mc.profile.accel) if mc.profile is not None else (mp_none, 0.0)
+
+		mc.set_watchdog(None)
+
+	direct_mode(robot)
+
+	return robot
+
+def direct_mode(robot):
+	"""Stop The Control Loop, Ramps And SPI Queue Off So Writes Land Immediately"""
+
+	global loop_thread
+
+	if loop_thread is not None:
+		robot.stop()
+		loop_thread.join()
+		loop_thread = None
+
+	for mc in robot.motor_controls.values():
+		mc.set_profile(mp_none)
+
+	for feature in robot.features.values():
+		if isinstance(feature, SPIDevice):
+			feature.queue = None
+
+def loop_mode(robot):
+	"""Run The Control Loop With The INI Ramps And The SPI Queue, As In Production"""
+
+	global loop_thread
+
+	for label, mc in robot.motor_controls.items():
+		shape, accel = profiles[label]
+
+		mc.set_profile(shape, accel)
+
+	for feature in robot.features.values():
+		if isinstance(feature, SPIDevice):
+			feature.queue = robot.spi_queue
+
+	if loop_thread is None:
+		loop_thread = threading.Thread(target=robot.scheduler.run, name="bench-loop", daemon=True)
+		loop_thread.start()
+
+		while not robot.scheduler.running:
+			time.sleep(0.001)
+
+def settle(robot, timeout=5.0):
+	"""Wait Until Queued Commands, Ramps And Queued SPI Writes Have All Landed"""
+
+	deadline = time.perf_counter() + timeout
+
+	while time.perf_counter() < deadline:
+		# Posted callbacks run between ticks, so the tick in progress has finished
+		barrier = threading.Event()
+
+		robot.scheduler.post(barrier.set)
+		barrier.wait(timeout)
+
+		ramping = any([ mc.profile is not None and mc.profile.active for mc in robot.motor_controls.values() ])
+
+		if not ramping and robot.commands.pending() == 0 and robot.spi_queue.pending() == 0:
+			return
+
+		time.sleep(robot.scheduler.period / 4)
+
+def make_motor_controller(count):
+	"""Generic MotorController Driving count Simulated DC Motors, One Write Per Motor"""
+
+	mc = MotorController(name=f"bench{count}", description="Benchmark Controller")
+
+	for index in range(count):
+		kit = ri_sim.SimMotorKit(address=0x60 + (index // 4))
+
+		motor = Motor(name=f"m{index + 1}", motor=getattr(kit, f"motor{(index % 4) + 1}"))
+
+		mc.motors.append(motor)
+
+	mc.compile_dispatch()
+
+	return mc
+
+def alternate(iteration):
+	"""Alternate Direction So Every Event Changes Hardware State"""
+
+	return 1.0 if iteration % 2 == 0 else -1.0
+
+@case("api.single_motor", "Motor.set_speed on one motor")
+def single_motor(robot, count):
+	"""Single Motor"""
+
+	direct_mode(robot)
+
+	motor = make_motor_controller(1).motors[0]
+
+	return lambda iteration : motor.set_speed(alternate(iteration))
+
+@case("api.group", "MotorController.motion on a group of motors, one write per motor", scaled=True)
+def motor_group(robot, count):
+	"""Generic Motor Group"""
+
+	direct_mode(robot)
+
+	mc = make_motor_controller(count)
+
+	return lambda iteration : mc.motion(alternate(iteration))
+
+@case("api.motor_hat", "forward/reverse on the INI motor controller (batched PCA9685 path)")
+def motor_hat(robot, count):
+	"""INI Motor Controller"""
+
+	direct_mode(robot)
+
+	mc = robot.motor_controls["primary_drive"]
+
+	def event(iteration):
+		if iteration % 2 == 0:
+			mc.forward(1.0)
+		else:
+			mc.reverse(1.0)
+
+	return event
+
+@case("api.tb6612", "forward/reverse on a TB6612FNG driver, direction group write plus hardware PWM duty")
+def tb6612(robot, count):
+	"""TB6612FNG Motor Driver"""
+
+	direct_mode(robot)
+
+	mc = sfp.SparkfunMotorDriver("bench_tb6612", "Benchmark Driver")
+
+	def event(iteration):
+		if iteration % 2 == 0:
+			mc.forward(1.0)
+		else:
+			mc.reverse(1.0)
+
+	return event
+
+@case("handler.forward_press", "mastercontrol forward/reverse press handlers")
+def handler_press(robot, count):
+	"""BlueDot Style Input Handlers"""
+
+	direct_mode(robot)
+
+	mcp.robot = robot
+
+	def event(iteration):
+		if iteration % 2 == 0:
+			mcp.forward_press(None)
+		else:
+			mcp.reverse_press(None)
+
+	return event
+
+@case("flask.commands", "POST /api/commands drive batch, drained as the control tick would (tick wait excluded)")
+def flask_commands(robot, count):
+	"""JSON Command API"""
+
+	direct_mode(robot)
+
+	import ri_flask
+
+	ri_flask.attach_robot(robot)
+
+	client = ri_flask.app.test_client()
+
+	def event(iteration):
+		client.post("/api/commands", json=[ { "cmd" : "drive", "speed" : alternate(iteration), "controller" : "primary_drive" } ])
+		robot.commands.drain()
+
+	return event
+
+@case("led.frame", "Full frame update on a chain of Lumenati 3x3 panels", scaled=True)
+def led_frame(robot, count):
+	"""LED Frame Updates"""
+
+	direct_mode(robot)
+
+	panels = [ sfp.SparkfunLumenati3x3(f"panel{index}", "Benchmark Panel", bus=0, device=index) for index in range(count) ]
+
+	def event(iteration):
+		level = 255 if iteration % 2 == 0 else 0
+
+		for panel in panels:
+			panel.set_all(level, level, level, 8)
+			panel.write_pixels()
+
+	return event
+
+@case("gpio.direction", "TB6612 style direction change, AIN1/AIN2/BIN1/BIN2/STBY written as one group")
+def gpio_direction(robot, count):
+	"""GPIO Bank Group Writes"""
+
+	direct_mode(robot)
+
+	group = DigitalGPIOGroup({ "ain1" : 5, "ain2" : 24, "bin1" : 16, "bin2" : 20, "stby" : 26 })
+
+	def event(iteration):
+		forward = iteration % 2 == 0
+
+		group.write(ain1=forward, ain2=not forward, bin1=forward, bin2=not forward, stby=1)
+
+	return event
+
+@case("camera.frame", "Synthetic 640x480 frame encoded, published and read by several viewers", scaled=True)
+def camera_frame(robot, count):
+	"""Camera Frame Ring"""
+
+	direct_mode(robot)
+
+	source = SyntheticFrameSource(640, 480)
+	ring = FrameRing()
+
+	def event(iteration):
+		ring.write(source.capture())
+
+		for viewer in range(count):
+			ring.read(ring.sequence - 1)
+
+	return event
+
+@case("loop.motor_hat", "forward/reverse on the INI motor controller, ramped by its motion profile on control ticks", group=g_loop, iterations=10)
+def loop_motor_hat(robot, count):
+	"""INI Motor Controller Through The Control Loop"""
+
+	loop_mode(robot)
+
+	mc = robot.motor_controls["primary_drive"]
+
+	def event(iteration):
+		if iteration % 2 == 0:
+			mc.forward(1.0)
+		else:
+			mc.reverse(1.0)
+
+		settle(robot)
+
+	return event
+
+@case("loop.handler.forward_press", "mastercontrol forward/reverse press handlers, ramped on control ticks", group=g_loop, iterations=10)
+def loop_handler_press(robot, count):
+	"""BlueDot Style Input Handlers Through The Control Loop"""
+
+	loop_mode(robot)
+
+	mcp.robot = robot
+
+	def event(iteration):
+		if iteration % 2 == 0:
+			mcp.forward_press(None)
+		else:
+			mcp.reverse_press(None)
+
+		settle(robot)
+
+	return event
+
+@case("loop.flask.commands", "POST /api/commands drive batch, drained and ramped by the control tick", group=g_loop, iterations=10)
+def loop_flask_commands(robot, count):
+	"""JSON Command API Through The Control Loop"""
+
+	import ri_flask
+
+	loop_mode(robot)
+
+	ri_flask.attach_robot(robot)
+
+	client = ri_flask.app.test_client()
+
+	def event(iteration):
+		client.post("/api/commands", json=[ { "cmd" : "drive", "speed" : alternate(iteration), "controller" : "primary_drive" } ])
+
+		settle(robot)
+
+	return event
+
+@case("loop.led.frame", "Lumenati 3x3 frame through the SPI transaction queue, flushed on the next tick", group=g_loop, iterations=100)
+def loop_led_frame(robot, count):
+	"""LED Frame Updates Through The Control Loop"""
+
+	loop_mode(robot)
+
+	panel = robot.features["sparkfunlumenati3x3"]
+
+	def event(iteration):
+		level = 255 if iteration % 2 == 0 else 0
+
+		panel.set_all(level, level, level, 8)
+		panel.write_pixels()
+
+		settle(robot)
+
+	return event
+
+def measure(event, iterations, warmup):
+	"""Time From Event To The Last Simulated Bus Write Landing"""
+
+	samples = np.empty(iterations)
+	first = np.empty(iterations)
+	transfers = 0
+
+	for iteration in range(warmup + iterations):
+		ri_sim.recorder.clear()
+
+		start = time.perf_counter()
+
+		event(iteration)
+
+		landed = ri_sim.recorder.transfers()
+
+		finished = time.perf_counter()
+
+		if iteration >= warmup:
+			samples[iteration - warmup] = (landed[-1].timestamp if len(landed) > 0 else finished) - start
+			first[iteration - warmup] = (landed[0].timestamp if len(landed) > 0 else finished) - start
+			transfers += len(landed)
+
+	result = {
+		"iterations" : iterations,
+		"p50_us" : float(np.percentile(samples, 50) * 1e6),
+		"p99_us" : float(np.percentile(samples, 99) * 1e6),
+		"max_us" : float(np.max(samples) * 1e6),
+		"mean_us" : float(np.mean(samples) * 1e6),
+		"first_p50_us" : float(np.percentile(first, 50) * 1e6),
+		"first_p99_us" : float(np.percentile(first, 99) * 1e6),
+		"transfers_per_event" : transfers / float(iterations)
+	}
+
+	return result
+
+def run_benchmarks(robot, selected=None, counts=None, iterations=500, warmup=20, groups=None):
+	"""Run Registered Cases, Scaled Cases Run Once Per Count"""
+
+	if counts is None:
+		counts = [ 1, 2, 4, 8 ]
+
+	results = dict()
+
+	for name, (setup, description, scaled, group, limit) in cases.items():
+		if selected is not None and not any([ name.startswith(prefix) for prefix in selected ]):
+			continue
+
+		if groups is not None and not group in groups:
+			continue
+
+		# Loop cases wait out whole ramps, they are capped to keep a run short
+		case_iterations = min(iterations, limit) if limit is not None else iterations
+		case_warmup = min(warmup, 2) if limit is not None else warmup
+
+		for count in (counts if scaled else [ 1 ]):
+			label = f"{name}[{count}]" if scaled else name
+
+			results[label] = measure(setup(robot, count), case_iterations, case_warmup)
+
+	direct_mode(robot)
+
+	return results
+
+def compare(results, baseline, threshold=default_threshold):
+	"""Compare Against Baseline p99, Returns List of Regressed Cases"""
+
+	regressions = list()
+
+	for label, result in results.items():
+		if label in baseline:
+			ratio = result["p99_us"] / baseline[label]["p99_us"] if baseline[label]["p99_us"] > 0 else 1.0
+
+			result["baseline_p99_us"] = baseline[label]["p99_us"]
+			result["ratio"] = ratio
+
+			if ratio > 1.0 + threshold:
+				regressions.append(label)
+
+	return regressions
+
+def report(results, regressions=None):
+	"""Format Results Table"""
+
+	regressions = regressions or list()
+
+	width = max([ len(label) for label in results ] + [ 4 ])
+
+	lines = [ f"{'Case':<{width}}  {'p50 us':>10}  {'p99 us':>10}  {'max us':>10}  {'1st p99':>10}  {'xfers':>6}  {'vs base':>8}" ]
+	lines.append("-" * len(lines[0]))
+
+	for label, result in results.items():
+		ratio = f"{result['ratio']:.2f}x" if "ratio" in result else ""
+		flag = " !" if label in regressions else ""
+
+		lines.append(f"{label:<{width}}  {result['p50_us']:>10.1f}  {result['p99_us']:>10.1f}  {result['max_us']:>10.1f}  {result['first_p99_us']:>10.1f}  {result['transfers_per_event']:>6.1f}  {ratio:>8}{flag}")
+
+	return "\n".join(lines)
+
+def make_parser():
+	"""Make Parser"""
+
+	parser_obj = argparse.ArgumentParser(
+		prog="ri_bench",
+		description="Robot Industries command latency benchmarks on simulated hardware")
+
+	parser_obj.add_argument("-c", "--config", default=config_file, help="Config file for robot")
+	parser_obj.add_argument("-n", "--iterations", type=int, default=500, help="Timed events per case")
+	parser_obj.add_argument("-w", "--warmup", type=int, default=20, help="Untimed events per case")
+	parser_obj.add_argument("-k", "--case", action="append", help="Only run cases starting with this prefix")
+	parser_obj.add_argument("-g", "--group", action="append", choices=[ g_direct, g_loop ], help="Only run this group, direct write paths or through the control loop")
+	parser_obj.add_argument("--counts", default="1,2,4,8", help="Motor/device counts for scaled cases")
+	parser_obj.add_argument("-o", "--output", help="Write results as JSON")
+	parser_obj.add_argument("-b", "--baseline", help="Compare against saved results")
+	parser_obj.add_argument("--save-baseline", help="Save results as a new baseline")
+	parser_obj.add_argument("--trace", action="store_true", help="Also print per stage trace latencies")
+	parser_obj.add_argument("--threshold", type=float, default=default_threshold, help="Allowed p99 growth over baseline")
+
+	return parser_obj
+
+#
+# Main Loop
+#
+
+if __name__ == "__main__":
+	CmdLineMode(True)
+
+	args = make_parser().parse_args()
+
+	robot = make_robot(args.config)
+
+	if args.trace:
+		tracer.enable()
+
+	counts = [ int(count) for count in args.counts.split(",") ]
+
+	results = run_benchmarks(robot, args.case, counts, args.iterations, args.warmup, args.group)
+
+	regressions = list()
+
+	if args.baseline is not None:
+		with open(args.baseline) as baseline_file:
+			regressions = compare(results, json.load(baseline_file)["results"], args.threshold)
+
+	Msg(report(results, regressions))
+
+	if tracer.enabled:
+		Msg(tracer.table())
+
+	output = {
+		"timestamp" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"host" : platform.node(),
+		"python" : platform.python_version(),
+		"timing" : ri_sim.recorder.timing,
+		"results" : results
+	}
+
+	for filename in [ args.output, args.save_baseline ]:
+		if filename is not None:
+			with open(filename, "w") as result_file:
+				json.dump(output, result_file, indent=2)
+
+	if len(regressions) > 0:
+		Msg(f"p99 regressions over {args.threshold:.0%} : {', '.join(regressions)}")
+		sys.exit(1)
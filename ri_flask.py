@@ -12,6 +12,8 @@ import io
 import re
 import argparse
 import configparser
+import threading
+import json
 
 import py_helper as ph
 from py_helper import DebugMode, CmdLineMode, DbgMsg, Msg
@@ -24,7 +26,7 @@ from py_helper import DebugMode, DbgMsg, Msg, CmdLineMode
 
 import flask
 from flask import Flask
-from flask import request, abort, redirect
+from flask import request, abort, redirect, Response
 
 #
 # Top Level Flask Instance
@@ -35,6 +37,13 @@ app = Flask(__name__)
 # Constants
 #
 
+# Telemetry Defaults, Snapshots Per Second And Ring Slots
+telemetry_rate = 10.0
+telemetry_slots = 32
+
+# Seconds Between SSE Keepalive Comments When No Snapshots Arrive
+keepalive = 15.0
+
 #
 # Variables
 #
@@ -46,10 +55,71 @@ CurrentUser = None
 
 # Login Enabled
 
+# Attached Robot And Its Telemetry Producer
+robot = None
+telemetry = None
+telemetry_timer = None
+
 #
 # Classes
 #
 
+class TelemetryRing():
+	"""Fixed Size Ring of Encoded Snapshots, One Producer Feeding Any Number of Viewers"""
+
+	size = telemetry_slots
+	sequence = 0
+	viewers = 0
+	latest = None
+
+	def __init__(self, size=telemetry_slots):
+		"""Init Ring"""
+
+		self.size = size
+		self.sequence = 0
+		self.viewers = 0
+		self.latest = None
+		self._slots = [ None ] * size
+		self._cond = threading.Condition()
+
+	def publish(self, snapshot):
+		"""Encode Snapshot Once As An SSE Event And Wake Every Viewer"""
+
+		data = json.dumps(snapshot, separators=(",", ":"))
+
+		with self._cond:
+			self.sequence += 1
+			self.latest = data
+			self._slots[self.sequence % self.size] = f"id: {self.sequence}\nevent: snapshot\ndata: {data}\n\n".encode()
+			self._cond.notify_all()
+
+	def wait(self, after, timeout=keepalive):
+		"""Events Published After Sequence As One Batch, Viewers Lapped By The Ring Skip Ahead"""
+
+		with self._cond:
+			if not self._cond.wait_for(lambda : self.sequence > after, timeout):
+				return after, None
+
+			first = max(after + 1, self.sequence - self.size + 1)
+			batch = b"".join([ self._slots[sequence % self.size] for sequence in range(first, self.sequence + 1) ])
+
+			return self.sequence, batch
+
+	def stream(self, after=0):
+		"""SSE Generator For One Viewer"""
+
+		with self._cond:
+			self.viewers += 1
+
+		try:
+			while True:
+				after, batch = self.wait(after)
+
+				yield batch if batch is not None else b": keepalive\n\n"
+		finally:
+			with self._cond:
+				self.viewers -= 1
+
 #
 # Lambdas
 #
@@ -71,6 +141,159 @@ def Banner(msg):
 
 	return f"<h1>{msg}</h1>"
 
+def find_element(elements, label=None, capability=None):
+	"""Element By Label, Or The First One With The Given Method"""
+
+	if label is not None:
+		if not label in elements:
+			raise ValueError(f"No element named {label}")
+
+		return elements[label]
+
+	for element in elements.values():
+		if capability is None or hasattr(element, capability):
+			return element
+
+	raise ValueError(f"Nothing to run {capability or 'command'} on")
+
+def drive_motion(mc, speed):
+	"""Drive Forward, Reverse Or Halt By Sign of Speed"""
+
+	if speed > 0.0:
+		mc.forward(speed)
+	elif speed < 0.0:
+		mc.reverse(speed)
+	else:
+		mc.halt()
+
+def led_color(panel, color, brightness):
+	"""Fill LED Panel With One Color"""
+
+	panel.set_all(*color, brightness)
+	panel.write_pixels()
+	panel.state = any(color) and brightness > 0
+
+def parse_drive(command):
+	"""drive : { speed, [controller] }"""
+
+	mc = find_element(robot.motor_controls, command.get("controller"))
+	speed = max(-1.0, min(1.0, float(command["speed"])))
+
+	return ("motion", mc.name), drive_motion, (mc, speed)
+
+def parse_turn(command):
+	"""turn : { direction left|right, [speed], [duration], [stop], [controller] }"""
+
+	mc = find_element(robot.motor_controls, command.get("controller"))
+	direction = command.get("direction")
+
+	if not direction in [ "left", "right" ]:
+		raise ValueError(f"Unknown turn direction {direction}")
+
+	turn = mc.left_turn if direction == "left" else mc.right_turn
+	duration = command.get("duration")
+
+	args = (float(command.get("speed", 1.0)), float(duration) if duration is not None else None, bool(command.get("stop", False)))
+
+	return ("motion", mc.name), turn, args
+
+def parse_halt(command):
+	"""halt : { [controller] }"""
+
+	mc = find_element(robot.motor_controls, command.get("controller"))
+
+	return ("motion", mc.name), mc.halt, ()
+
+def parse_heartbeat(command):
+	"""heartbeat : { [controller] }, Keeps A Held Drive Alive Under The Deadman Watchdog"""
+
+	mc = find_element(robot.motor_controls, command.get("controller"))
+
+	return ("heartbeat", mc.name), mc.heartbeat, ()
+
+def parse_led(command):
+	"""led : { on true|false | color [ r, g, b ], [brightness], [feature] }"""
+
+	panel = find_element(robot.features, command.get("feature"), "on")
+
+	if "color" in command:
+		color = [ max(0, min(255, int(value))) for value in command["color"] ]
+
+		if len(color) != 3:
+			raise ValueError("LED color needs [ r, g, b ]")
+
+		return ("led", panel.name), led_color, (panel, color, int(command.get("brightness", 8)))
+
+	return ("led", panel.name), panel.on if command.get("on", True) else panel.off, ()
+
+# JSON command name : parser returning (coalescing key, callback, args), there
+# is no servo command, no element drives a pan/tilt servo yet so one is
+# rejected as unknown rather than queued to fail on the control tick
+command_types = {
+	"drive" : parse_drive,
+	"turn" : parse_turn,
+	"halt" : parse_halt,
+	"heartbeat" : parse_heartbeat,
+	"led" : parse_led
+}
+
+def queue_commands(commands):
+	"""Validate Batch And Queue It On The Robot, Returns Response Body"""
+
+	accepted = coalesced = 0
+	errors = list()
+
+	for index, command in enumerate(commands):
+		try:
+			if not isinstance(command, dict) or not command.get("cmd") in command_types:
+				raise ValueError("Unknown command")
+
+			name = command["cmd"]
+			key, callback, args = command_types[name](command)
+		except (ValueError, TypeError, KeyError) as err:
+			errors.append({ "index" : index, "error" : str(err) })
+			continue
+
+		accepted += 1
+
+		if robot.commands.submit(key, f"api.{name}", callback, *args):
+			coalesced += 1
+
+	return { "accepted" : accepted, "coalesced" : coalesced, "errors" : errors }
+
+def publish_snapshot():
+	"""Telemetry Producer, Runs On The Robot's Scheduler, Idle Without Viewers"""
+
+	if telemetry.viewers > 0:
+		telemetry.publish(robot.snapshot())
+
+def attach_robot(robot_obj, config_section=None):
+	"""Serve Telemetry For Robot, Rate/Ring Size From [webgui] telemetry_rate And telemetry_slots"""
+
+	global robot, telemetry, telemetry_timer
+
+	rate = telemetry_rate
+	slots = telemetry_slots
+
+	if config_section is not None:
+		rate = config_section.getfloat("telemetry_rate", fallback=telemetry_rate)
+		slots = config_section.getint("telemetry_slots", fallback=telemetry_slots)
+
+	if telemetry_timer is not None:
+		robot.scheduler.cancel(telemetry_timer)
+
+	robot = robot_obj
+	telemetry = TelemetryRing(slots)
+	telemetry_timer = robot.scheduler.call_every(1.0 / rate, publish_snapshot)
+
+def serve(host="0.0.0.0", port=5000):
+	"""Run Flask In A Daemon Thread Beside The Robot's Scheduler"""
+
+	thread = threading.Thread(target=app.run, name="ri_flask", kwargs={ "host" : host, "port" : port, "threaded" : True, "use_reloader" : False }, daemon=True)
+	thread.start()
+
+	return thread
+
 #
 # Flask Code
 #
@@ -97,7 +320,115 @@ def login():
 def main():
 	"""Main Control Window"""
 
-	return Banner("Main Route")
+	live = """<pre id="telemetry">Waiting for telemetry...</pre>
+<script>
+const view = document.getElementById("telemetry");
+const source = new EventSource("/telemetry");
+source.addEventListener("snapshot", (event) => { view.textContent = JSON.stringify(JSON.parse(event.data), null, 2); });
+</script>"""
+
+	return Banner("Main Route") + live
+
+@app.route("/telemetry")
+def telemetry_stream():
+	"""Server Sent Events Stream of Robot Snapshots"""
+
+	if telemetry is None:
+		abort(503)
+
+	# Reconnecting viewers resume after the last event they saw, new ones start with the next snapshot
+	after = request.headers.get("Last-Event-ID", default=telemetry.sequence, type=int)
+
+	# An ID past the current sequence is from before a server restart, start it as a new viewer
+	if after is None or after > telemetry.sequence:
+		after = telemetry.sequence
+
+	headers = { "Cache-Control" : "no-cache", "X-Accel-Buffering" : "no" }
+
+	return Response(telemetry.stream(max(0, after)), mimetype="text/event-stream", headers=headers)
+
+@app.route("/telemetry/latest")
+def telemetry_latest():
+	"""Most Recent Snapshot As JSON"""
+
+	if telemetry is None:
+		abort(503)
+
+	# The producer idles without stream viewers, so its last snapshot may be stale
+	if telemetry.viewers == 0 or telemetry.latest is None:
+		return Response(json.dumps(robot.snapshot()), mimetype="application/json")
+
+	return Response(telemetry.latest, mimetype="application/json")
+
+@app.route("/api/commands", methods=[ "POST" ])
+def api_commands():
+	"""Batch of JSON Commands, A List Or { "commands" : [ ... ] }, Run On The Next Control Tick"""
+
+	if robot is None:
+		abort(503)
+
+	body = request.get_json(silent=True)
+
+	if isinstance(body, dict):
+		body = body.get("commands")
+
+	if not isinstance(body, list):
+		abort(400)
+
+	return queue_commands(body), 202
+
+def mjpeg(camera):
+	"""multipart/x-mixed-replace Generator, Each Part Is A Shared Frame From The Camera's Ring"""
+
+	for sequence, frame in camera.ring.stream():
+		yield b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n" % len(frame)
+		yield frame
+		yield b"\r\n"
+
+def find_camera(label=None):
+	"""Started Camera By Label, Or The First One"""
+
+	if robot is None:
+		abort(503)
+
+	try:
+		camera = find_element(robot.cameras, label)
+	except ValueError:
+		abort(404)
+
+	if camera.ring is None or camera.ring.closed:
+		abort(503)
+
+	return camera
+
+@app.route("/camera")
+@app.route("/camera/<label>")
+def camera_stream(label=None):
+	"""MJPEG Stream, Slow Viewers Skip Frames Instead of Queueing Them"""
+
+	camera = find_camera(label)
+
+	headers = { "Cache-Control" : "no-cache", "X-Accel-Buffering" : "no" }
+
+	return Response(mjpeg(camera), mimetype="multipart/x-mixed-replace; boundary=frame", headers=headers)
+
+@app.route("/camera/<label>/frame")
+def camera_frame(label):
+	"""Latest Frame As A Single JPEG"""
+
+	camera = find_camera(label)
+
+	# Counted as a viewer until the next frame arrives, so an idle camera wakes up for it
+	frames = camera.ring.stream()
+
+	try:
+		sequence, frame = next(frames)
+	except StopIteration:
+		abort(503)
+	finally:
+		frames.close()
+
+	return Response(frame, mimetype="image/jpeg")
 
 @app.route("/credits")
 def credits():
@@ -0,0 +1,810 @@
+#
+# Robot Industries - Simulated Hardware Backends
+#
+
+#
+# Imports
+#
+
+# Standard/System Imports
+import os
+import time
+import math
+import random
+import struct
+import threading
+
+from collections import namedtuple, deque
+
+# My Stuff
+from py_helper import CmdLineMode, DbgMsg, Msg
+
+#
+# Definitions
+#
+
+# One recorded bus operation, seconds is the modeled time on the wire
+transfer = namedtuple("transfer", [ "timestamp", "kind", "bus", "target", "op", "nbytes", "data", "seconds" ])
+
+#
+# Constants
+#
+
+# Timing Modes, sleep and spin make the caller wait the modeled bus time
+tm_none = "none"
+tm_sleep = "sleep"
+tm_spin = "spin"
+
+# pigpio DMA PWM Frequencies At The Default 5us Sample Rate
+pwm_frequencies = [ 8000, 4000, 2000, 1600, 1000, 800, 500, 400, 320, 250, 200, 160, 100, 80, 50, 40, 20, 10 ]
+
+# Below this the wait is done spinning, time.sleep overshoots short waits
+spin_threshold = 0.002
+
+# Transfers the recorder keeps, oldest are dropped first (RI_SIM_LOG overrides)
+log_limit = 10000
+
+#
+# Classes
+#
+
+class BusTimingModel():
+	"""Bus Timing Model, Defaults Approximate A Raspberry Pi"""
+
+	# Per ioctl/syscall overhead
+	spi_overhead = 0.000020
+	i2c_overhead = 0.000050
+
+	# One pigpiod socket command round trip
+	gpio_overhead = 0.000060
+
+	# I2C clock, the Pi default is 100kHz, 9 clocks per byte (8 data + ACK)
+	i2c_speed = 100000
+
+	def __init__(self, spi_overhead=None, i2c_overhead=None, i2c_speed=None, gpio_overhead=None):
+		"""Init Timing Model"""
+
+		if spi_overhead is not None:
+			self.spi_overhead = spi_overhead
+		if i2c_overhead is not None:
+			self.i2c_overhead = i2c_overhead
+		if i2c_speed is not None:
+			self.i2c_speed = i2c_speed
+		if gpio_overhead is not None:
+			self.gpio_overhead = gpio_overhead
+
+	def spi_seconds(self, nbytes, speed_hz, bits_per_word=8):
+		"""Modeled Time Of One SPI Transfer"""
+
+		return self.spi_overhead + ((nbytes * bits_per_word) / float(speed_hz))
+
+	def i2c_seconds(self, nbytes, restart=False):
+		"""Modeled Time Of One I2C Transaction, Address Byte And Start/Stop Included"""
+
+		# Start + address, optional repeated start + address, stop
+		framing = 9 + 1 + (10 if restart else 0) + 1
+
+		return self.i2c_overhead + ((framing + (nbytes * 9)) / float(self.i2c_speed))
+
+	def gpio_seconds(self):
+		"""Modeled Time Of One pigpio Command"""
+
+		return self.gpio_overhead
+
+class SimRecorder():
+	"""Records Every Simulated Transfer And Waits Out The Modeled Bus Time"""
+
+	timing = tm_sleep
+	model = None
+	keep_data = True
+	limit = log_limit
+
+	def __init__(self, timing=None, model=None, limit=None):
+		"""Init Recorder, Keeping The Last limit Transfers"""
+
+		self.limit = limit if limit is not None else int(os.environ.get("RI_SIM_LOG", log_limit))
+
+		self._lock = threading.Lock()
+		self._log = deque(maxlen=self.limit)
+		self._bus_locks = dict()
+
+		self.timing = timing if timing is not None else os.environ.get("RI_SIM_TIMING", tm_sleep)
+		self.model = model if model is not None else BusTimingModel()
+
+	def bus_lock(self, kind, bus):
+		"""One Transfer At A Time Per Bus, Like The Kernel Driver"""
+
+		with self._lock:
+			key = (kind, bus)
+
+			if not key in self._bus_locks:
+				self._bus_locks[key] = threading.Lock()
+
+			return self._bus_locks[key]
+
+	def wait(self, seconds):
+		"""Wait Out Modeled Time"""
+
+		if self.timing == tm_none or seconds <= 0.0:
+			return
+
+		deadline = time.perf_counter() + seconds
+
+		if self.timing == tm_sleep and seconds > spin_threshold:
+			time.sleep(seconds - (spin_threshold / 2))
+
+		while time.perf_counter() < deadline:
+			pass
+
+	def record(self, kind, bus, target, op, data, seconds):
+		"""Record Transfer, Wait Modeled Time, Returns The Record"""
+
+		with self.bus_lock(kind, bus):
+			self.wait(seconds)
+
+			entry = transfer(time.perf_counter(), kind, bus, target, op, len(data), bytes(data) if self.keep_data else None, seconds)
+
+			with self._lock:
+				self._log.append(entry)
+
+		return entry
+
+	def transfers(self, kind=None):
+		"""Recorded Transfers"""
+
+		with self._lock:
+			return [ entry for entry in self._log if kind is None or entry.kind == kind ]
+
+	def clear(self):
+		"""Drop Recorded Transfers"""
+
+		with self._lock:
+			self._log.clear()
+
+	def stats(self):
+		"""Transfer Counts, Bytes And Modeled Bus Time Per Bus, Over The Kept Transfers"""
+
+		stats = dict()
+
+		for entry in self.transfers():
+			key = f"{entry.kind}:{entry.bus}"
+
+			bus = stats.setdefault(key, { "transfers" : 0, "bytes" : 0, "seconds" : 0.0 })
+			bus["transfers"] += 1
+			bus["bytes"] += entry.nbytes
+			bus["seconds"] += entry.seconds
+
+		return stats
+
+class SimI2CTarget():
+	"""Register File Of A Simulated I2C Device"""
+
+	address = 0
+	registers = None
+
+	def __init__(self, address, size=256):
+		"""Init Register File"""
+
+		self.address = address
+		self.registers = bytearray(size)
+
+	def write(self, register, data):
+		"""Write Registers, Auto Incrementing"""
+
+		end = register + len(data)
+
+		self.registers[register:end] = bytes(data)
+
+	def read(self, register, length):
+		"""Read Registers, Auto Incrementing"""
+
+		return self.registers[register:register + length]
+
+class SimI2CBus():
+	"""Simulated I2C Bus, Targets Are Created On First Access"""
+
+	bus = 1
+	targets = None
+
+	def __init__(self, bus=1):
+		"""Init Bus"""
+
+		self.bus = bus
+		self.targets = dict()
+
+	def attach(self, target):
+		"""Put A Behavioral Target On The Bus"""
+
+		self.targets[target.address] = target
+
+		return target
+
+	def target(self, address):
+		"""Get Target At Address"""
+
+		if not address in self.targets:
+			self.targets[address] = SimI2CTarget(address)
+
+		return self.targets[address]
+
+	def write(self, address, data):
+		"""Raw Write, First Byte Is The Register"""
+
+		recorder.record("i2c", self.bus, address, "write", data, recorder.model.i2c_seconds(len(data)))
+
+		if len(data) > 1:
+			self.target(address).write(data[0], data[1:])
+
+	def write_then_read(self, address, register, length):
+		"""Register Read With Repeated Start"""
+
+		recorder.record("i2c", self.bus, address, "read", bytes([ register ]), recorder.model.i2c_seconds(1 + length, restart=True))
+
+		return self.target(address).read(register, length)
+
+class SimSpiDev():
+	"""Stand In For spidev.SpiDev"""
+
+	bus = None
+	device = None
+
+	mode = 0
+	max_speed_hz = 500000
+	bits_per_word = 8
+	lsbfirst = False
+	cshigh = False
+	threewire = False
+	loop = False
+
+	def __init__(self):
+		"""Init Simulated SPI Device"""
+
+		self.bus = None
+		self.device = None
+
+	def open(self, bus, device):
+		"""Open"""
+
+		self.bus = bus
+		self.device = device
+
+	def close(self):
+		"""Close"""
+
+		self.bus = None
+		self.device = None
+
+	def _transfer(self, op, values, speed_hz=0):
+		"""Record One Transfer"""
+
+		if self.bus is None:
+			raise OSError("SPI device is not open")
+
+		speed_hz = speed_hz or self.max_speed_hz
+
+		recorder.record("spi", self.bus, self.device, op, values, recorder.model.spi_seconds(len(values), speed_hz, self.bits_per_word))
+
+		return [ 0 ] * len(values)
+
+	def readbytes(self, length):
+		"""Read Bytes"""
+
+		return self._transfer("readbytes", bytes(length))
+
+	def writebytes(self, values):
+		"""Write Bytes"""
+
+		self._transfer("writebytes", values)
+
+	def writebytes2(self, values):
+		"""Write Bytes, Any Buffer"""
+
+		self._transfer("writebytes2", values)
+
+	def xfer(self, values, speed_hz=0, delay_usecs=0, bits_per_word=0):
+		"""Transfer, CS Released Between Bytes"""
+
+		return self._transfer("xfer", values, speed_hz)
+
+	def xfer2(self, values, speed_hz=0, delay_usecs=0, bits_per_word=0):
+		"""Transfer, CS Held"""
+
+		return self._transfer("xfer2", values, speed_hz)
+
+	def xfer3(self, values, speed_hz=0, delay_usecs=0, bits_per_word=0):
+		"""Transfer, Large Buffers"""
+
+		return self._transfer("xfer3", values, speed_hz)
+
+class SimGPIO():
+	"""Simulated GPIO Block, Pin Modes And Bank 1 Levels Shared By All pigpio Connections"""
+
+	levels = 0
+	modes = None
+	pwm = None
+
+	def __init__(self):
+		"""Init GPIO Block, All Pins Inputs And Low"""
+
+		self._lock = threading.Lock()
+
+		self.clear()
+
+	def clear(self):
+		"""Back To Power On State"""
+
+		self.levels = 0
+		self.modes = dict()
+
+		# pin : [ frequency, duty cycle, range ]
+		self.pwm = dict()
+
+	def duty(self, pin):
+		"""PWM Duty Cycle Of A Pin, 0.0 To 1.0"""
+
+		frequency, duty, duty_range = self.pwm.get(pin, (0, 0, 1))
+
+		return duty / float(duty_range)
+
+	def drive(self, pin, level):
+		"""Drive An Input From Outside, A Button Or Sensor Line"""
+
+		with self._lock:
+			if level:
+				self.levels |= 1 << pin
+			else:
+				self.levels &= ~(1 << pin)
+
+class SimPigpio():
+	"""Stand In For pigpio.pi, Every Command Is Recorded As A gpio Transfer"""
+
+	connected = True
+
+	def __init__(self, host="localhost", port=8888):
+		"""Init Simulated pigpiod Connection"""
+
+		self.gpio = gpio_block()
+
+	def _command(self, op, bits):
+		"""Record One pigpiod Command"""
+
+		recorder.record("gpio", 1, bits, op, struct.pack("<I", bits & 0xFFFFFFFF), recorder.model.gpio_seconds())
+
+	def stop(self):
+		"""Disconnect"""
+
+		pass
+
+	def set_mode(self, gpio, mode):
+		"""Set Pin Mode"""
+
+		self._command("set_mode", 1 << gpio)
+
+		self.gpio.modes[gpio] = mode
+
+	def get_mode(self, gpio):
+		"""Get Pin Mode"""
+
+		return self.gpio.modes.get(gpio, 0)
+
+	def write(self, gpio, level):
+		"""Write One Pin"""
+
+		self._command("write", 1 << gpio)
+
+		self.gpio.drive(gpio, level)
+
+	def read(self, gpio):
+		"""Read One Pin"""
+
+		self._command("read", 1 << gpio)
+
+		return (self.gpio.levels >> gpio) & 1
+
+	def read_bank_1(self):
+		"""Read GPIO 0-31"""
+
+		self._command("read_bank_1", 0)
+
+		return self.gpio.levels
+
+	def set_bank_1(self, bits):
+		"""Set GPIO In bits High, One SET Register Write"""
+
+		self._command("set_bank_1", bits)
+
+		with self.gpio._lock:
+			self.gpio.levels |= bits
+
+	def clear_bank_1(self, bits):
+		"""Clear GPIO In bits Low, One CLR Register Write"""
+
+		self._command("clear_bank_1", bits)
+
+		with self.gpio._lock:
+			self.gpio.levels &= ~bits
+
+	def _pwm(self, gpio):
+		"""PWM State Of A Pin"""
+
+		return self.gpio.pwm.setdefault(gpio, [ 800, 0, 255 ])
+
+	def hardware_PWM(self, gpio, PWMfreq, PWMduty):
+		"""PWM Peripheral Output, Duty Cycle In Millionths"""
+
+		if not gpio in [ 12, 13, 18, 19 ]:
+			raise ValueError(f"GPIO {gpio} has no hardware PWM")
+
+		self._command("hardware_PWM", 1 << gpio)
+
+		self.gpio.pwm[gpio] = [ PWMfreq, PWMduty, 1000000 ]
+
+	def set_PWM_frequency(self, user_gpio, frequency):
+		"""DMA PWM Frequency, Returns The Nearest Available"""
+
+		self._command("set_PWM_frequency", 1 << user_gpio)
+
+		actual = min(pwm_frequencies, key=lambda available : abs(available - frequency))
+
+		self._pwm(user_gpio)[0] = actual
+
+		return actual
+
+	def set_PWM_range(self, user_gpio, range_):
+		"""DMA PWM Duty Cycle Range"""
+
+		self._command("set_PWM_range", 1 << user_gpio)
+
+		self._pwm(user_gpio)[2] = range_
+
+		return range_
+
+	def set_PWM_dutycycle(self, user_gpio, dutycycle):
+		"""DMA PWM Duty Cycle"""
+
+		self._command("set_PWM_dutycycle", 1 << user_gpio)
+
+		self._pwm(user_gpio)[1] = dutycycle
+
+	def get_PWM_dutycycle(self, user_gpio):
+		"""DMA PWM Duty Cycle"""
+
+		return self._pwm(user_gpio)[1]
+
+class SimSMBus():
+	"""Stand In For smbus.SMBus"""
+
+	bus = None
+
+	def __init__(self, bus=1):
+		"""Init Simulated SMBus"""
+
+		self.bus = i2c_bus(bus)
+
+	def close(self):
+		"""Close"""
+
+		pass
+
+	def write_byte_data(self, address, register, value):
+		"""Write One Register"""
+
+		self.bus.write(address, bytes([ register, value ]))
+
+	def read_byte_data(self, address, register):
+		"""Read One Register"""
+
+		return self.bus.write_then_read(address, register, 1)[0]
+
+	def write_word_data(self, address, register, value):
+		"""Write Register Pair, Little Endian"""
+
+		self.bus.write(address, bytes([ register, value & 0xFF, (value >> 8) & 0xFF ]))
+
+	def read_word_data(self, address, register):
+		"""Read Register Pair, Little Endian"""
+
+		data = self.bus.write_then_read(address, register, 2)
+
+		return data[0] | (data[1] << 8)
+
+	def write_i2c_block_data(self, address, register, data):
+		"""Block Write, Up To 32 Bytes"""
+
+		if len(data) > 32:
+			raise OSError("SMBus block writes are limited to 32 bytes")
+
+		self.bus.write(address, bytes([ register ]) + bytes(data))
+
+	def read_i2c_block_data(self, address, register, length=32):
+		"""Block Read, Up To 32 Bytes"""
+
+		if length > 32:
+			raise OSError("SMBus block reads are limited to 32 bytes")
+
+		return list(self.bus.write_then_read(address, register, length))
+
+class SimI2CDevice():
+	"""Stand In For adafruit_bus_device.i2c_device.I2CDevice"""
+
+	def __init__(self, bus, address):
+		"""Init Device"""
+
+		self.bus = bus
+		self.address = address
+		self.device_address = address
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		return False
+
+	def write(self, buf, start=0, end=None):
+		"""Write Buffer"""
+
+		self.bus.write(self.address, bytes(buf[start:end]))
+
+	def write_then_readinto(self, out_buffer, in_buffer, out_start=0, out_end=None, in_start=0, in_end=None):
+		"""Write Register Then Read Into Buffer"""
+
+		in_end = len(in_buffer) if in_end is None else in_end
+
+		data = self.bus.write_then_read(self.address, out_buffer[out_start], in_end - in_start)
+
+		in_buffer[in_start:in_end] = data
+
+class SimPCA9685():
+	"""Register Level Stand In For adafruit_pca9685.PCA9685"""
+
+	def __init__(self, bus, address=0x60):
+		"""Init PCA9685, Auto Increment On Like The Adafruit Driver Leaves It"""
+
+		self.i2c_device = SimI2CDevice(bus, address)
+
+		self.mode1_reg = 0xA0
+
+	@property
+	def mode1_reg(self):
+		"""MODE1 Register"""
+
+		data = bytearray(1)
+
+		with self.i2c_device as i2c:
+			i2c.write_then_readinto(bytes([ 0x00 ]), data)
+
+		return data[0]
+
+	@mode1_reg.setter
+	def mode1_reg(self, value):
+		"""MODE1 Register Setter"""
+
+		with self.i2c_device as i2c:
+			i2c.write(bytes([ 0x00, value ]))
+
+	def set_duty_cycle(self, channel, value):
+		"""Write One Channel, One Transaction Like PWMChannel.duty_cycle"""
+
+		if value == 0xFFFF:
+			on, off = 0x1000, 0
+		elif value < 0x0010:
+			on, off = 0, 0x1000
+		else:
+			on, off = 0, value >> 4
+
+		with self.i2c_device as i2c:
+			i2c.write(bytes([ 0x06 + (channel * 4), on & 0xFF, on >> 8, off & 0xFF, off >> 8 ]))
+
+class SimDCMotor():
+	"""Stand In For adafruit_motor.motor.DCMotor, Fast Decay"""
+
+	_throttle = None
+
+	def __init__(self, pca, channels):
+		"""Init Motor"""
+
+		self._pca = pca
+		self._channels = channels
+		self._throttle = None
+
+		pwm, in1, in2 = channels
+
+		pca.set_duty_cycle(pwm, 0xFFFF)
+
+	@property
+	def throttle(self):
+		"""Throttle"""
+
+		return self._throttle
+
+	@throttle.setter
+	def throttle(self, value):
+		"""Throttle Setter, Two Register Writes Like adafruit_motor"""
+
+		pwm, in1, in2 = self._channels
+
+		if value is None:
+			positive = negative = 0
+		elif value == 0:
+			positive = negative = 0xFFFF
+		else:
+			duty_cycle = int(0xFFFF * abs(value))
+
+			positive, negative = (duty_cycle, 0) if value > 0 else (0, duty_cycle)
+
+		self._pca.set_duty_cycle(in1, positive)
+		self._pca.set_duty_cycle(in2, negative)
+
+		self._throttle = value
+
+class SimMotorKit():
+	"""Stand In For adafruit_motorkit.MotorKit"""
+
+	def __init__(self, address=0x60, i2c=None, steppers_microsteps=16, pwm_frequency=1600.0):
+		"""Init Motor Kit On Simulated I2C Bus 1"""
+
+		self._pca = SimPCA9685(i2c_bus(1), address)
+
+		self.motor1 = SimDCMotor(self._pca, (8, 9, 10))
+		self.motor2 = SimDCMotor(self._pca, (13, 11, 12))
+		self.motor3 = SimDCMotor(self._pca, (2, 3, 4))
+		self.motor4 = SimDCMotor(self._pca, (7, 5, 6))
+
+class SimIMUMotion():
+	"""Level Robot Yawing At A Constant Rate, Seen By The Simulated LSM9DS1"""
+
+	yaw_rate = 30.0
+	noise = 0.002
+
+	# Earth field in gauss, horizontal (towards north) and vertical (down)
+	field = (0.2, 0.4)
+
+	def __init__(self, yaw_rate=30.0, noise=0.002):
+		"""Init Motion Model, yaw_rate In Degrees Per Second"""
+
+		self.yaw_rate = yaw_rate
+		self.noise = noise
+		self.origin = time.monotonic()
+
+	def heading(self, now=None):
+		"""True Heading In Radians"""
+
+		now = now if now is not None else time.monotonic()
+
+		return math.radians(self.yaw_rate * (now - self.origin))
+
+	def jitter(self):
+		"""Sensor Noise"""
+
+		return random.gauss(0.0, self.noise)
+
+class SimLSM9DS1AccelGyro(SimI2CTarget):
+	"""LSM9DS1 Accel/Gyro, Output Registers Follow The Motion Model"""
+
+	# Full scale 245 dps and 2 g
+	gyro_lsb = 0.00875
+	accel_lsb = 0.000061
+
+	def __init__(self, motion, address=0x6B):
+		"""Init Target"""
+
+		super().__init__(address)
+
+		self.motion = motion
+		self.registers[0x0F] = 0x68
+
+	def read(self, register, length):
+		"""Refresh Outputs, Then Read"""
+
+		gyro = [ self.motion.jitter(), self.motion.jitter(), self.motion.yaw_rate + self.motion.jitter() ]
+		accel = [ self.motion.jitter(), self.motion.jitter(), 1.0 + self.motion.jitter() ]
+
+		struct.pack_into("<3h", self.registers, 0x18, *[ clamp16(value / self.gyro_lsb) for value in gyro ])
+		struct.pack_into("<3h", self.registers, 0x28, *[ clamp16(value / self.accel_lsb) for value in accel ])
+
+		return super().read(register, length)
+
+class SimLSM9DS1Magnetometer(SimI2CTarget):
+	"""LSM9DS1 Magnetometer, Field Turns With The Modeled Heading"""
+
+	# Full scale 4 gauss
+	mag_lsb = 0.00014
+
+	def __init__(self, motion, address=0x1E):
+		"""Init Target"""
+
+		super().__init__(address)
+
+		self.motion = motion
+		self.registers[0x0F] = 0x3D
+
+	def read(self, register, length):
+		"""Refresh Outputs, Then Read, Bit 7 Of The Register Is The Auto Increment Flag"""
+
+		heading = self.motion.heading()
+		horizontal, vertical = self.motion.field
+
+		field = [ horizontal * math.cos(heading), -horizontal * math.sin(heading), -vertical ]
+
+		struct.pack_into("<3h", self.registers, 0x28, *[ clamp16((value + self.motion.jitter()) / self.mag_lsb) for value in field ])
+
+		return super().read(register & 0x7F, length)
+
+#
+# Variables
+#
+
+recorder = SimRecorder()
+
+i2c_buses = dict()
+
+sim_gpio = None
+
+#
+# Functions
+#
+
+def i2c_bus(bus=1):
+	"""Get Simulated I2C Bus"""
+
+	if not bus in i2c_buses:
+		i2c_buses[bus] = SimI2CBus(bus)
+
+	return i2c_buses[bus]
+
+def gpio_block():
+	"""Get Simulated GPIO Block"""
+
+	global sim_gpio
+
+	if sim_gpio is None:
+		sim_gpio = SimGPIO()
+
+	return sim_gpio
+
+def install_lsm9ds1(bus=1, ag_address=0x6B, m_address=0x1E, yaw_rate=30.0):
+	"""Put A Simulated LSM9DS1 (9DoF) On The Bus, Returns Its Motion Model"""
+
+	motion = SimIMUMotion(yaw_rate)
+	sim_bus = i2c_bus(bus)
+
+	sim_bus.attach(SimLSM9DS1AccelGyro(motion, ag_address))
+	sim_bus.attach(SimLSM9DS1Magnetometer(motion, m_address))
+
+	return motion
+
+def clamp16(value):
+	"""Round And Clamp To A Signed 16 Bit Register Value"""
+
+	return max(-32768, min(32767, int(round(value))))
+
+def install_gpiozero():
+	"""Point gpiozero At Its Mock Pin Factory, When gpiozero Is Installed"""
+
+	try:
+		from gpiozero import Device
+		from gpiozero.pins.mock import MockFactory
+	except ImportError:
+		DbgMsg("gpiozero is not installed, no mock pins")
+		return False
+
+	Device.pin_factory = MockFactory()
+
+	return True
+
+def reset():
+	"""Clear Recorded Transfers And Simulated Device State"""
+
+	recorder.clear()
+	i2c_buses.clear()
+
+	gpio_block().clear()
+
+#
+# Main Loop
+#
+
+if __name__ == "__main__":
+	CmdLineMode(True)
+
+	Msg("This module is not intended to be executed by itself")
@@ -12,8 +12,22 @@ import os
 import io
 import re
 import subprocess
-
-from collections import namedtuple
+import time
+import signal
+import threading
+import heapq
+import hashlib
+import pickle
+import configparser
+import importlib
+import concurrent.futures
+import json
+import platform
+import contextlib
+
+import numpy as np
+
+from collections import namedtuple, deque
 
 # Custom Imports
 
@@ -21,9 +35,7 @@ from collections import namedtuple
 import py_helper as ph
 from py_helper import DebugMode, DbgMsg, Msg, CmdLineMode, Taggable
 
-# SPI/I2C Libs
-import spidev
-import smbus
+# SPI/I2C Libs (spidev, smbus) are imported by the hardware backend, see spi_device/smbus_device
 
 # Might uses these as "PIN TYPE"
 pt_pi = 0
@@ -33,14 +45,21 @@ pt_other = 3
 
 pin_mappings = { }
 
-import gpiozero as gpz
-
 #
 # Definitions
 #
 
 robot_elements = namedtuple("robot_elements", [ "motor_controls", "cameras", "sensors", "features" ])
 
+# I2C Register Map Entries, volatile registers change on their own and are never write suppressed
+i2c_register = namedtuple("i2c_register", [ "register", "length", "writable", "volatile" ], defaults=[ 1, True, False ])
+
+# Vendor Plugin Registry Entries
+hardware_entry = namedtuple("hardware_entry", [ "vendor", "builder", "drivers", "bus" ])
+
+# Build Out Timing Per Device, started/finished are seconds from the start of build out
+build_report = namedtuple("build_report", [ "label", "hardware", "vendor", "bus", "driver_seconds", "build_seconds", "started", "finished", "error" ])
+
 #
 # Constants
 #
@@ -50,6 +69,25 @@ ts_tracked = "tracked"
 ts_steered = "steered"
 ts_fixedwheels = "fixedwheels"
 
+# Hardware Backends
+bk_hardware = "hw"
+bk_sim = "sim"
+
+# spidev Settings A Pooled Handle Returns To Unless The Device Sets Them
+spi_defaults = {
+	"mode" : 0,
+	"bits_per_word" : 8,
+	"lsbfirst" : False,
+	"cshigh" : False,
+	"threewire" : False,
+	"loop" : False
+}
+
+# Motion Profile Shapes
+mp_none = "none"
+mp_trapezoid = "trapezoid"
+mp_scurve = "scurve"
+
 # Operations
 op_forward = "forward"
 op_reverse = "reverse"
@@ -61,10 +99,66 @@ op_pan_left = "pan_left",
 op_elevate = "elevate",
 op_declinate = "declinate"
 
+# Trace Stages, Input To Bus
+tr_handler = "handler"
+tr_dispatch = "dispatch"
+tr_motor = "motor"
+tr_spi = "spi"
+tr_i2c = "i2c"
+tr_gpio = "gpio"
+
+# GPIO Pin Modes, Same Values As pigpio.INPUT/pigpio.OUTPUT
+gpio_input = 0
+gpio_output = 1
+
+# pigpio Bank 1 Covers GPIO 0-31, Everything On The 40 Pin Header
+gpio_bank_pins = 32
+
+# Deadman Watchdog SCHED_FIFO Priority, Below The Threaded IRQs (50) The Halt's Bus Transfer Needs
+watchdog_priority = 40
+
+# Camera Frame Sources
+cs_synthetic = "synthetic"
+cs_picamera = "picamera"
+
+# Vendor Plugin Declaration, hardware type : (builder, driver modules[, bus kind])
+hardware_types = {
+	"led" : ("build_led", [], "gpio"),
+	"pi_camera" : ("build_camera", [], "csi")
+}
+
 # Variables
 
+# Hardware Backend, RI_BACKEND in the environment or [main] backend in the INI
+backend = os.environ.get("RI_BACKEND", bk_hardware)
+
 # SPI Control
 __spi__ = None
+spi_lock = threading.Lock()
+
+# GPIO Bank Control
+__gpio__ = None
+gpio_lock = threading.Lock()
+
+# Parsed INI Spec Strings, Preloaded From Config Snapshots
+spec_cache = dict()
+
+# Bump When The Snapshot Layout Changes
+snapshot_version = 2
+snapshot_dir = ".ricache"
+
+# Trace Histograms Keep This Many Recent Samples Per Stage, Recent Traces Kept
+trace_window = 1024
+trace_keep = 64
+
+# Shared No-Op Span Handed Out While Tracing Is Off
+null_span = contextlib.nullcontext()
+
+# Element Sections Named In The Robot INI
+element_kinds = [ "motor_controls", "cameras", "sensors", "features" ]
+
+# Section Options Validated As Integers
+int_options = [ "pin", "pixels", "spi_bus", "spi_device", "spi_bus_speed", "bus_speed", "spi_mode" ]
 
 #
 # Classes
@@ -99,13 +193,20 @@ class ProductInfo(Taggable):
 	def get_specs_sv(self, specs, seperator=","):
 		"""Get Device specs from one line INI as a list of Separated values"""
 
-		spec_list = specs.split(seperator)
+		spec_list = spec_cache.get((specs, seperator))
 
-		return spec_list
+		if spec_list is None:
+			return specs.split(seperator)
+
+		# Callers may change the list, the cached one is shared
+		return list(spec_list)
 
 	def get_specs_dict(self, specs):
 		"""Get device specs from one line INI as a Dictionary"""
 
+		if type(specs) is str and specs in spec_cache:
+			return dict(spec_cache[specs])
+
 		spec_dict = dict()
 
 		if type(specs) is str:
@@ -120,6 +221,11 @@ class ProductInfo(Taggable):
 
 		return spec_dict
 
+	def telemetry(self):
+		"""Live State For Telemetry Snapshots, Override In Devices With State"""
+
+		return dict()
+
 	def pin_map(pin, pin_type=pt_pi):
 		"""Map Given Pin to pigpio PIN"""
 
@@ -171,45 +277,227 @@ class DeviceInfo(ProductInfo):
 		if "description" in config_section:
 			self.name = config_section["description"]
 
+class GPIOBank():
+	"""GPIO Bank 1 Through pigpio, Pins Changed Together Take One Set And/Or One Clear Write"""
+
+	# The BCM GPIO block has separate SET and CLR registers, so levels going
+	# the same way change in one write and a mixed change takes two. Clears
+	# go first (break before make), a half applied change only ever has pins
+	# dropped low. Driven levels are shadowed, pins already at their level
+	# are left out and a write that changes nothing never leaves the process
+
+	def __init__(self, pi=None):
+		"""Init GPIO Bank, pigpio Is Connected On First Use"""
+
+		self._pi = pi
+		self._lock = threading.Lock()
+
+		self.levels = 0
+		self.outputs = 0
+
+		self.writes = 0
+		self.suppressed = 0
+
+	def _get_pi(self):
+		"""Get pigpio Connection From The Selected Backend"""
+
+		if self._pi is None:
+			self._pi = pigpio_device()
+
+		return self._pi
+
+	def mask(self, pins):
+		"""Bit Mask For Pins"""
+
+		bits = 0
+
+		for pin in pins:
+			if pin < 0 or pin >= gpio_bank_pins:
+				raise ValueError(f"GPIO {pin} is not in bank 1")
+
+			bits |= 1 << pin
+
+		return bits
+
+	def setup(self, pins, mode=gpio_output):
+		"""Set Pin Modes, Output Levels Are Read Back To Seed The Shadow"""
+
+		pi = self._get_pi()
+
+		with self._lock:
+			for pin in pins:
+				pi.set_mode(pin, mode)
+
+			bits = self.mask(pins)
+
+			if mode == gpio_output:
+				self.outputs |= bits
+				self.levels = (self.levels & ~bits) | (pi.read_bank_1() & bits)
+			else:
+				self.outputs &= ~bits
+
+	def write_masks(self, set_bits=0, clear_bits=0, force=False):
+		"""Drive set_bits High And clear_bits Low, Returns Register Writes Made"""
+
+		with self._lock:
+			if not force:
+				set_bits &= ~self.levels
+				clear_bits &= self.levels
+
+			if set_bits == 0 and clear_bits == 0:
+				self.suppressed += 1
+
+				return 0
+
+			pi = self._get_pi()
+			count = 0
+
+			with tracer.span(tr_gpio, "bank1"):
+				if clear_bits:
+					pi.clear_bank_1(clear_bits)
+					count += 1
+
+				if set_bits:
+					pi.set_bank_1(set_bits)
+					count += 1
+
+			self.levels = (self.levels | set_bits) & ~clear_bits
+			self.writes += count
+
+		return count
+
+	def write_group(self, levels, force=False):
+		"""Write { pin : level } Together, Returns Register Writes Made"""
+
+		set_bits = 0
+		clear_bits = 0
+
+		for pin, level in levels.items():
+			if level:
+				set_bits |= self.mask([ pin ])
+			else:
+				clear_bits |= self.mask([ pin ])
+
+		return self.write_masks(set_bits, clear_bits, force)
+
+	def read_bank(self):
+		"""Read Levels Of GPIO 0-31 In One Call"""
+
+		return self._get_pi().read_bank_1()
+
+	def read(self, pin):
+		"""Read One Pin"""
+
+		return (self.read_bank() >> pin) & 1
+
+	def invalidate(self):
+		"""Reread Output Levels Into The Shadow, After Something Else Drove The Pins"""
+
+		bank = self.read_bank()
+
+		with self._lock:
+			self.levels = bank & self.outputs
+
+	def read_group(self, pins):
+		"""Read { pin : level } From One Bank Read"""
+
+		bank = self.read_bank()
+
+		return { pin : (bank >> pin) & 1 for pin in pins }
+
+	def stats(self):
+		"""Write And Suppression Counters"""
+
+		return {
+			"writes" : self.writes,
+			"suppressed" : self.suppressed,
+			"levels" : self.levels,
+			"outputs" : self.outputs
+		}
+
+	def close(self):
+		"""Release pigpio Connection"""
+
+		with self._lock:
+			if self._pi is not None:
+				self._pi.stop()
+				self._pi = None
+
+class DigitalGPIOGroup():
+	"""Named GPIO Pins Written Together Through The Bank"""
+
+	pins = None
+	bank = None
+
+	def __init__(self, pins, bank=None, mode=gpio_output):
+		"""Init Group From { name : pin }"""
+
+		self.pins = dict(pins)
+		self.bank = bank if bank is not None else gpio_bank()
+
+		self.bank.setup(list(self.pins.values()), mode)
+
+	def write(self, levels=None, force=False, **named):
+		"""Write { name : level } And/Or name=level Together, Returns Register Writes Made"""
+
+		levels = dict(levels or dict(), **named)
+
+		return self.bank.write_group({ self.pins[name] : level for name, level in levels.items() }, force)
+
+	def read(self):
+		"""Read { name : level } From One Bank Read"""
+
+		bank = self.bank.read_bank()
+
+		return { name : (bank >> pin) & 1 for name, pin in self.pins.items() }
+
 class DigitalGPIODevice(DeviceInfo):
 	"""Simple DigitalGPIO Device"""
 
 	pin = None
+	bank = None
+	mode = None
 
-	def __init__(self, pin=None, name=None, description=None, config_section=None):
+	def __init__(self, pin=None, name=None, description=None, config_section=None, bank=None):
 		"""Initialize Instance of Digital GPIO Device"""
 
 		if pin is not None:
 			self.pin = pin
 
+		self.bank = bank
+
 		super(DeviceInfo,self).__init__(name, description, config_section=config_section)
 
 		if config_section is not None:
 			self.config(config_section)
 
+	def _get_bank(self, mode):
+		"""Get Bank With The Pin In mode"""
+
+		if self.bank is None:
+			self.bank = gpio_bank()
+
+		if self.mode != mode:
+			self.bank.setup([ self.pin ], mode)
+			self.mode = mode
+
+		return self.bank
+
 	def read(self):
 		"""Read from PIN"""
 
 		value = None
 
-		# TODO : convert to gpiozero
-
-		#if self.pig_obj is not None and self.pin is not None:
-		#	self.pig_obj.set_mode(self.pin, pigpio.INPUT)
-		#	value = self.pig_obj.read(self.pin)
+		if self.pin is not None:
+			value = self._get_bank(self.mode if self.mode is not None else gpio_input).read(self.pin)
 
 		return value
 
 	def write(self, value):
 		"""Write to PIN"""
 
-		# TODO : Convert to gpiozero
-
-		#if self.pig_obj is not None and self.pin is not None:
-		#	self.pig_obj.set_mode(self.pin, pigpio.OUTPUT)
-		#	self.pig_obj.write(self.pin, value)
-
-		pass
+		if self.pin is not None:
+			self._get_bank(gpio_output).write_group({ self.pin : value })
 
 	def config(self, config_section):
 		"""Config Device from INI Section"""
@@ -217,30 +505,397 @@ class DigitalGPIODevice(DeviceInfo):
 		if "pin" in config_section:
 			self.pin = config_section.getint("pin", fallback=None)
 
+class SMBusTransport():
+	"""I2C Register Access Through smbus, Blocks Split At The 32 Byte SMBus Limit"""
+
+	bus = 1
+	block_limit = 32
+
+	def __init__(self, bus=1):
+		"""Init Transport, The Bus Is Opened On First Use"""
+
+		self.bus = bus
+		self._smbus = None
+
+	def _get_bus(self):
+		"""Get smbus From The Selected Backend"""
+
+		if self._smbus is None:
+			self._smbus = smbus_device(self.bus)
+
+		return self._smbus
+
+	def write(self, address, register, data):
+		"""Write Registers Starting At register"""
+
+		smbus = self._get_bus()
+
+		if len(data) == 1:
+			smbus.write_byte_data(address, register, data[0])
+			return
+
+		for offset in range(0, len(data), self.block_limit):
+			smbus.write_i2c_block_data(address, register + offset, list(data[offset:offset + self.block_limit]))
+
+	def read(self, address, register, length):
+		"""Read Registers Starting At register"""
+
+		smbus = self._get_bus()
+
+		data = bytearray()
+
+		for offset in range(0, length, self.block_limit):
+			data.extend(smbus.read_i2c_block_data(address, register + offset, min(self.block_limit, length - offset)))
+
+		return bytes(data)
+
+	def close(self):
+		"""Close Bus"""
+
+		if self._smbus is not None:
+			self._smbus.close()
+			self._smbus = None
+
+class BusDeviceTransport():
+	"""I2C Register Access Through An adafruit_bus_device I2CDevice, Any Length In One Transaction"""
+
+	i2c_device = None
+
+	def __init__(self, i2c_device):
+		"""Init Transport"""
+
+		self.i2c_device = i2c_device
+
+	def write(self, address, register, data):
+		"""Write Registers Starting At register"""
+
+		burst = bytearray(1 + len(data))
+
+		burst[0] = register
+		burst[1:] = data
+
+		with self.i2c_device as i2c:
+			i2c.write(burst)
+
+	def read(self, address, register, length):
+		"""Read Registers Starting At register"""
+
+		data = bytearray(length)
+
+		with self.i2c_device as i2c:
+			i2c.write_then_readinto(bytes([ register ]), data)
+
+		return bytes(data)
+
+	def close(self):
+		"""Nothing To Close, The Driver Owns The Bus"""
+
+		pass
+
 class I2CDevice():
-	"""I2C Bus Communications"""
+	"""Register Level I2C Device, Writes That Would Not Change The Device Are Skipped"""
+
+	# Every register written or read is kept in a shadow copy, a write whose
+	# bytes all match the shadow never reaches the bus and a partly changed
+	# block is trimmed to the changed bytes (devices auto increment). Volatile
+	# registers are always written. Transports provide write(address,
+	# register, data), read(address, register, length) and close()
 
 	address = None
+	bus = 1
+	name = None
+	registers = None
+	transport = None
+	trim = True
 
-	def __init__(self, address):
+	def __init__(self, address, bus=1, transport=None, registers=None, name=None):
 		"""Init I2C Comm Instance"""
 
 		self.address = address
+		self.bus = bus
+		self.transport = transport if transport is not None else SMBusTransport(bus)
+		self.registers = dict(registers) if registers is not None else dict()
+		self.name = name if name is not None else f"i2c:{bus}:0x{address:02x}"
+
+		self._lock = threading.Lock()
+		self._shadow = bytearray(256)
+		self._known = bytearray(256)
+		self._volatile = bytearray(256)
+
+		for spec in self.registers.values():
+			if spec.volatile:
+				self._volatile[spec.register:spec.register + spec.length] = b"\x01" * spec.length
+
+		self.writes = 0
+		self.suppressed = 0
+		self.bytes_sent = 0
+		self.bytes_suppressed = 0
+
+	def _changed(self, register, data):
+		"""Offsets Of The First And Last Bytes That Differ From The Shadow, None If None Do"""
+
+		shadow = self._shadow
+		known = self._known
+		volatile = self._volatile
+
+		changed = [ offset for offset in range(len(data)) if volatile[register + offset] or not known[register + offset] or shadow[register + offset] != data[offset] ]
+
+		if len(changed) == 0:
+			return None
+
+		return changed[0], changed[-1]
+
+	def write(self, register, data, force=False):
+		"""Write Registers From register, Returns Number of Bytes Sent On The Bus"""
+
+		end = register + len(data)
+
+		with self._lock:
+			if force:
+				first, last = 0, len(data) - 1
+			else:
+				span = self._changed(register, data)
+
+				if span is None:
+					self.suppressed += 1
+					self.bytes_suppressed += len(data)
+
+					return 0
+
+				first, last = span if self.trim else (0, len(data) - 1)
+
+			payload = data[first:last + 1]
+
+			with tracer.span(tr_i2c, self.name):
+				self.transport.write(self.address, register + first, payload)
+
+			self._shadow[register:end] = data
+			self._known[register:end] = b"\x01" * len(data)
+
+			self.writes += 1
+			self.bytes_sent += len(payload)
+			self.bytes_suppressed += len(data) - len(payload)
+
+		return len(payload)
+
+	def read(self, register, length):
+		"""Read Registers From register, Refreshing The Shadow"""
+
+		with self._lock:
+			data = self.transport.read(self.address, register, length)
+
+			self._shadow[register:register + length] = data
+			self._known[register:register + length] = b"\x01" * length
+
+		return data
+
+	def write_byte(self, register, value, force=False):
+		"""Write One Register"""
+
+		return self.write(register, bytes([ value & 0xFF ]), force)
+
+	def read_byte(self, register):
+		"""Read One Register"""
+
+		return self.read(register, 1)[0]
+
+	def write_register(self, name, value, force=False):
+		"""Write Mapped Register, Integers Are Little Endian Over The Register's Length"""
+
+		spec = self.registers[name]
+
+		if not spec.writable:
+			raise ValueError(f"Register {name} on {self.name} is read only")
+
+		if isinstance(value, int):
+			value = value.to_bytes(spec.length, "little", signed=value < 0)
+
+		return self.write(spec.register, value, force)
+
+	def read_register(self, name, signed=False):
+		"""Read Mapped Register As A Little Endian Integer"""
+
+		spec = self.registers[name]
+
+		return int.from_bytes(self.read(spec.register, spec.length), "little", signed=signed)
+
+	def invalidate(self, register=0, length=256):
+		"""Forget Shadowed Values, After A Device Reset For Instance"""
+
+		with self._lock:
+			self._known[register:register + length] = bytes(length)
+
+	def stats(self):
+		"""Write And Suppression Counters"""
+
+		return {
+			"writes" : self.writes,
+			"suppressed" : self.suppressed,
+			"bytes_sent" : self.bytes_sent,
+			"bytes_suppressed" : self.bytes_suppressed
+		}
+
+	def close(self):
+		"""Close Transport"""
+
+		self.transport.close()
+
+class SPIBusHandle():
+	"""Pooled spidev Handle For One Bus/Chip Select"""
+
+	bus = 0
+	device = 0
+	spi = None
+	lock = None
+	users = 0
+	is_open = False
+	settings = None
+
+	def __init__(self, bus, device, lock):
+		"""Init Pooled Handle"""
+
+		self.bus = bus
+		self.device = device
+		self.lock = lock
+		self.users = 0
+		self.is_open = False
+		self.settings = dict()
+		self.spi = spi_device()
+
+	def open(self):
+		"""Open Handle If Not Already Open"""
+
+		if not self.is_open:
+			self.spi.open(self.bus, self.device)
+			self.is_open = True
+
+			# Fresh fd, driver defaults apply again
+			self.settings.clear()
+
+	def _set(self, name, value):
+		"""Set One spidev Attribute When It Differs From The Handle"""
+
+		if self.settings.get(name) != value:
+			setattr(self.spi, name, value)
+			self.settings[name] = value
+
+	def apply(self, settings):
+		"""Apply Device Settings Over spi_defaults, Only Touching Those That Changed"""
+
+		# Anything the device leaves unset goes back to its default, so a
+		# mode or flag set by another device on this handle never carries over
+		for name, default in spi_defaults.items():
+			value = settings.get(name)
+
+			self._set(name, default if value is None else value)
+
+		for name, value in settings.items():
+			if value is not None and not name in spi_defaults:
+				self._set(name, value)
+
+	def prepare(self, settings):
+		"""Open And Apply Settings, Call With lock Held"""
+
+		if not self.is_open:
+			self.open()
+
+		self.apply(settings)
+
+		return self.spi
+
+	def close(self):
+		"""Close Handle"""
+
+		if self.is_open:
+			self.spi.close()
+			self.is_open = False
+			self.settings.clear()
+
+class SPIBusManager():
+	"""Process Wide SPI Bus Manager, Pools Open Handles Per (bus, device)"""
+
+	def __init__(self):
+		"""Init SPI Bus Manager"""
+
+		self._lock = threading.Lock()
+		self._handles = dict()
+		self._bus_locks = dict()
+
+	def bus_lock(self, bus):
+		"""Get Lock Serializing Access To A Bus"""
+
+		with self._lock:
+			if not bus in self._bus_locks:
+				self._bus_locks[bus] = threading.RLock()
+
+			return self._bus_locks[bus]
+
+	def attach(self, bus, device):
+		"""Get Pooled Handle For (bus, device)"""
+
+		lock = self.bus_lock(bus)
+
+		with self._lock:
+			key = (bus, device)
+
+			if not key in self._handles:
+				self._handles[key] = SPIBusHandle(bus, device, lock)
+
+			handle = self._handles[key]
+			handle.users += 1
+
+		return handle
+
+	def release(self, handle):
+		"""Release Pooled Handle, Closing It With The Last User"""
+
+		with self._lock:
+			handle.users -= 1
+
+			if handle.users > 0:
+				return
+
+			key = (handle.bus, handle.device)
+
+			if self._handles.get(key) is handle:
+				del self._handles[key]
+
+		with handle.lock:
+			handle.close()
+
+	def handles(self):
+		"""List Pooled Handles"""
+
+		with self._lock:
+			return list(self._handles.values())
+
+	def close_all(self):
+		"""Close All Pooled Handles"""
+
+		for handle in self.handles():
+			with handle.lock:
+				handle.close()
 
 class SPIDevice():
 	"""SPI Bus Device"""
 
-	__spi__ = None
 	bus = 0
 	device = 0
 	bus_speed = 500000
 
+	queue = None
+
+	_handle = None
+	_settings = None
+
 	def __init__(self, bus=0, device=0, bus_speed=500000, config_section=None):
 		"""Init SPI Comm Instance"""
 
 		self.bus = bus
 		self.device = device
-		self.__spi__ = spidev.SpiDev()
+		self.queue = None
+		self._handle = None
+		self._settings = { "mode" : 0 }
 		self.set_bus_speed(bus_speed)
 
 		if config_section is not None:
@@ -249,9 +904,9 @@ class SPIDevice():
 	def set_bus_speed(self, speed):
 		"""Set Bus Speed"""
 
-		self.bus_speed = speed
+		self.bus_speed = int(speed)
 
-		self.__spi__.max_speed_hertz = self.bus_speed
+		self._settings["max_speed_hz"] = self.bus_speed
 
 	def config(self, config_section):
 		"""Config Instance"""
@@ -263,147 +918,314 @@ class SPIDevice():
 			self.device = config_section.getint("spi_device", fallback=0)
 
 		if "spi_bus_speed" in config_section:
-			self.set_bus_speed(config_section.get("spi_bus_speed", fallback=500000))
+			self.set_bus_speed(config_section.getint("spi_bus_speed", fallback=500000))
+		elif "bus_speed" in config_section:
+			self.set_bus_speed(config_section.getint("bus_speed", fallback=500000))
+
+		if "spi_mode" in config_section:
+			self.mode = config_section.getint("spi_mode", fallback=0)
+
+		if self._handle is not None and (self._handle.bus, self._handle.device) != (self.bus, self.device):
+			self.close()
+
+	def _get_handle(self):
+		"""Get Pooled Handle, Attaching On First Use"""
+
+		if self._handle is None:
+			self._handle = spi_bus_manager().attach(self.bus, self.device)
+
+		return self._handle
+
+	def _transfer(self, method, *args):
+		"""Run spidev Call With The Bus Locked And This Device's Settings Applied"""
+
+		handle = self._get_handle()
+
+		with tracer.span(tr_spi, method), handle.lock:
+			spi = handle.prepare(self._settings)
+
+			return getattr(spi, method)(*args)
 
 	def open(self):
 		"""Open SPI Bus"""
 
-		self.__spi__.open(self.bus, self.device)
+		handle = self._get_handle()
+
+		with handle.lock:
+			handle.open()
 
 	def readbytes(self,length):
 		"""Read Bytes Wrapper"""
 
-		return self.__spi__.readbytes(length)
+		return self._transfer("readbytes", length)
 
 	def writebytes(self, values):
 		"""Write Bytes SPI Wrapper"""
 
-		self.__spi__.writebytes(values)
+		self._transfer("writebytes", values)
 
 	def writebytes2(self, values):
 		"""Write Bytes SPI Wrapper"""
 
-		self.__spi__.writebytes2(values)
+		self._transfer("writebytes2", values)
+
+	def write_queued(self, values):
+		"""Write Through Transaction Queue When Attached, Otherwise Directly"""
+
+		if self.queue is not None:
+			self.queue.write(self, values)
+		else:
+			self.writebytes2(values)
 
 	def xfer(self, values, speed=None, delay=None, bits=None):
 		"""XFer Data Wrapper"""
 
-		rcvd = self.__spi__.xfer(values, speed, delay, bits)
+		rcvd = self._transfer("xfer", values, speed or 0, delay or 0, bits or 0)
 
 		return rcvd
 
 	def xfer2(self, values, speed=None, delay=None, bits=None):
 		"""XFer 2 Wrapper"""
 
-		rcvd = self.__spi__.xfer2(values, speed, delay, bits)
+		rcvd = self._transfer("xfer2", values, speed or 0, delay or 0, bits or 0)
 
 		return rcvd
 
 	def xfer3(self, values, speed=None, delay=None, bits=None):
 		"""XFer 3 Wrapper"""
 
-		rcvd = self.__spi__.xfer3(values, speed, delay, bits)
+		rcvd = self._transfer("xfer3", values, speed or 0, delay or 0, bits or 0)
 
 		return rcvd
 
 	def close(self):
 		"""Close SPI Bus"""
 
-		self.__spi__.close()
+		if self._handle is not None:
+			spi_bus_manager().release(self._handle)
+			self._handle = None
+
+	def _get_setting(self, name):
+		"""Get Setting, Falling Back To Driver Value"""
+
+		value = self._settings.get(name)
+
+		if value is None:
+			handle = self._get_handle()
+
+			with handle.lock:
+				value = getattr(handle.prepare(self._settings), name)
+
+		return value
+
+	def _set_setting(self, name, value):
+		"""Set Setting, Applied To The Bus On Next Transfer"""
+
+		self._settings[name] = value
 
 	@property
 	def threewire(self):
-		"""Threewire wrapper"""
+		"""Threewire Wrapper"""
 
-		return self.__spi__.threewire
+		return self._get_setting("threewire")
 
 	@threewire.setter
 	def threewire(self, value):
-		"""Threewire wrapper Setter"""
+		"""Threewire Wrapper Setter"""
 
-		self.__spi__.threewire = value
+		self._set_setting("threewire", value)
 
 	@property
 	def mode(self):
 		"""Mode Wrapper"""
 
-		return self.__spi__.mode
+		return self._get_setting("mode")
 
 	@mode.setter
 	def mode(self, value):
 		"""Mode Wrapper Setter"""
 
-		self.__spi__.mode = value
+		self._set_setting("mode", value)
 
 	@property
 	def max_speed_hz(self):
 		"""Max Speed Hz Wrapper"""
 
-		return self.__spi__.max_speed_hz
+		return self._get_setting("max_speed_hz")
 
 	@max_speed_hz.setter
 	def max_speed_hz(self, value):
 		"""Max Speed Hz Wrapper Setter"""
 
-		self.__spi__.max_speed_hz = value
+		self.set_bus_speed(value)
 
 	@property
 	def lsbfirst(self):
 		"""LSB First Wrapper"""
 
-		return self.__spi__.lsbfirst
+		return self._get_setting("lsbfirst")
 
 	@lsbfirst.setter
 	def lsbfirst(self, value):
 		"""LSB First Wrapper Setter"""
 
-		self.__spi__.lsbfirst = value
+		self._set_setting("lsbfirst", value)
 
 	@property
 	def loop(self):
 		"""Loop Wrapper"""
 
-		return self.__spi__.loop
+		return self._get_setting("loop")
 
 	@loop.setter
 	def loop(self, value):
 		"""Loop Wrapper Setter"""
 
-		self.__spi__.loop = value
+		self._set_setting("loop", value)
 
 	@property
 	def cshigh(self):
 		"""CS High Wrapper"""
 
-		return self.__spi__.cshigh
+		return self._get_setting("cshigh")
 
 	@cshigh.setter
 	def cshigh(self, value):
-		"""CSHigh Wrapper Setter"""
+		"""CS High Wrapper Setter"""
 
-		self.__spi__.cshigh = value
+		self._set_setting("cshigh", value)
 
 	@property
 	def bits_per_word(self):
 		"""Bits Per Word Wrapper"""
 
-		return self.__spi__.bits_per_word
+		return self._get_setting("bits_per_word")
 
 	@bits_per_word.setter
 	def bits_per_word(self, value):
 		"""Bits Per Word Wrapper Setter"""
 
-		self.__spi__.bits_per_word = value
+		self._set_setting("bits_per_word", value)
 
-class Motor(DeviceInfo):
-	"""Motor Device"""
+class SPITransactionQueue():
+	"""Collects SPI Writes Within A Control Tick And Sends Them Batched"""
 
-	motor_type = "dc"
-	polarity = 1
-	trim = 0.0
-	motor_obj = None
-	speed = 0.0
-	operations = list()
+	# Each device queues whole frames, so only its latest one is worth
+	# sending, a newer write replaces the queued frame and moves to the back
+
+	bufsiz = 4096
+	scheduler = None
+
+	def __init__(self, scheduler=None, bufsiz=None):
+		"""Init Transaction Queue"""
+
+		self._lock = threading.Lock()
+		self._pending = dict()
+		self._armed = False
+
+		self.scheduler = scheduler
+		self.bufsiz = bufsiz if bufsiz is not None else spi_bufsiz()
+
+		# Writes queued when the loop stops still reach the bus
+		if scheduler is not None:
+			scheduler.on_stop(self.flush)
+
+		self.writes = 0
+		self.superseded = 0
+		self.transfers = 0
+		self.bytes_sent = 0
+
+	def write(self, device, values):
+		"""Queue Write For Device, Sent On The Next Flush, Straight Away When No Scheduler Is Running"""
+
+		# Buffers are queued as is, not copied, a frame changed before the
+		# flush goes out as changed. Only coalesced writes are copied
+		if not isinstance(values, (bytes, bytearray, memoryview)):
+			values = bytes(values)
+
+		with self._lock:
+			if self._pending.pop(device, None) is not None:
+				self.superseded += 1
+
+			self._pending[device] = values
+			self.writes += 1
+
+			running = self.scheduler is not None and self.scheduler.running
+
+			arm = running and not self._armed
+			self._armed = self._armed or running
+
+		if not running:
+			self.flush()
+		elif arm:
+			# Flush at the end of the next control tick
+			self.scheduler.on_tick(self._tick)
+
+	def pending(self):
+		"""Number of Queued Writes"""
+
+		with self._lock:
+			return len(self._pending)
+
+	def _tick(self, now):
+		"""Scheduler Tick Handler"""
+
+		if self.flush() == 0:
+			with self._lock:
+				if len(self._pending) == 0:
+					self._armed = False
+					self.scheduler.remove_tick(self._tick)
+
+	def _coalesce(self, pending):
+		"""Merge Consecutive Writes To The Same Chip Select And Settings"""
+
+		batches = list()
+
+		for device, data in pending.items():
+			key = (device.bus, device.device, tuple(sorted(device._settings.items())))
+
+			if len(batches) > 0 and batches[-1][0] == key:
+				batches[-1][2].append(data)
+			else:
+				batches.append((key, device, [ data ]))
+
+		return [ (key, device, chunks[0] if len(chunks) == 1 else b"".join(chunks)) for key, device, chunks in batches ]
+
+	def flush(self):
+		"""Send Queued Writes, Returns Number of Bus Transfers"""
+
+		with self._lock:
+			pending = self._pending
+			self._pending = dict()
+
+		transfers = 0
+
+		for key, device, payload in self._coalesce(pending):
+			handle = device._get_handle()
+			view = memoryview(payload)
+
+			with handle.lock:
+				spi = handle.prepare(device._settings)
+
+				for offset in range(0, len(payload), self.bufsiz):
+					spi.xfer3(view[offset:offset + self.bufsiz])
+					transfers += 1
+
+			self.bytes_sent += len(payload)
+
+		self.transfers += transfers
+
+		return transfers
+
+class Motor(DeviceInfo):
+	"""Motor Device"""
+
+	motor_type = "dc"
+	polarity = 1
+	trim = 0.0
+	motor_obj = None
+	speed = 0.0
+	operations = list()
 
 	def __init__(self, name=None, description=None, motor=None, operations=None, motor_type="dc", polarity=1, trim=0.0, config_section=None):
 		if name is not None:
@@ -415,6 +1237,7 @@ class Motor(DeviceInfo):
 		self.motor_type = motor_type
 		self.polarity = polarity
 		self.trim = trim
+		self.operations = list()
 
 		super(DeviceInfo,self).__init__(config_section=config_section)
 
@@ -438,11 +1261,19 @@ class Motor(DeviceInfo):
 
 		return speed
 
+	def output(self, speed):
+		"""Get Throttle Value Sent To Hardware For Requested Speed"""
+
+		value = self.trimmed(speed) * self.polarity
+
+		return max(-1.0, min(1.0, value))
+
 	def set_speed(self, speed=0.0):
 		"""Set Motor Speed"""
 
 		if self.motor_obj is not None:
-			self.motor_obj.throttle = self.speed = (self.trimmed(speed) * self.polarity)
+			with tracer.span(tr_motor, self.name):
+				self.motor_obj.throttle = self.speed = self.output(speed)
 
 	def set_trim(self, value):
 		"""Set Trim Value"""
@@ -529,17 +1360,395 @@ class Motor(DeviceInfo):
 			ops = self.get_motor_operations_from_config(config_section)
 			self.get_operations_for_motor(ops)
 
+class Maneuver():
+	"""Handle For A Timed Maneuver On The Motion Timeline"""
+
+	name = None
+	started = 0.0
+	deadline = 0.0
+	cancelled = False
+
+	_segments = None
+	_timer = None
+	_keepalive = None
+	_done = None
+
+	def __init__(self, name, segments):
+		"""Init Maneuver Instance"""
+
+		self.name = name
+		self.started = time.monotonic()
+		self.deadline = self.started
+		self.cancelled = False
+
+		self._segments = list(segments)
+		self._timer = None
+		self._keepalive = None
+		self._done = threading.Event()
+
+	def cancel(self):
+		"""Cancel Maneuver, Remaining Segments Are Dropped"""
+
+		if not self._done.is_set():
+			self.cancelled = True
+
+			for timer in [ self._timer, self._keepalive ]:
+				if timer is not None:
+					timer.cancel()
+
+			self._done.set()
+
+	def done(self):
+		"""Has Maneuver Finished Or Been Cancelled"""
+
+		return self._done.is_set()
+
+	def wait(self, timeout=None):
+		"""Wait For Maneuver To Finish, Returns True If It Did"""
+
+		return self._done.wait(timeout)
+
+	@property
+	def remaining(self):
+		"""Seconds Until The Maneuver Ends"""
+
+		return max(0.0, self.deadline - time.monotonic())
+
+class MotionTimeline():
+	"""Runs Timed Maneuver Segments Without Blocking The Caller"""
+
+	scheduler = None
+	current = None
+
+	# Called every keepalive_interval while a maneuver runs, see MotorController.set_watchdog
+	keepalive = None
+	keepalive_interval = 0.1
+
+	def __init__(self, scheduler=None):
+		"""Init Motion Timeline"""
+
+		# Segment actions run holding the lock, so a cancel() and the command
+		# after it can't land between the cancel check and the action
+		self._lock = threading.RLock()
+		self.scheduler = scheduler
+		self.current = None
+
+	def _start_timer(self, delay, callback, *args):
+		"""Start Timer On Scheduler When Running, Otherwise A Timer Thread"""
+
+		if self.scheduler is not None and self.scheduler.running:
+			return self.scheduler.call_later(delay, callback, *args)
+
+		timer = threading.Timer(delay, callback, args=args)
+		timer.daemon = True
+		timer.start()
+
+		return timer
+
+	def run(self, name, segments):
+		"""Run List of (action, duration) Segments, First Runs Now, Returns Maneuver"""
+
+		maneuver = Maneuver(name, segments)
+
+		maneuver.deadline = maneuver.started + sum([ duration for action, duration in segments if duration is not None ])
+
+		with self._lock:
+			previous = self.current
+			self.current = maneuver
+
+		if previous is not None:
+			previous.cancel()
+
+		self._next_segment(maneuver)
+
+		if self.keepalive is not None and not maneuver.done():
+			maneuver._keepalive = self._start_timer(self.keepalive_interval, self._keep_alive, maneuver)
+
+		return maneuver
+
+	def _keep_alive(self, maneuver):
+		"""Call keepalive Until The Maneuver Ends"""
+
+		keepalive = self.keepalive
+
+		if maneuver.done() or keepalive is None:
+			return
+
+		keepalive()
+
+		maneuver._keepalive = self._start_timer(self.keepalive_interval, self._keep_alive, maneuver)
+
+	def _next_segment(self, maneuver):
+		"""Run Next Segment And Schedule The One After It"""
+
+		with self._lock:
+			if maneuver.cancelled or self.current is not maneuver:
+				return
+
+			action, duration = maneuver._segments.pop(0)
+
+			last = len(maneuver._segments) == 0
+
+			if last:
+				self.current = None
+
+			if action is not None:
+				action()
+
+			if last:
+				maneuver._done.set()
+			elif duration is not None:
+				maneuver._timer = self._start_timer(duration, self._next_segment, maneuver)
+
+	def cancel(self):
+		"""Cancel Current Maneuver"""
+
+		with self._lock:
+			maneuver = self.current
+			self.current = None
+
+		if maneuver is not None:
+			maneuver.cancel()
+
+	@property
+	def busy(self):
+		"""Is A Maneuver Running"""
+
+		return self.current is not None
+
+class MotionProfile():
+	"""Precomputed Speed Ramps For All Motors Of A Controller"""
+
+	shape = mp_trapezoid
+	accel = 4.0
+
+	current = None
+	target = None
+
+	_ramp = None
+	_step = 0
+
+	def __init__(self, count, shape=mp_trapezoid, accel=4.0):
+		"""Init Motion Profile, accel Is Full Scale Speed Change Per Second"""
+
+		self.shape = shape
+		self.accel = float(accel)
+		self.current = np.zeros(count)
+		self.target = np.zeros(count)
+		self._ramp = None
+		self._step = 0
+
+	@property
+	def active(self):
+		"""Is A Ramp Being Streamed"""
+
+		return self._ramp is not None
+
+	def plan(self, target, rate):
+		"""Precompute Ramp From Current Speeds To Target, Returns Number of Steps"""
+
+		# Always starts from the last streamed row, so a new target blends in mid ramp
+		self.target = np.array(target, dtype=float)
+
+		delta = self.target - self.current
+		span = float(np.max(np.abs(delta))) if len(delta) > 0 else 0.0
+		step_limit = self.accel / rate
+
+		if span == 0.0 or step_limit <= 0.0:
+			self._ramp = None
+			return 0
+
+		steps = span / step_limit
+
+		if self.shape == mp_scurve:
+			# Smoothstep peaks at 1.5x its mean slope, stretch to stay within accel
+			steps *= 1.5
+
+		steps = max(1, int(np.ceil(steps)))
+
+		progress = np.arange(1, steps + 1, dtype=float) / steps
+
+		if self.shape == mp_scurve:
+			progress = progress * progress * (3.0 - (2.0 * progress))
+
+		ramp = self.current + np.outer(progress, delta)
+		ramp[-1] = self.target
+
+		self._ramp = ramp
+		self._step = 0
+
+		return steps
+
+	def next(self):
+		"""Get Next Row of Speeds, None When Idle"""
+
+		if self._ramp is None:
+			return None
+
+		self.current[:] = self._ramp[self._step]
+		self._step += 1
+
+		if self._step >= len(self._ramp):
+			self._ramp = None
+
+		return self.current
+
+	def hold(self, index, speed):
+		"""Set Speed Immediately, Dropping Any Ramp"""
+
+		self._ramp = None
+		self.current[index] = speed
+		self.target[:] = self.current
+
+class Watchdog():
+	"""Deadman Timer, Calls expire Once timeout Seconds Pass Without A heartbeat"""
+
+	# The timer waits on its own thread, SCHED_FIFO when permitted (root or
+	# CAP_SYS_NICE), so the control tick, Flask and camera threads can't hold
+	# off the halt. The halt still needs the GIL, Python load can add up to
+	# sys.getswitchinterval() which shows up in the recorded latency, the
+	# time from the missed deadline to expire returning. A trip disarms the
+	# timer until the next heartbeat
+
+	timeout = 0.25
+	priority = watchdog_priority
+	name = "watchdog"
+	realtime = False
+
+	def __init__(self, expire, timeout=0.25, priority=watchdog_priority, name="watchdog"):
+		"""Init Watchdog, The Thread Starts With The First Heartbeat"""
+
+		self.expire = expire
+		self.timeout = timeout
+		self.priority = priority
+		self.name = name
+
+		self._cond = threading.Condition()
+		self._deadline = None
+		self._thread = None
+		self._stop = False
+
+		self.heartbeats = 0
+		self.trips = 0
+		self.latency = RollingHistogram()
+
+	@property
+	def armed(self):
+		"""Waiting On A Deadline"""
+
+		return self._deadline is not None
+
+	def start(self):
+		"""Start Timer Thread"""
+
+		with self._cond:
+			if self._thread is not None:
+				return
+
+			self._stop = False
+			self._thread = threading.Thread(target=self._watch, name=self.name, daemon=True)
+			self._thread.start()
+
+	def heartbeat(self):
+		"""Push The Deadline Out By timeout"""
+
+		if self._thread is None:
+			self.start()
+
+		with self._cond:
+			wake = self._deadline is None
+
+			self._deadline = time.perf_counter() + self.timeout
+			self.heartbeats += 1
+
+			# A later deadline is picked up when the current wait ends
+			if wake:
+				self._cond.notify()
+
+	def disarm(self):
+		"""Stop Waiting Until The Next Heartbeat"""
+
+		with self._cond:
+			self._deadline = None
+
+	def _elevate(self):
+		"""Move The Timer Thread To SCHED_FIFO When Permitted"""
+
+		try:
+			os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.priority))
+			self.realtime = True
+		except (AttributeError, OSError) as err:
+			DbgMsg(f"{self.name} running at normal priority, SCHED_FIFO unavailable : {err}")
+
+	def _watch(self):
+		"""Timer Thread"""
+
+		self._elevate()
+
+		while True:
+			with self._cond:
+				while not self._stop and (self._deadline is None or self._deadline > time.perf_counter()):
+					self._cond.wait(None if self._deadline is None else max(0.0, self._deadline - time.perf_counter()))
+
+				if self._stop:
+					break
+
+				deadline = self._deadline
+				self._deadline = None
+
+			try:
+				self.expire()
+			except Exception as err:
+				DbgMsg(f"{self.name} expire failed : {err}")
+
+			self.latency.add(time.perf_counter() - deadline)
+			self.trips += 1
+
+	def stop(self):
+		"""Stop Timer Thread"""
+
+		with self._cond:
+			self._stop = True
+			self._cond.notify()
+
+			thread = self._thread
+			self._thread = None
+
+		if thread is not None:
+			thread.join()
+
+	def stats(self):
+		"""Heartbeats, Trips And Deadline To Halt Latency"""
+
+		return {
+			"timeout_ms" : self.timeout * 1000.0,
+			"armed" : self.armed,
+			"realtime" : self.realtime,
+			"heartbeats" : self.heartbeats,
+			"trips" : self.trips,
+			"latency" : self.latency.summary()
+		}
+
 class MotorController(DeviceInfo):
 	"""Motor Controller"""
 
 	turn_differential = 0.2
 	turning_strategy = ts_fixedwheels
 
-	motors = list()
+	motors = None
 
-	motor_groups = dict()
+	motor_groups = None
 
 	controller = None
+	scheduler = None
+	timeline = None
+	profile = None
+	watchdog = None
+
+	_motor_index = None
+
+	# Compiled dispatch, operation -> tuple of (motor, sign, differential)
+	_dispatch = None
 
 	def __init__(self, name=None, description=None, controller=None, turn_diff=0.2, config_section=None):
 		"""Initialize Motor Controller Instance"""
@@ -550,12 +1759,27 @@ class MotorController(DeviceInfo):
 			self.description = description
 
 		self.controller = controller
+		self.motors = list()
+		self.motor_groups = dict()
 		self.motor_groups["all"] = self.motors
 		self.turn_differential = turn_diff
+		self._dispatch = None
+		self.timeline = MotionTimeline()
+		self.profile = None
+		self._motor_index = dict()
+		# Held for every write to the motors, so a deadman halt can't be
+		# overwritten by a ramp row or command computed before it
+		self._profile_lock = threading.Lock()
 
 		if config_section is not None:
 			self.config(config_section)
 
+	def attach_scheduler(self, scheduler):
+		"""Run Timed Maneuvers On Scheduler"""
+
+		self.scheduler = scheduler
+		self.timeline.scheduler = scheduler
+
 	def add_group(self, group):
 		"""Add Group(s) To MotorController"""
 
@@ -567,6 +1791,7 @@ class MotorController(DeviceInfo):
 		else:
 			if not group in self.motor_groups:
 				self.motor_groups[group] = list()
+				self._dispatch = None
 
 	def add_motor_to_group(self, motor_group, motor):
 		"""Add Motor to Group"""
@@ -580,80 +1805,226 @@ class MotorController(DeviceInfo):
 			self.add_group(motor_group)
 
 		self.motor_groups[motor_group].append(motor)
-
+		self._dispatch = None
 
 	def add_operation(self, operation, motor):
 		"""Add Operation to Motor"""
 
 		motor.set_operation(operation)
+		self._dispatch = None
 
-	def motor_group_speed(self, motor_grp = "none", speed=0.0, operation=None):
-		"""Set Motor Speed By Group"""
+	def set_turn_differential(self, value):
+		"""Set Turn Differential"""
+
+		self.turn_differential = value
+		self._dispatch = None
+
+	def _compile_entries(self, group, operation, sign=1.0, differential=0.0):
+		"""Get Dispatch Entries For Group Members Supporting Operation"""
+
+		entries = list()
+
+		for motor in self.motor_groups.get(group, list()):
+			if operation is None or operation in motor.operations:
+				entries.append((motor, sign, differential))
+
+		return entries
+
+	def compile_dispatch(self):
+		"""Compile Groups/Operations Into Per Operation Motor Tables"""
+
+		dispatch = dict()
+		diff = self.turn_differential
+
+		self._motor_index = { motor : index for index, motor in enumerate(self.motors) }
+
+		if self.profile is not None and len(self.profile.current) != len(self.motors):
+			self.set_profile(self.profile.shape, self.profile.accel)
+
+		dispatch[None] = tuple(self._compile_entries("all", None))
+		dispatch[op_forward] = tuple(self._compile_entries("all", op_forward))
+		dispatch[op_reverse] = tuple(self._compile_entries("all", op_reverse))
+
+		if self.turning_strategy == ts_tracked:
+			dispatch[op_left_turn] = tuple(self._compile_entries("right", op_left_turn) +
+				self._compile_entries("left", op_left_turn, 1.0, diff))
+			dispatch[op_right_turn] = tuple(self._compile_entries("right", op_right_turn, 1.0, diff) +
+				self._compile_entries("left", op_right_turn))
+		elif self.turning_strategy == ts_fixedwheels:
+			dispatch[op_left_turn] = tuple(self._compile_entries("right", op_left_turn) +
+				self._compile_entries("left", op_left_turn, -1.0, diff))
+			dispatch[op_right_turn] = tuple(self._compile_entries("right", op_right_turn, -1.0, diff) +
+				self._compile_entries("left", op_right_turn))
+		else:
+			# Steered, turning is done by steering hardware
+			dispatch[op_left_turn] = tuple()
+			dispatch[op_right_turn] = tuple()
+
+		self._dispatch = dispatch
+
+		return dispatch
+
+	def drive(self, operation=None, speed=0.0, immediate=False):
+		"""Apply Speed To Motors In Operation's Compiled Table, Moving Commands Are Heartbeats"""
+
+		if speed != 0 and self.watchdog is not None:
+			self.watchdog.heartbeat()
+
+		with tracer.span(tr_dispatch, operation):
+			self._drive(operation, speed, immediate)
+
+	def _drive(self, operation, speed, immediate):
+		"""Drive, Untraced"""
+
+		dispatch = self._dispatch
+
+		if dispatch is None:
+			dispatch = self.compile_dispatch()
+
+		table = dispatch.get(operation)
+
+		if table is None:
+			return
+
+		updates = [ (motor, sign * (speed - differential)) for motor, sign, differential in table ]
+
+		self._set_speeds(updates, immediate)
+
+	def _set_speeds(self, updates, immediate=False):
+		"""Apply (motor, speed) Updates Through The Motion Profile, So Ramps And Profile State Agree"""
+
+		if self.profile is None:
+			with self._profile_lock:
+				self.apply(updates)
+		elif immediate or self.scheduler is None or not self.scheduler.running:
+			# Ramps stream on control ticks, with no loop running they would never move
+			with self._profile_lock:
+				for motor, motor_speed in updates:
+					self.profile.hold(self._motor_index[motor], motor_speed)
+
+				self.apply(updates)
+		else:
+			self.ramp_to(updates)
+
+	def set_profile(self, shape=mp_trapezoid, accel=4.0):
+		"""Set Motion Profile, mp_none Removes It"""
+
+		with self._profile_lock:
+			if shape == mp_none or shape is None:
+				self.profile = None
+			else:
+				self.profile = MotionProfile(len(self.motors), shape, accel)
+
+	def ramp_to(self, updates):
+		"""Plan Ramp From Current Speeds To Given (motor, speed) Targets"""
+
+		with self._profile_lock:
+			target = self.profile.target.copy()
+
+			for motor, speed in updates:
+				target[self._motor_index[motor]] = speed
+
+			steps = self.profile.plan(target, self.scheduler.rate)
+
+		if steps > 0:
+			self.scheduler.on_tick(self._profile_tick)
+
+	def _profile_tick(self, now):
+		"""Stream Next Ramp Row To The Motors"""
+
+		with self._profile_lock:
+			row = self.profile.next() if self.profile is not None else None
+
+			if self.profile is None or not self.profile.active:
+				self.scheduler.remove_tick(self._profile_tick)
+
+			if row is not None:
+				self.apply(list(zip(self.motors, row.tolist())))
+
+	def apply(self, updates):
+		"""Apply List of (motor, speed) Updates, Override To Batch Hardware Writes"""
+
+		for motor, speed in updates:
+			motor.set_speed(speed)
+
+	def group_updates(self, motor_grp = "none", speed=0.0, operation=None):
+		"""Get (motor, speed) Updates For Group"""
+
+		updates = list()
 
 		if motor_grp in self.motor_groups:
 			for motor in self.motor_groups[motor_grp]:
 				if operation is not None and operation in motor.operations:
-					motor.set_speed(speed)
+					updates.append((motor, speed))
 				elif operation is None:
-					motor.set_speed(speed)
+					updates.append((motor, speed))
+
+		return updates
+
+	def motor_group_speed(self, motor_grp = "none", speed=0.0, operation=None):
+		"""Set Motor Speed By Group"""
+
+		if speed != 0:
+			self.heartbeat()
+
+		self._set_speeds(self.group_updates(motor_grp, speed, operation))
 
 	def motion(self, speed=0.0, operation=None):
 		"""Set All Motors to Given Speed"""
 
-		self.motor_group_speed("all", speed, operation=operation)
+		self.drive(operation, speed)
 
 	def motor_speed(self, motor_index, speed=0.0, operation=None):
-		if motor_index < len(self.drive_motors):
-			motor = self.motors[motor_index]
+		"""Set Speed Of One Motor"""
 
-			if operation is not None and operation in motor.operations:
-				motor.set_speed(speed)
-			else:
-				motor.set_speed(speed)
+		if motor_index < len(self.motors):
+			self._set_speeds([ (self.motors[motor_index], speed) ])
 
 	def left_turn(self, speed=1.0, duration=None, stop=False):
+		"""Turn Left, Timed Turns Return A Maneuver Instead of Blocking"""
 
-		diff_speed = speed - self.turn_differential
+		maneuver = None
 
-		if self.turning_strategy == ts_tracked:
-			self.motor_group_speed("right", speed, operation="left_turn")
-			self.motor_group_speed("left", diff_speed, operation="left_turn")
-		elif self.turning_strategy == ts_fixedwheels:
-			self.motor_group_speed("right", speed, operation="left_turn")
-			self.motor_group_speed("left", (diff_speed * -1.0), operation="left_turn")
-		elif self.turning_strategy == ts_steered:
+		self.timeline.cancel()
+
+		if self.turning_strategy == ts_steered:
 			# Turn Steering hardware left
 			pass
+		else:
+			self.drive(op_left_turn, speed)
 
 		if duration is not None:
-			time.sleep(duration)
-
 			if stop:
-				self.halt()
+				finish = self._halt_motors
 			else:
-				self.motor_group_speed("left", speed)
+				finish = lambda : self.motor_group_speed("left", speed)
+
+			maneuver = self.timeline.run(op_left_turn, [ (None, duration), (finish, None) ])
+
+		return maneuver
 
 	def right_turn(self, speed=1.0, duration=None, stop=False):
+		"""Turn Right, Timed Turns Return A Maneuver Instead of Blocking"""
 
-		diff_speed = speed - self.turn_differential
+		maneuver = None
 
-		if self.turning_strategy == ts_tracked:
-			self.motor_group_speed("right", diff_speed, operation="right_turn")
-			self.motor_group_speed("left", speed, operation="right_turn")
-		elif self.turning_strategy == ts_fixedwheels:
-			self.motor_group_speed("right", (diff_speed * -1), operation="right_turn")
-			self.motor_group_speed("left", speed, operation="right_turn")
-		elif self.turning_strategy == ts_steered:
+		self.timeline.cancel()
+
+		if self.turning_strategy == ts_steered:
 			# Turn Steering hardware right
 			pass
+		else:
+			self.drive(op_right_turn, speed)
 
 		if duration is not None:
-			time.sleep(duration)
-
 			if stop:
-				self.halt()
+				finish = self._halt_motors
 			else:
-				self.motor_group_speed("right", speed)
+				finish = lambda : self.motor_group_speed("right", speed)
+
+			maneuver = self.timeline.run(op_right_turn, [ (None, duration), (finish, None) ])
+
+		return maneuver
 
 	def forward(self, speed=0.5):
 		"""Move Robot Forward"""
@@ -664,7 +2035,8 @@ class MotorController(DeviceInfo):
 		if speed > 1.0:
 			speed = 1.0
 
-		self.motion(speed, operation="forward")
+		self.timeline.cancel()
+		self.motion(speed, operation=op_forward)
 
 	def reverse(self, speed=-0.5):
 		"""Move Robot In Reverse"""
@@ -675,112 +2047,1820 @@ class MotorController(DeviceInfo):
 		if speed < -1.0:
 			speed = -1.0
 
-		self.motion(speed, operation="reverse")
+		self.timeline.cancel()
+		self.motion(speed, operation=op_reverse)
+
+	def _halt_motors(self):
+		"""Stop All Motors Now, Without Ramping Down"""
+
+		self.drive(None, 0.0, immediate=True)
 
 	def halt(self):
 		"""Halt Motion"""
 
-		self.motion(0)
+		if self.watchdog is not None:
+			self.watchdog.disarm()
 
-	def get_motor_groups(self, groups):
-		"""Get Group Memberships for Motors"""
+		self.timeline.cancel()
+		self._halt_motors()
 
-		"""Support function to extract group members from INI"""
+	def set_watchdog(self, timeout_ms=250.0, priority=watchdog_priority):
+		"""Halt Every Motor timeout_ms After The Last Heartbeat, None Or 0 Removes The Watchdog"""
 
-		for motor in self.motors:
-			motor_name = motor.name
+		if self.watchdog is not None:
+			self.watchdog.stop()
+			self.watchdog = None
 
-			for group in groups:
-				if motor_name in groups[group]:
-					self.add_group(group)
+		self.timeline.keepalive = None
 
-					self.motor_groups[group].append(motor)
+		if timeout_ms:
+			self.watchdog = Watchdog(self._deadman, timeout_ms / 1000.0, priority, name=f"{self.name}.watchdog")
 
-	def config(self, config_section):
-		"""Config Motor Controller"""
+			# Timed maneuvers are bounded, they keep the watchdog fed until they finish
+			self.timeline.keepalive = self.heartbeat
+			self.timeline.keepalive_interval = self.watchdog.timeout / 2.0
 
-		self.turning_strategy = config_section.get("turning_strategy", fallback=ts_fixedwheels)
+	def heartbeat(self):
+		"""Command Link Is Alive, Keep The Motors Running"""
 
-		groups = None
-		memberships = dict()
+		if self.watchdog is not None:
+			self.watchdog.heartbeat()
+
+	def _deadman(self):
+		"""Watchdog Expired, Zero Every Motor Now, Dropping Maneuvers And Ramps"""
+
+		self.timeline.cancel()
+
+		with self._profile_lock:
+			if self.profile is not None:
+				for index in range(len(self.motors)):
+					self.profile.hold(index, 0.0)
+
+			if self.scheduler is not None:
+				self.scheduler.remove_tick(self._profile_tick)
+
+			self.apply([ (motor, 0.0) for motor in self.motors ])
+
+	def telemetry(self):
+		"""Motor Speeds And Motion State"""
+
+		telemetry = {
+			"motors" : { motor.name : motor.speed for motor in self.motors },
+			"maneuver" : self.timeline.busy,
+			"ramping" : self.profile is not None and self.profile.active
+		}
+
+		if self.watchdog is not None:
+			telemetry["watchdog"] = { "armed" : self.watchdog.armed, "trips" : self.watchdog.trips }
+
+		return telemetry
+
+	def get_motor_groups(self, groups):
+		"""Get Group Memberships for Motors"""
+
+		"""Support function to extract group members from INI"""
+
+		for motor in self.motors:
+			motor_name = motor.name
+
+			for group in groups:
+				if motor_name in groups[group]:
+					self.add_group(group)
+
+					self.motor_groups[group].append(motor)
+
+	def config(self, config_section):
+		"""Config Motor Controller"""
+
+		self.turning_strategy = config_section.get("turning_strategy", fallback=ts_fixedwheels)
+
+		if "motion_profile" in config_section:
+			self.set_profile(config_section.get("motion_profile", fallback=mp_none), config_section.getfloat("accel", fallback=4.0))
+
+		if "watchdog_ms" in config_section:
+			self.set_watchdog(config_section.getfloat("watchdog_ms", fallback=0.0))
+
+		groups = None
+		memberships = dict()
 
 		if "groups" in config_section:
-			groups = config_section["groups"].split(",")
+			groups = self.get_specs_sv(config_section["groups"])
+
+			for group in groups:
+				members = self.get_specs_sv(config_section.get(group, fallback=""))
+
+				memberships[group] = members
+
+			self.get_motor_groups(memberships)
+		else:
+			DbgMsg(f"No groups label in config section for {self.name}")
+
+		for motor in self.motors:
+			motor.config(config_section)
+
+		self.compile_dispatch()
+
+class LED(DigitalGPIODevice):
+	"""Simple LED"""
+
+	def __init__(self, pig_obj, pin=None, name=None, description=None, config_section=None):
+		"""Initialize LED Instance"""
+
+		super().__init__(pin, name=name, description=description, config_section=config_section)
+
+	def on(self):
+		self.write(1)
+
+	def off(self):
+		self.write(0)
+
+	def config(self, config_section):
+		"""Config Instance"""
+
+		pass
+
+class FrameRing():
+	"""Preallocated Ring of Encoded Frames, One Writer, Any Number of Readers"""
+
+	# Readers always take the newest frame, a reader that falls behind skips
+	# the frames in between, so slow viewers never queue frames in memory.
+	# The first reader of a frame makes the one bytes copy every reader shares
+
+	slots = 4
+	sequence = 0
+	viewers = 0
+	closed = False
+
+	def __init__(self, slots=4, capacity=65536):
+		"""Init Ring"""
+
+		self.slots = slots
+		self.sequence = 0
+		self.viewers = 0
+		self.closed = False
+		self._buffers = [ bytearray(capacity) for slot in range(slots) ]
+		self._lengths = [ 0 ] * slots
+		self._times = [ 0.0 ] * slots
+		self._shared = [ None ] * slots
+		self._cond = threading.Condition()
+
+	def write(self, data):
+		"""Copy Encoded Frame Into The Next Slot, Also Usable As A picamera2 FileOutput Target"""
+
+		length = len(data)
+
+		with self._cond:
+			slot = (self.sequence + 1) % self.slots
+			buffer = self._buffers[slot]
+
+			if length > len(buffer):
+				buffer = self._buffers[slot] = bytearray(length + (length // 4))
+
+			buffer[:length] = data
+
+			self._lengths[slot] = length
+			self._times[slot] = time.time()
+			self._shared[slot] = None
+
+			self.sequence += 1
+			self._cond.notify_all()
+
+		return length
+
+	def flush(self):
+		"""File Like No-Op For picamera2 Outputs"""
+
+		pass
+
+	def read(self, after=0, timeout=None):
+		"""Newest Frame Published After Sequence As (sequence, bytes), bytes Is None On Timeout"""
+
+		with self._cond:
+			if not self._cond.wait_for(lambda : self.sequence > after or self.closed, timeout) or self.sequence <= after:
+				return after, None
+
+			slot = self.sequence % self.slots
+			frame = self._shared[slot]
+
+			if frame is None:
+				frame = self._shared[slot] = bytes(memoryview(self._buffers[slot])[:self._lengths[slot]])
+
+			return self.sequence, frame
+
+	def stream(self, timeout=1.0):
+		"""Frame Generator For One Viewer, Ends When The Ring Is Closed"""
+
+		with self._cond:
+			self.viewers += 1
+			after = self.sequence
+
+		try:
+			while not self.closed:
+				after, frame = self.read(after, timeout)
+
+				if frame is not None:
+					yield after, frame
+		finally:
+			with self._cond:
+				self.viewers -= 1
+
+	def close(self):
+		"""Wake And End Every Reader"""
+
+		with self._cond:
+			self.closed = True
+			self._cond.notify_all()
+
+class SyntheticFrameSource():
+	"""Moving Test Pattern, Encoded As DC Only Grayscale JPEG So No Imaging Library Is Needed"""
+
+	width = 640
+	height = 480
+	frame = 0
+
+	def __init__(self, width=640, height=480):
+		"""Init Source"""
+
+		self.width = width - (width % 8)
+		self.height = height - (height % 8)
+		self.frame = 0
+
+		rows = self.height // 8
+		cols = self.width // 8
+
+		self._pattern = np.add.outer(np.linspace(0, 160, rows), np.linspace(0, 64, cols)).astype(np.uint8)
+
+	def capture(self):
+		"""Encode Next Frame, A Bright Bar Sweeps Across The Gradient"""
+
+		blocks = self._pattern.copy()
+		blocks[:, self.frame % blocks.shape[1]] = 255
+
+		self.frame += 1
+
+		return encode_dc_jpeg(blocks)
+
+class PiCameraSource():
+	"""Pi Camera Through picamera2, The Hardware MJPEG Encoder Writes Straight Into The Ring"""
+
+	width = 640
+	height = 480
+	camera = None
+
+	def __init__(self, width=640, height=480):
+		"""Init Source"""
+
+		self.width = width
+		self.height = height
+		self.camera = None
+
+	def start(self, ring, fps):
+		"""Start Recording Into Ring"""
+
+		from picamera2 import Picamera2
+		from picamera2.encoders import MJPEGEncoder
+		from picamera2.outputs import FileOutput
+
+		self.camera = Picamera2()
+		self.camera.configure(self.camera.create_video_configuration(main={ "size" : (self.width, self.height) }, controls={ "FrameRate" : fps }))
+		self.camera.start_recording(MJPEGEncoder(), FileOutput(ring))
+
+	def stop(self):
+		"""Stop Recording"""
+
+		if self.camera is not None:
+			self.camera.stop_recording()
+			self.camera.close()
+			self.camera = None
+
+class Camera(ProductInfo):
+	"""Camera, Captures Encoded Frames Into A FrameRing Shared By Every Viewer"""
+
+	name = None
+	description = None
+
+	source_type = cs_synthetic
+	width = 640
+	height = 480
+	fps = 15.0
+	slots = 4
+	format = "fixed"
+
+	source = None
+	ring = None
+
+	def __init__(self, name=None, description=None, source=None, width=640, height=480, fps=15.0, slots=4, config_section=None):
+		"""Initialize Camera Instance"""
+
+		super().__init__()
+
+		if name is not None:
+			self.name = name
+		if description is not None:
+			self.description = description
+
+		self.width = width
+		self.height = height
+		self.fps = fps
+		self.slots = slots
+		self.source = source
+		self.ring = None
+		self._thread = None
+		self._stop = threading.Event()
+
+		if config_section is not None:
+			self.config(config_section)
+
+	def make_source(self):
+		"""Frame Source For source_type, Always Synthetic On The Simulation Backend"""
+
+		if self.source_type == cs_picamera and not simulated():
+			return PiCameraSource(self.width, self.height)
+
+		return SyntheticFrameSource(self.width, self.height)
+
+	def start(self):
+		"""Start Capturing"""
+
+		if self.ring is not None and not self.ring.closed:
+			return
+
+		if self.source is None:
+			self.source = self.make_source()
+
+		self.ring = FrameRing(self.slots, (self.width * self.height) // 4)
+		self._stop.clear()
+
+		if hasattr(self.source, "capture"):
+			self._thread = threading.Thread(target=self._capture_loop, name=f"camera:{self.name}", daemon=True)
+			self._thread.start()
+		else:
+			self.source.start(self.ring, self.fps)
+
+	def _capture_loop(self):
+		"""Pull Frames From The Source At fps, Idle While Nobody Is Watching"""
+
+		period = 1.0 / self.fps
+		due = time.monotonic()
+
+		while not self._stop.is_set():
+			if self.ring.viewers == 0:
+				self._stop.wait(0.25)
+				due = time.monotonic()
+				continue
+
+			self.ring.write(self.source.capture())
+
+			due += period
+			self._stop.wait(max(0.0, due - time.monotonic()))
+
+	def stop(self):
+		"""Stop Capturing, Ends Every Viewer's Stream"""
+
+		self._stop.set()
+
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
+		elif self.source is not None and hasattr(self.source, "stop"):
+			self.source.stop()
+
+		if self.ring is not None:
+			self.ring.close()
+
+	def telemetry(self):
+		"""Capture State"""
+
+		return {
+			"running" : self.ring is not None and not self.ring.closed,
+			"frames" : self.ring.sequence if self.ring is not None else 0,
+			"viewers" : self.ring.viewers if self.ring is not None else 0,
+			"size" : [ self.width, self.height ],
+			"fps" : self.fps
+		}
+
+	def config(self, config_section):
+		"""Config Camera From INI Section"""
+
+		super().config(config_section)
+
+		self.source_type = config_section.get("source", fallback=cs_picamera)
+		self.width = config_section.getint("width", fallback=self.width)
+		self.height = config_section.getint("height", fallback=self.height)
+		self.fps = config_section.getfloat("fps", fallback=self.fps)
+		self.slots = config_section.getint("ring_slots", fallback=self.slots)
+		self.format = config_section.get("format", fallback=self.format)
+
+class SampleRing():
+	"""Preallocated Ring of Timestamped Sample Rows, Windows Come Back As Views Without Copying"""
+
+	# Every row is stored twice, at index and index + capacity, so the last
+	# capacity rows are always one contiguous slice. Views stay valid until
+	# the writer laps them, copy anything held longer than capacity samples
+
+	channels = 0
+	capacity = 4096
+	count = 0
+
+	def __init__(self, channels, capacity=4096):
+		"""Init Ring"""
+
+		self.channels = channels
+		self.capacity = capacity
+		self.count = 0
+		self._data = np.zeros((capacity * 2, channels))
+		self._times = np.zeros(capacity * 2)
+
+	def append(self, timestamp, row):
+		"""Add One Sample Row"""
+
+		index = self.count % self.capacity
+
+		self._data[index] = row
+		self._data[index + self.capacity] = row
+		self._times[index] = self._times[index + self.capacity] = timestamp
+
+		self.count += 1
+
+	def extend(self, times, rows):
+		"""Add A Block of Sample Rows"""
+
+		times = times[-self.capacity:]
+		rows = rows[-self.capacity:]
+
+		index = self.count % self.capacity
+		first = min(len(times), self.capacity - index)
+
+		for start, end, offset in [ (0, first, index), (first, len(times), 0) ]:
+			if end > start:
+				self._data[offset:offset + end - start] = rows[start:end]
+				self._data[offset + self.capacity:offset + self.capacity + end - start] = rows[start:end]
+				self._times[offset:offset + end - start] = times[start:end]
+				self._times[offset + self.capacity:offset + self.capacity + end - start] = times[start:end]
+
+		self.count += len(times)
+
+	def _view(self, start, end, count):
+		"""Read Only Views Of Rows start..end Counted Back From count"""
+
+		offset = (count % self.capacity) + self.capacity
+
+		times = self._times[offset - (count - start):offset - (count - end)]
+		data = self._data[offset - (count - start):offset - (count - end)]
+
+		times.flags.writeable = False
+		data.flags.writeable = False
+
+		return times, data
+
+	def latest(self, length=None):
+		"""Newest length Samples (Default All Kept) As (times, rows)"""
+
+		count = self.count
+		kept = min(count, self.capacity)
+		length = kept if length is None else min(length, kept)
+
+		return self._view(count - length, count, count)
+
+	def since(self, start):
+		"""Samples Added Since count Was start As (times, rows, count), Lapped Samples Are Skipped"""
+
+		count = self.count
+		start = max(start, count - self.capacity)
+
+		times, data = self._view(start, count, count)
+
+		return times, data, count
+
+	def window(self, seconds):
+		"""Samples From The Last seconds As (times, rows)"""
+
+		times, data = self.latest()
+
+		if len(times) == 0:
+			return times, data
+
+		first = np.searchsorted(times, times[-1] - seconds, side="left")
+
+		return times[first:], data[first:]
+
+	def decimated(self, factor, length=None):
+		"""Every factor'th Sample, Aligned To The Newest, At Most length Rows As (times, rows)"""
+
+		span = None if length is None else length * factor
+
+		times, data = self.latest(span)
+
+		first = (len(times) - 1) % factor if len(times) > 0 else 0
+
+		return times[first::factor], data[first::factor]
+
+class ComplementaryAHRS():
+	"""Attitude And Heading From Gyro, Accel And Magnetometer Blocks, Vectorized Per Block"""
+
+	# Mahony style fusion in Euler angle form, each sample's estimate is
+	#   est[k] = a * (est[k-1] + rate[k] * dt[k]) + (1 - a) * ref[k]
+	# with ref the accel tilt and tilt compensated magnetic heading. Written
+	# as gyro integration plus a correction that is a first order filter of
+	# the reference error, it solves in closed form with cumulative sums, so
+	# a block costs a fixed number of NumPy calls whatever its length. The
+	# integral term (gyro bias) is updated once per block
+
+	tau = 0.5
+	bias_gain = 0.05
+
+	angles = None
+	bias = None
+	last_time = None
+
+	def __init__(self, tau=0.5, bias_gain=0.05):
+		"""Init Filter, tau Is The Time Constant (seconds) Of Trusting The Gyro Over The References"""
+
+		self.tau = tau
+		self.bias_gain = bias_gain
+		self.angles = None
+		self.bias = np.zeros(3)
+		self.last_time = None
+
+	def reference(self, accel, mag=None):
+		"""Roll, Pitch From Gravity And Tilt Compensated Heading, Columns Of An (n, 3) Array"""
+
+		ax, ay, az = accel[:, 0], accel[:, 1], accel[:, 2]
+
+		roll = np.arctan2(ay, az)
+		pitch = np.arctan2(-ax, np.hypot(ay, az))
+
+		if mag is None:
+			heading = np.full(len(roll), np.nan)
+		else:
+			mx, my, mz = mag[:, 0], mag[:, 1], mag[:, 2]
+
+			sin_roll, cos_roll = np.sin(roll), np.cos(roll)
+
+			xh = (mx * np.cos(pitch)) + (((my * sin_roll) + (mz * cos_roll)) * np.sin(pitch))
+			yh = (my * cos_roll) - (mz * sin_roll)
+
+			heading = np.arctan2(-yh, xh)
+
+		return np.column_stack((roll, pitch, heading))
+
+	def euler_rates(self, gyro, tilt):
+		"""Body Rates To Roll, Pitch, Yaw Rates At The Given Tilt"""
+
+		p, q, r = gyro[:, 0], gyro[:, 1], gyro[:, 2]
+
+		sin_roll, cos_roll = np.sin(tilt[:, 0]), np.cos(tilt[:, 0])
+		cos_pitch = np.cos(tilt[:, 1])
+
+		across = (q * sin_roll) + (r * cos_roll)
+
+		return np.column_stack((p + (across * np.tan(tilt[:, 1])), (q * cos_roll) - (r * sin_roll), across / cos_pitch))
+
+	def _smooth(self, error, a):
+		"""First Order Filter c[k] = a * c[k-1] + (1 - a) * error[k] From c = 0, In Chunks That Keep a^-k Finite"""
+
+		smoothed = np.empty_like(error)
+		carry = np.zeros(error.shape[1])
+		chunk = max(1, int(np.log(1e-9) / np.log(a))) if 0.0 < a < 1.0 else len(error)
+
+		for start in range(0, len(error), chunk):
+			part = error[start:start + chunk]
+			powers = a ** np.arange(1, len(part) + 1)
+
+			smoothed[start:start + chunk] = (powers[:, None] * carry) + (powers[:, None] * np.cumsum(((1.0 - a) * part) / powers[:, None], axis=0))
+			carry = smoothed[start + len(part) - 1]
+
+		return smoothed
+
+	def update(self, times, accel, gyro, mag=None):
+		"""Fuse A Block, Returns (n, 3) Roll, Pitch, Heading In Radians, Heading Wrapped To +/- pi"""
+
+		if len(times) == 0:
+			return np.zeros((0, 3))
+
+		ref = self.reference(accel, mag)
+
+		if self.angles is None:
+			self.angles = np.nan_to_num(ref[0])
+			self.last_time = times[0]
+
+		dt = np.diff(times, prepend=self.last_time)
+		rates = self.euler_rates(gyro - self.bias, ref)
+
+		# Gyro only propagation from the last estimate
+		propagated = self.angles + np.cumsum(rates * dt[:, None], axis=0)
+
+		error = ref - propagated
+		error = np.arctan2(np.sin(error), np.cos(error))
+		error[np.isnan(error)] = 0.0
+
+		step = float(np.median(dt)) if len(dt) > 1 else float(dt[0])
+		a = self.tau / (self.tau + step) if step > 0.0 else 1.0
+
+		estimate = propagated + self._smooth(error, a)
+
+		self.bias -= self.bias_gain * np.sum(error * dt[:, None], axis=0)
+		self.angles = estimate[-1].copy()
+		self.last_time = times[-1]
+
+		estimate[:, 2] = np.arctan2(np.sin(estimate[:, 2]), np.cos(estimate[:, 2]))
+
+		return estimate
+
+	def reset(self):
+		"""Forget State, The Next Block Starts From Its References"""
+
+		self.angles = None
+		self.bias = np.zeros(3)
+		self.last_time = None
+
+class Sensor(ProductInfo):
+	"""Sensor, Sampled On Its Own Thread Into A SampleRing"""
+
+	# Subclasses set channels and implement open/read_sample/close, the
+	# acquisition thread keeps its own deadlines so the control loop never
+	# waits on a bus read
+
+	name = None
+	description = None
+
+	channels = list()
+	rate = 100.0
+	capacity = 4096
+
+	# process() runs on the acquisition thread every block samples, 0 turns it off
+	block = 0
+
+	ring = None
+	overruns = 0
+
+	def __init__(self, name=None, description=None, rate=None, capacity=None, config_section=None):
+		"""Initialize Sensor Instance"""
+
+		super().__init__()
+
+		if name is not None:
+			self.name = name
+		if description is not None:
+			self.description = description
+		if rate is not None:
+			self.rate = rate
+		if capacity is not None:
+			self.capacity = capacity
+
+		self.ring = SampleRing(len(self.channels), self.capacity)
+		self.overruns = 0
+		self._thread = None
+		self._stop = threading.Event()
+
+		if config_section is not None:
+			self.config(config_section)
+
+	def open(self):
+		"""Set Up Hardware, Override"""
+
+		pass
+
+	def read_sample(self, row):
+		"""Fill row With One Sample In Place, Override"""
+
+		raise NotImplementedError
+
+	def process(self):
+		"""Work On The Newest Block of Samples, Override"""
+
+		pass
+
+	def close(self):
+		"""Release Hardware, Override"""
+
+		pass
+
+	def start(self):
+		"""Start Acquisition Thread"""
+
+		if self._thread is not None:
+			return
+
+		if self.ring.capacity != self.capacity or self.ring.channels != len(self.channels):
+			self.ring = SampleRing(len(self.channels), self.capacity)
+
+		self.open()
+
+		self._stop.clear()
+		self._thread = threading.Thread(target=self._acquire_loop, name=f"sensor:{self.name}", daemon=True)
+		self._thread.start()
+
+	def _acquire_loop(self):
+		"""Read At rate Against Absolute Deadlines, A Late Read Skips Missed Slots Instead of Bursting"""
+
+		period = 1.0 / self.rate
+		row = np.zeros(len(self.channels))
+		due = time.monotonic()
+
+		while not self._stop.is_set():
+			try:
+				self.read_sample(row)
+			except OSError as err:
+				DbgMsg(f"Sensor {self.name} read failed : {err}")
+			else:
+				self.ring.append(time.monotonic(), row)
+
+				if self.block > 0 and self.ring.count % self.block == 0:
+					self.process()
+
+			due += period
+			now = time.monotonic()
+
+			if now > due:
+				missed = int((now - due) / period) + 1
+
+				self.overruns += missed
+				due += missed * period
+
+			self._stop.wait(due - now)
+
+	def stop(self):
+		"""Stop Acquisition Thread"""
+
+		self._stop.set()
+
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
+
+			self.close()
+
+	def latest(self, length=None):
+		"""Newest Samples As (times, rows)"""
+
+		return self.ring.latest(length)
+
+	def window(self, seconds):
+		"""Samples From The Last seconds As (times, rows)"""
+
+		return self.ring.window(seconds)
+
+	def decimated(self, factor, length=None):
+		"""Every factor'th Sample As (times, rows)"""
+
+		return self.ring.decimated(factor, length)
+
+	def telemetry(self):
+		"""Newest Sample By Channel"""
+
+		times, rows = self.ring.latest(1)
+
+		return {
+			"rate" : self.rate,
+			"samples" : self.ring.count,
+			"overruns" : self.overruns,
+			"time" : float(times[0]) if len(times) > 0 else None,
+			"values" : dict(zip(self.channels, rows[0].tolist())) if len(rows) > 0 else dict()
+		}
+
+	def config(self, config_section):
+		"""Config Sensor From INI Section"""
+
+		super().config(config_section)
+
+		self.rate = config_section.getfloat("rate", fallback=self.rate)
+		self.capacity = config_section.getint("ring_samples", fallback=self.capacity)
+
+class Feature(ProductInfo):
+	"""Feature Class"""
+
+	def __init__(self):
+		"""Initialize Feature Instance"""
+
+		pass
+
+class ScheduledTimer():
+	"""Timer Handle Returned By The Scheduler"""
+
+	due = 0.0
+	interval = None
+	callback = None
+	args = None
+	cancelled = False
+
+	def __init__(self, due, interval, callback, args):
+		"""Init Timer Handle"""
+
+		self.due = due
+		self.interval = interval
+		self.callback = callback
+		self.args = args
+		self.cancelled = False
+
+	def cancel(self):
+		"""Cancel Timer"""
+
+		self.cancelled = True
+
+class Scheduler():
+	"""Event Driven Control Loop Scheduler"""
+
+	# Fixed rate ticks only run while tick handlers are registered, otherwise
+	# the loop sleeps until the next timer, a post(), a signal or stop()
+
+	rate = 50.0
+	period = 0.02
+	running = False
+
+	def __init__(self, rate=50.0):
+		"""Init Scheduler Instance"""
+
+		self._lock = threading.Lock()
+		self._wakeup = threading.Event()
+		self._timers = list()
+		self._sequence = 0
+		self._posted = list()
+		self._tick_handlers = list()
+		self._stop_handlers = list()
+		self._next_tick = None
+
+		self.running = False
+		self.set_rate(rate)
+		self.reset_stats()
+
+	def set_rate(self, rate):
+		"""Set Control Tick Rate (Hz)"""
+
+		self.rate = float(rate)
+		self.period = 1.0 / self.rate
+		self._next_tick = None
+
+	def reset_stats(self):
+		"""Reset Deadline Accounting"""
+
+		self.ticks = 0
+		self.overruns = 0
+		self.skipped = 0
+		self.errors = 0
+		self.max_lateness = 0.0
+		self.max_work = 0.0
+		self.work_time = 0.0
+		self.idle_time = 0.0
+
+	def stats(self):
+		"""Deadline Accounting Snapshot"""
+
+		ticks = self.ticks if self.ticks > 0 else 1
+
+		stats = {
+			"rate" : self.rate,
+			"ticks" : self.ticks,
+			"overruns" : self.overruns,
+			"skipped" : self.skipped,
+			"errors" : self.errors,
+			"max_lateness" : self.max_lateness,
+			"max_work" : self.max_work,
+			"avg_work" : self.work_time / ticks,
+			"load" : self.work_time / (self.work_time + self.idle_time) if self.work_time + self.idle_time > 0 else 0.0
+		}
+
+		return stats
+
+	def on_tick(self, callback):
+		"""Register Control Tick Handler, Called As callback(now)"""
+
+		with self._lock:
+			if not callback in self._tick_handlers:
+				self._tick_handlers.append(callback)
+
+		self.wakeup()
+
+	def remove_tick(self, callback):
+		"""Remove Control Tick Handler"""
+
+		with self._lock:
+			if callback in self._tick_handlers:
+				self._tick_handlers.remove(callback)
+
+	def on_stop(self, callback):
+		"""Register callback(), Run On The Scheduler Thread When The Loop Ends"""
+
+		with self._lock:
+			if not callback in self._stop_handlers:
+				self._stop_handlers.append(callback)
+
+	def call_at(self, due, callback, *args, interval=None):
+		"""Schedule Callback At Given time.monotonic() Value"""
+
+		timer = ScheduledTimer(due, interval, callback, args)
+
+		with self._lock:
+			self._sequence += 1
+			heapq.heappush(self._timers, (due, self._sequence, timer))
+
+		self.wakeup()
+
+		return timer
+
+	def call_later(self, delay, callback, *args):
+		"""Schedule Callback After Delay (seconds)"""
+
+		return self.call_at(time.monotonic() + delay, callback, *args)
+
+	def call_every(self, interval, callback, *args):
+		"""Schedule Repeating Callback"""
+
+		return self.call_at(time.monotonic() + interval, callback, *args, interval=interval)
+
+	def cancel(self, timer):
+		"""Cancel Timer"""
+
+		if timer is not None:
+			timer.cancel()
+
+	def post(self, callback, *args):
+		"""Run Callback On The Scheduler Thread As Soon As Possible (Thread Safe)"""
+
+		with self._lock:
+			self._posted.append((callback, args))
+
+		self.wakeup()
+
+	def wakeup(self):
+		"""Wake Scheduler Loop"""
+
+		self._wakeup.set()
+
+	def stop(self, *args):
+		"""Stop Scheduler Loop, Usable As Signal Handler"""
+
+		self.running = False
+		self.wakeup()
+
+	def handle_signals(self, signals=None):
+		"""Install stop() As Handler For Given Signals"""
+
+		if signals is None:
+			signals = [ signal.SIGINT, signal.SIGTERM ]
+
+		if threading.current_thread() is threading.main_thread():
+			for sig in signals:
+				signal.signal(sig, self.stop)
+		else:
+			DbgMsg("Signal handlers can only be installed from the main thread")
+
+	def _call(self, callback, *args):
+		"""Run One Callback, A Failing Callback Is Logged And The Loop Keeps Running"""
+
+		try:
+			callback(*args)
+		except Exception as err:
+			self.errors += 1
+			DbgMsg(f"Scheduler callback {getattr(callback, '__qualname__', callback)} failed : {err}")
+
+	def _run_posted(self):
+		"""Run Posted Callbacks"""
+
+		with self._lock:
+			posted = self._posted
+			self._posted = list()
+
+		for callback, args in posted:
+			self._call(callback, *args)
+
+	def _run_timers(self, now):
+		"""Run Due Timers"""
+
+		while True:
+			with self._lock:
+				if len(self._timers) == 0 or self._timers[0][0] > now:
+					break
+
+				due, seq, timer = heapq.heappop(self._timers)
+
+			if timer.cancelled:
+				continue
+
+			if timer.interval is not None:
+				timer.due = due + timer.interval
+
+				if timer.due <= now:
+					timer.due = now + timer.interval
+
+				with self._lock:
+					self._sequence += 1
+					heapq.heappush(self._timers, (timer.due, self._sequence, timer))
+
+			self._call(timer.callback, *timer.args)
+
+	def _run_tick(self, now):
+		"""Run Control Tick And Account For Its Deadline"""
+
+		lateness = now - self._next_tick
+
+		if lateness > self.max_lateness:
+			self.max_lateness = lateness
+
+		with self._lock:
+			handlers = list(self._tick_handlers)
+
+		for handler in handlers:
+			self._call(handler, now)
+
+		finished = time.monotonic()
+		work = finished - now
+
+		self.ticks += 1
+		self.work_time += work
+
+		if work > self.max_work:
+			self.max_work = work
+
+		self._next_tick += self.period
+
+		if finished > self._next_tick:
+			# Overran the tick deadline, resync rather than bursting to catch up
+			self.overruns += 1
+			missed = int((finished - self._next_tick) / self.period) + 1
+
+			self.skipped += missed - 1
+			self._next_tick += missed * self.period
+
+	def _next_deadline(self):
+		"""Get Next Wakeup Time, None When Idle"""
+
+		deadline = None
+
+		with self._lock:
+			if len(self._tick_handlers) > 0:
+				if self._next_tick is None:
+					self._next_tick = time.monotonic()
+
+				deadline = self._next_tick
+			else:
+				self._next_tick = None
+
+			if len(self._timers) > 0:
+				due = self._timers[0][0]
+
+				if deadline is None or due < deadline:
+					deadline = due
+
+		return deadline
+
+	def run_once(self, timeout=None):
+		"""Run One Pass Of The Loop, Sleeping Until Work Is Due"""
+
+		deadline = self._next_deadline()
+
+		now = time.monotonic()
+
+		wait = None if deadline is None else deadline - now
+
+		if timeout is not None and (wait is None or wait > timeout):
+			wait = timeout
+
+		if wait is None or wait > 0:
+			self._wakeup.wait(wait)
+			self.idle_time += time.monotonic() - now
+
+		self._wakeup.clear()
+
+		self._run_posted()
+
+		now = time.monotonic()
+
+		self._run_timers(now)
+
+		if self._next_tick is not None and now >= self._next_tick:
+			self._run_tick(now)
+
+	def run(self):
+		"""Run Scheduler Until stop() Is Called"""
+
+		self.running = True
+
+		try:
+			while self.running:
+				self.run_once()
+		finally:
+			self.running = False
+
+			with self._lock:
+				handlers = list(self._stop_handlers)
+
+			for handler in handlers:
+				self._call(handler)
+
+class CommandQueue():
+	"""Latest Wins Command Queue, Drained On The Control Tick"""
+
+	# Commands are queued under a key naming what they control, a newer
+	# command for the same key replaces the queued one and takes its place
+	# at the back, so inputs arriving faster than the control rate never
+	# build a backlog and drain still runs in arrival order
+
+	scheduler = None
+
+	def __init__(self, scheduler=None):
+		"""Init Command Queue"""
+
+		self._lock = threading.Lock()
+		self._pending = dict()
+		self._armed = False
+
+		self.scheduler = scheduler
+
+		self.submitted = 0
+		self.coalesced = 0
+		self.executed = 0
+		self.failed = 0
+
+	def submit(self, key, name, callback, *args):
+		"""Queue Command, Returns True If It Replaced A Pending One"""
+
+		with self._lock:
+			replaced = self._pending.pop(key, None) is not None
+
+			self._pending[key] = (name, callback, args)
+			self.submitted += 1
+
+			if replaced:
+				self.coalesced += 1
+
+			arm = self.scheduler is not None and not self._armed
+			self._armed = True
+
+		if arm:
+			self.scheduler.on_tick(self._tick)
+
+		return replaced
+
+	def pending(self):
+		"""Number of Queued Commands"""
+
+		with self._lock:
+			return len(self._pending)
+
+	def _tick(self, now):
+		"""Scheduler Tick Handler"""
+
+		if self.drain() == 0:
+			with self._lock:
+				if len(self._pending) == 0:
+					self._armed = False
+					self.scheduler.remove_tick(self._tick)
+
+	def drain(self):
+		"""Run Queued Commands In Arrival Order, Returns Number Run"""
+
+		with self._lock:
+			pending = self._pending
+			self._pending = dict()
+
+		for name, callback, args in pending.values():
+			try:
+				with tracer.span(tr_handler, name):
+					callback(*args)
+
+				self.executed += 1
+			except Exception as err:
+				self.failed += 1
+				DbgMsg(f"Command {name} failed : {err}")
+
+		return len(pending)
+
+class CompiledSection(dict):
+	"""Config Section From A Snapshot, Same Getters As A configparser Section"""
+
+	name = None
+
+	def __init__(self, name, values):
+		"""Init Compiled Section"""
+
+		super().__init__(values)
+
+		self.name = name
+
+	def get(self, option, fallback=None):
+		"""Get Value"""
+
+		return self[option] if option in self else fallback
+
+	def getint(self, option, fallback=None):
+		"""Get Value As Integer"""
+
+		return int(self[option]) if option in self else fallback
+
+	def getfloat(self, option, fallback=None):
+		"""Get Value As Float"""
+
+		return float(self[option]) if option in self else fallback
+
+	def getboolean(self, option, fallback=None):
+		"""Get Value As Boolean"""
+
+		if not option in self:
+			return fallback
+
+		return configparser.ConfigParser.BOOLEAN_STATES[self[option].lower()]
+
+class ConfigSnapshot():
+	"""Validated, Pre Parsed Robot INI"""
+
+	config_file = None
+	digest = None
+	specs = None
+	errors = None
+
+	_sections = None
+
+	def __init__(self, config_file, digest):
+		"""Init Config Snapshot"""
+
+		self.config_file = config_file
+		self.digest = digest
+		self.specs = dict()
+		self.errors = list()
+
+		self._sections = dict()
+
+	def __contains__(self, section):
+		return section in self._sections
+
+	def __getitem__(self, section):
+		return self._sections[section]
+
+	def sections(self):
+		"""Section Names, Like configparser"""
+
+		return list(self._sections.keys())
+
+	def error(self, msg):
+		"""Record Validation Error"""
+
+		self.errors.append(msg)
+
+		DbgMsg(msg)
+
+	def _compile_specs(self, value):
+		"""Pre Parse One Value The Way get_specs_sv/get_specs_dict Would"""
+
+		items = value.split(",")
+
+		self.specs[(value, ",")] = items
+
+		pairs = [ item.split(":") for item in items ]
+
+		if len(pairs) > 0 and all([ len(pair) == 2 for pair in pairs ]):
+			self.specs[value] = { field : field_value for field, field_value in pairs }
+
+	def _validate_motors(self, section):
+		"""Check Motor Definitions In A Motor Control Section"""
+
+		for motor_name in section.get("motors", fallback="").split(","):
+			if motor_name == "":
+				continue
+
+			if not motor_name in section:
+				self.error(f"Motor {motor_name} listed in {section.name} has no definition")
+				continue
+
+			spec = self.specs.get(section[motor_name])
+
+			if spec is None or not "type" in spec:
+				self.error(f"Motor {motor_name} in {section.name} needs a type:... definition")
+				continue
+
+			try:
+				int(spec.get("polarity", 1))
+				float(spec.get("trim", 0.0))
+			except ValueError as err:
+				self.error(f"Motor {motor_name} in {section.name} has a bad value : {err}")
+
+	def _validate_device(self, kind, label):
+		"""Check An Element Section, Build Out Reads The Section Itself"""
+
+		if not label in self._sections:
+			self.error(f"Element {label} named in [{kind}] has no section")
+			return
+
+		section = self._sections[label]
+
+		if not "hardware" in section:
+			self.error(f"Element section {label} has no 'hardware' key")
+			return
+
+		for option in int_options:
+			if option in section:
+				try:
+					int(section[option])
+				except ValueError:
+					self.error(f"Option {option} in {label} is not an integer")
+
+		self._validate_motors(section)
+
+	def compile(self, config_obj):
+		"""Compile Parsed INI Into The Snapshot"""
+
+		for name in config_obj.sections():
+			section = CompiledSection(name, config_obj[name])
+
+			self._sections[name] = section
+
+			for value in section.values():
+				self._compile_specs(value)
+
+		for kind in element_kinds:
+			if kind in self._sections:
+				for element, label in self._sections[kind].items():
+					self._validate_device(kind, label)
+
+	def preload(self):
+		"""Load Pre Parsed Specs Into The Spec Cache"""
+
+		spec_cache.update(self.specs)
+
+class VendorRegistry():
+	"""Vendor Plugin Registry, Indexes Hardware Types Declared By Vendor Modules"""
+
+	def __init__(self):
+		"""Init Vendor Registry"""
+
+		self._lock = threading.Lock()
+		self.vendors = dict()
+		self.types = dict()
+		self.loaded_drivers = set()
+		# name : (time.perf_counter() at start, seconds)
+		self.import_times = dict()
+		self.driver_times = dict()
+
+	def load(self, vendor):
+		"""Import Vendor Module And Index Its hardware_types Declaration"""
+
+		if vendor in self.vendors:
+			return self.vendors[vendor]
+
+		start = time.perf_counter()
+
+		try:
+			module = importlib.import_module(vendor)
+		except ImportError as err:
+			DbgMsg(f"Could not import vendor module {vendor} : {err}")
+			return None
+
+		self.import_times[vendor] = (start, time.perf_counter() - start)
+
+		declared = getattr(module, "hardware_types", dict())
+
+		with self._lock:
+			self.vendors[vendor] = module
+
+			for hardware, declaration in declared.items():
+				builder, drivers = declaration[0:2]
+				bus = declaration[2] if len(declaration) > 2 else None
+
+				self.types[hardware_key(hardware)] = hardware_entry(vendor, builder, tuple(drivers), bus)
+
+		return module
+
+	def entry(self, hardware):
+		"""Get Registry Entry For Hardware Type, None If No Vendor Declares It"""
+
+		return self.types.get(hardware_key(hardware))
+
+	def owns(self, vendor, hardware):
+		"""Does Vendor Declare Hardware Type"""
+
+		entry = self.entry(hardware)
+
+		return entry is not None and entry.vendor == vendor
+
+	def load_drivers(self, hardware):
+		"""Import Driver Modules Needed By Hardware Type"""
+
+		entry = self.entry(hardware)
+
+		if entry is None or simulated():
+			return
+
+		for driver in entry.drivers:
+			if not driver in self.loaded_drivers:
+				start = time.perf_counter()
+
+				importlib.import_module(driver)
+
+				with self._lock:
+					self.loaded_drivers.add(driver)
+					self.driver_times[driver] = (start, time.perf_counter() - start)
+
+	def builder(self, hardware):
+		"""Get Builder For Hardware Type, Importing Its Drivers On First Use"""
+
+		entry = self.entry(hardware)
+
+		if entry is None:
+			return None
+
+		self.load_drivers(hardware)
+
+		return getattr(self.vendors[entry.vendor], entry.builder)
+
+class BuildJob():
+	"""One Element Section Waiting To Be Built"""
+
+	label = None
+	hardware = None
+	entry = None
+	description = None
+	section = None
+	bus = None
+	lane = None
+	depends = None
+
+	device = None
+	error = None
+	driver_seconds = 0.0
+	build_seconds = 0.0
+	started = 0.0
+	finished = 0.0
+
+	def __init__(self, label, hardware, entry, description, section):
+		"""Init Build Job"""
+
+		self.label = label
+		self.hardware = hardware
+		self.entry = entry
+		self.description = description
+		self.section = section
+		self.bus = device_bus(label, entry, section)
+		self.lane = self.bus
+		self.depends = [ dep for dep in section.get("depends", fallback="").split(",") if dep != "" ]
+		self.done = threading.Event()
+
+	def report(self):
+		"""Get Build Report"""
+
+		return build_report(self.label, self.hardware, self.entry.vendor, self.bus,
+			self.driver_seconds, self.build_seconds, self.started, self.finished, self.error)
+
+class StartupProfiler():
+	"""Times Start Up Phases, Reports Them As A Table And As JSON"""
+
+	origin = 0.0
+	phases = None
+	info = None
+
+	def __init__(self, origin=None):
+		"""Init Startup Profiler, origin Is A time.perf_counter() Value"""
+
+		self.origin = origin if origin is not None else time.perf_counter()
+		self.phases = list()
+		self.info = dict()
+
+	def record(self, name, kind, seconds, start=None):
+		"""Record Phase, start Is Seconds From origin"""
+
+		if start is None:
+			start = time.perf_counter() - self.origin - seconds
+
+		self.phases.append({ "name" : name, "kind" : kind, "start" : start, "seconds" : seconds })
+
+	@contextlib.contextmanager
+	def phase(self, name, kind="phase"):
+		"""Time Block As A Phase"""
+
+		start = time.perf_counter()
+
+		try:
+			yield
+		finally:
+			finished = time.perf_counter()
+
+			self.record(name, kind, finished - start, start - self.origin)
+
+	def mark(self, name):
+		"""Record Point In Time"""
+
+		self.record(name, "mark", 0.0, time.perf_counter() - self.origin)
+
+	def collect(self, robot):
+		"""Pull Vendor Imports, Driver Imports And Device Builds From A Robot"""
+
+		for vendor, (start, seconds) in robot.registry.import_times.items():
+			self.record(vendor, "vendor import", seconds, start - self.origin)
+
+		for driver, (start, seconds) in robot.registry.driver_times.items():
+			self.record(driver, "driver import", seconds, start - self.origin)
+
+		for report in robot.build_reports or list():
+			start = robot.build_origin - self.origin + report.started + report.driver_seconds
+
+			self.record(report.label, "device build", report.build_seconds, start)
+
+		if robot.build_critical_path is not None:
+			self.info["critical_path"] = robot.build_critical_path
+
+	def total(self):
+		"""Seconds From origin To The Last Recorded Phase"""
+
+		return max([ phase["start"] + phase["seconds"] for phase in self.phases ] + [ 0.0 ])
+
+	def table(self):
+		"""Format Phases As A Text Table"""
+
+		width = max([ len(phase["name"]) for phase in self.phases ] + [ 5 ])
+
+		lines = [ f"{'Phase':<{width}}  {'Kind':<14}  {'Start':>9}  {'Seconds':>9}" ]
+		lines.append("-" * len(lines[0]))
+
+		for phase in sorted(self.phases, key=lambda item : item["start"]):
+			lines.append(f"{phase['name']:<{width}}  {phase['kind']:<14}  {phase['start']:>9.4f}  {phase['seconds']:>9.4f}")
+
+		lines.append("-" * len(lines[0]))
+		lines.append(f"{'Total':<{width}}  {'':<14}  {'':>9}  {self.total():>9.4f}")
+
+		return "\n".join(lines)
+
+	def save(self, filename):
+		"""Write Machine Readable Report"""
+
+		report = {
+			"timestamp" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+			"host" : platform.node(),
+			"python" : platform.python_version(),
+			"machine" : platform.machine(),
+			"total" : self.total(),
+			"info" : self.info,
+			"phases" : self.phases
+		}
 
-			for group in groups:
-				members = config_section.get(group, fallback="").split(",")
+		with open(filename, "w") as output:
+			json.dump(report, output, indent=2)
 
-				memberships[group] = members
+class RollingHistogram():
+	"""Latency Samples Over The Last window Events, Bucketed On Query"""
 
-			self.get_motor_groups(memberships)
+	# Bucket upper bounds in microseconds, powers of two from 1us to ~1s
+	edges = [ 2 ** power for power in range(21) ]
+
+	window = trace_window
+	count = 0
+
+	def __init__(self, window=trace_window):
+		"""Init Histogram"""
+
+		self.window = window
+		self.count = 0
+		self._samples = np.zeros(window)
+
+	def add(self, seconds):
+		"""Add Sample, Overwriting The Oldest Once The Window Is Full"""
+
+		self._samples[self.count % self.window] = seconds
+		self.count += 1
+
+	def values(self):
+		"""Samples In The Window, In Seconds"""
+
+		return self._samples[:min(self.count, self.window)].copy()
+
+	def buckets(self):
+		"""Non Empty Buckets As (upper bound us, count)"""
+
+		counts, _ = np.histogram(self.values() * 1e6, bins=[ 0 ] + self.edges + [ np.inf ])
+
+		return [ (upper, int(count)) for upper, count in zip(self.edges + [ np.inf ], counts) if count > 0 ]
+
+	def summary(self):
+		"""Percentiles Over The Window In Microseconds"""
+
+		samples = self.values() * 1e6
+
+		if len(samples) == 0:
+			return { "count" : self.count, "window" : 0 }
+
+		p50, p90, p99 = np.percentile(samples, [ 50, 90, 99 ])
+
+		return {
+			"count" : self.count,
+			"window" : len(samples),
+			"p50_us" : float(p50),
+			"p90_us" : float(p90),
+			"p99_us" : float(p99),
+			"max_us" : float(samples.max()),
+			"mean_us" : float(samples.mean())
+		}
+
+class TraceSpan():
+	"""Timed Stage Of A Command, Outermost Span On A Thread Roots The Trace"""
+
+	__slots__ = ( "tracer", "stage", "label", "start", "depth", "children", "spans" )
+
+	def __init__(self, tracer, stage, label=None):
+		"""Init Span"""
+
+		self.tracer = tracer
+		self.stage = stage
+		self.label = label
+		self.start = 0.0
+		self.depth = 0
+		self.children = 0.0
+		self.spans = None
+
+	def __enter__(self):
+		"""Start Span"""
+
+		self.tracer._push(self)
+		self.start = time.perf_counter()
+
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		"""Finish Span"""
+
+		self.tracer._pop(self, time.perf_counter() - self.start)
+
+		return False
+
+class Tracer():
+	"""Per Stage Latency Tracing Of The Command Path, Costs One Flag Check While Disabled"""
+
+	# Every stage gets a rolling histogram, a root span also records its own
+	# time less its direct children as "<stage>.self", which is where handler
+	# overhead like logging shows up
+
+	enabled = False
+	window = trace_window
+
+	def __init__(self, enabled=False, window=trace_window, keep=trace_keep):
+		"""Init Tracer"""
+
+		self.enabled = enabled
+		self.window = window
+		self.histograms = dict()
+		self.traces = deque(maxlen=keep)
+		self._lock = threading.Lock()
+		self._local = threading.local()
+
+	def enable(self, enabled=True):
+		"""Turn Tracing On Or Off"""
+
+		self.enabled = enabled
+
+	def span(self, stage, label=None):
+		"""Context Manager Timing A Stage"""
+
+		if not self.enabled:
+			return null_span
+
+		return TraceSpan(self, stage, label)
+
+	def traced(self, stage, label=None):
+		"""Decorator Timing Every Call As A Stage, Labeled With The Function Name By Default"""
+
+		def decorate(func):
+			name = label if label is not None else func.__name__
+
+			def wrapper(*args, **kwargs):
+				if not self.enabled:
+					return func(*args, **kwargs)
+
+				with TraceSpan(self, stage, name):
+					return func(*args, **kwargs)
+
+			wrapper.__name__ = func.__name__
+			wrapper.__doc__ = func.__doc__
+
+			return wrapper
+
+		return decorate
+
+	def _push(self, span):
+		"""Enter Span On This Thread's Stack"""
+
+		stack = getattr(self._local, "stack", None)
+
+		if stack is None:
+			stack = self._local.stack = list()
+
+		span.depth = len(stack)
+
+		if span.depth == 0:
+			span.spans = list()
+
+		stack.append(span)
+
+	def _pop(self, span, seconds):
+		"""Leave Span, Record Its Time And Roll It Into The Trace"""
+
+		stack = self._local.stack
+		stack.pop()
+
+		self.record(span.stage, seconds)
+
+		if len(stack) > 0:
+			root = stack[0]
+
+			stack[-1].children += seconds
+			root.spans.append((span.stage, span.label, span.start - root.start, seconds, span.depth))
 		else:
-			DbgMsg(f"No groups label in config section for {self.name}")
+			self.record(f"{span.stage}.self", seconds - span.children)
 
-		for motor in self.motors:
-			motor.config(config_section)
+			span.spans.append((span.stage, span.label, 0.0, seconds, 0))
 
-class LED(DigitalGPIODevice):
-	"""Simple LED"""
+			with self._lock:
+				self.traces.append({ "stage" : span.stage, "label" : span.label, "seconds" : seconds, "spans" : span.spans })
 
-	def __init__(self, pig_obj, pin=None, name=None, description=None, config_section=None):
-		"""Initialize LED Instance"""
+	def record(self, stage, seconds):
+		"""Add Sample To Stage Histogram"""
 
-		super().__init__(pin, name=name, description=description, config_section=config_section)
+		with self._lock:
+			histogram = self.histograms.get(stage)
 
-	def on(self):
-		self.write(1)
+			if histogram is None:
+				histogram = self.histograms[stage] = RollingHistogram(self.window)
 
-	def off(self):
-		self.write(0)
+			histogram.add(seconds)
 
-	def config(self, config_section):
-		"""Config Instance"""
+	def reset(self):
+		"""Drop All Samples And Traces"""
 
-		pass
+		with self._lock:
+			self.histograms = dict()
+			self.traces.clear()
 
-class Camera(ProductInfo):
-	"""Camera Class"""
+	def stats(self, stage=None):
+		"""Summary Per Stage, Or For One Stage"""
 
-	def __init__(self):
-		"""Initialize Camera Instance"""
+		with self._lock:
+			histograms = dict(self.histograms)
 
-		pass
+		if stage is not None:
+			return histograms[stage].summary() if stage in histograms else None
 
-class Sensor(ProductInfo):
-	"""Sensor Class"""
+		return { name : histogram.summary() for name, histogram in histograms.items() }
 
-	def __init__(self):
-		"""Initialize Sensor Instance"""
+	def histogram(self, stage):
+		"""Non Empty Buckets For Stage"""
 
-		pass
+		with self._lock:
+			histogram = self.histograms.get(stage)
 
-class Feature(ProductInfo):
-	"""Feature Class"""
+		return histogram.buckets() if histogram is not None else list()
 
-	def __init__(self):
-		"""Initialize Feature Instance"""
+	def recent(self, count=None):
+		"""Most Recent Command Traces, Newest Last, Spans As (stage, label, offset, seconds, depth)"""
 
-		pass
+		with self._lock:
+			traces = list(self.traces)
+
+		if count is not None:
+			traces = traces[-count:]
+
+		return [ dict(trace, spans=sorted(trace["spans"], key=lambda item : item[2])) for trace in traces ]
+
+	def table(self):
+		"""Format Stage Summaries As A Text Table"""
+
+		stats = self.stats()
+
+		width = max([ len(name) for name in stats ] + [ 5 ])
+
+		lines = [ f"{'Stage':<{width}}  {'Count':>8}  {'p50 us':>10}  {'p99 us':>10}  {'max us':>10}" ]
+		lines.append("-" * len(lines[0]))
+
+		for name in sorted(stats):
+			summary = stats[name]
+
+			if summary["window"] > 0:
+				lines.append(f"{name:<{width}}  {summary['count']:>8}  {summary['p50_us']:>10.1f}  {summary['p99_us']:>10.1f}  {summary['max_us']:>10.1f}")
+
+		return "\n".join(lines)
 
 class Robot(ProductInfo):
 	"""Robot Class"""
 
 	name = None
 	description = None
-	vendors = dict()
+	vendors = None
 
-	motor_controls = dict()
-	sensors = list()
-	features = list()
-	cameras = list()
+	motor_controls = None
+	sensors = None
+	features = None
+	cameras = None
 
 	elements = None
 
 	runloop = None
+	scheduler = None
+	spi_queue = None
+	commands = None
+	registry = None
+	build_reports = None
+	build_critical_path = None
+	build_origin = None
+	parallel_build = True
 
 	config_elements = None
 
-	def __init__(self, name="robbie", config_info=None, run=None):
+	def __init__(self, name="robbie", config_info=None, run=None, control_rate=50.0):
 		"""Init Robot"""
 
 		super().__init__()
@@ -788,6 +3868,15 @@ class Robot(ProductInfo):
 		self.name = name
 		self.description = "Just a robot in a human world"
 		self.runloop = run
+		self.vendors = dict()
+		self.motor_controls = dict()
+		self.sensors = dict()
+		self.features = dict()
+		self.cameras = dict()
+		self.registry = VendorRegistry()
+		self.scheduler = Scheduler(control_rate)
+		self.spi_queue = SPITransactionQueue(self.scheduler)
+		self.commands = CommandQueue(self.scheduler)
 
 		self.config_elements = config_info
 
@@ -795,21 +3884,223 @@ class Robot(ProductInfo):
 			self.elements = self.config(self.config_elements)
 
 	def add(self, item):
+		"""Add Built Device To Robot"""
+
+		if isinstance(item, SPIDevice) and item.queue is None:
+			item.queue = self.spi_queue
+
 		if isinstance(item,MotorController):
+			item.attach_scheduler(self.scheduler)
 			self.motor_controls[item.name] = item
-		elif isinstance(Camera):
-			pass
-		elif isinstance(Sensor):
-			pass
-		elif isinstance(Feature):
-			pass
+		elif isinstance(item, Camera):
+			self.cameras[item.name] = item
+		elif isinstance(item, Sensor):
+			self.sensors[item.name] = item
+		else:
+			self.features[item.name] = item
 
 	def run(self, *args, **kwargs):
 		"""Execute Run Loop"""
 
+		# The runloop sets up inputs and handlers, the scheduler then owns the main thread
 		if self.runloop is not None:
 			self.runloop(self, args, kwargs)
 
+		for device in list(self.cameras.values()) + list(self.sensors.values()):
+			device.start()
+
+		self.scheduler.handle_signals()
+
+		try:
+			self.scheduler.run()
+		finally:
+			for device in list(self.cameras.values()) + list(self.sensors.values()):
+				device.stop()
+
+			for mc in self.motor_controls.values():
+				mc.halt()
+
+				if mc.watchdog is not None:
+					mc.watchdog.stop()
+
+	def stop(self):
+		"""Stop Run Loop"""
+
+		self.scheduler.stop()
+
+	def snapshot(self):
+		"""Live State Of Every Element, JSON Serializable"""
+
+		state = {
+			"time" : time.time(),
+			"name" : self.name
+		}
+
+		for kind in element_kinds:
+			state[kind] = { label : element.telemetry() for label, element in getattr(self, kind).items() if hasattr(element, "telemetry") }
+
+		return state
+
+	def build_out(self, vendors=None, parallel=None):
+		"""Build Every Element Section, Independent Buses Are Initialized In Parallel"""
+
+		if parallel is None:
+			parallel = self.parallel_build
+
+		jobs = self._collect_build_jobs(vendors)
+		ordered = self._order_build_jobs(jobs)
+
+		origin = self.build_origin = time.perf_counter()
+
+		if parallel and len(ordered) > 1:
+			buses = dict()
+
+			for job in ordered:
+				buses.setdefault(job.bus, list()).append(job)
+
+			with concurrent.futures.ThreadPoolExecutor(max_workers=len(buses), thread_name_prefix="build_out") as pool:
+				futures = [ pool.submit(self._run_build_jobs, bus_jobs, jobs, origin) for bus_jobs in buses.values() ]
+
+				for future in futures:
+					future.result()
+		else:
+			for job in ordered:
+				job.lane = "sequential"
+
+			self._run_build_jobs(ordered, jobs, origin)
+
+		built_elements = list()
+
+		# Register in INI order whatever order the buses finished in
+		for job in jobs.values():
+			if job.device is not None:
+				built_elements.append(job.device)
+
+				self.add(job.device)
+
+		reports = [ job.report() for job in jobs.values() ]
+
+		if vendors is None:
+			self.build_reports = reports
+		else:
+			self.build_reports = (self.build_reports or list()) + reports
+
+		self.build_critical_path = self._critical_path(ordered, jobs)
+
+		return built_elements
+
+	def _collect_build_jobs(self, vendors=None):
+		"""Single Pass Over Element Sections, Indexed By Hardware Type"""
+
+		jobs = dict()
+		unknown = set()
+
+		for kind in element_kinds:
+			for element, section_label in getattr(self.elements, kind).items():
+				section = self.get_element_section(section_label)
+
+				if section is None:
+					continue
+
+				if not "hardware" in section:
+					DbgMsg(f"No 'hardware' key in section {section_label}")
+					continue
+
+				device_type = section["hardware"]
+				entry = self.registry.entry(device_type)
+
+				if entry is None:
+					if vendors is None and not hardware_key(device_type) in unknown:
+						unknown.add(hardware_key(device_type))
+						DbgMsg(f"No vendor module declares hardware type {device_type}")
+
+					continue
+
+				if vendors is not None and not entry.vendor in vendors:
+					continue
+
+				description = section.get("description", fallback="No description")
+
+				jobs[section_label] = BuildJob(section_label, device_type, entry, description, section)
+
+		return jobs
+
+	def _order_build_jobs(self, jobs):
+		"""Order Jobs So Every Job Comes After Its Dependencies"""
+
+		ordered = list()
+		state = dict()
+
+		def visit(job, path):
+			if state.get(job.label) == "done":
+				return
+
+			if state.get(job.label) == "visiting":
+				DbgMsg(f"Dependency cycle in build out at {job.label}, ignoring {path[-1]} -> {job.label}")
+				jobs[path[-1]].depends.remove(job.label)
+				return
+
+			state[job.label] = "visiting"
+
+			for dep in list(job.depends):
+				if dep in jobs:
+					visit(jobs[dep], path + [ job.label ])
+				else:
+					DbgMsg(f"{job.label} depends on {dep}, which is not being built")
+					job.depends.remove(dep)
+
+			state[job.label] = "done"
+			ordered.append(job)
+
+		for job in jobs.values():
+			visit(job, list())
+
+		return ordered
+
+	def _run_build_jobs(self, bus_jobs, jobs, origin):
+		"""Build Jobs Sharing A Bus One After Another"""
+
+		for job in bus_jobs:
+			for dep in job.depends:
+				jobs[dep].done.wait()
+
+			job.started = time.perf_counter() - origin
+
+			try:
+				start = time.perf_counter()
+				builder = self.registry.builder(job.hardware)
+				loaded = time.perf_counter()
+
+				job.driver_seconds = loaded - start
+				job.device = builder(job.label, job.description, job.section)
+				job.build_seconds = time.perf_counter() - loaded
+			except Exception as err:
+				job.device = None
+				job.error = f"{type(err).__name__}: {err}"
+				DbgMsg(f"Building {job.label} ({job.hardware}) failed : {job.error}")
+
+			job.finished = time.perf_counter() - origin
+			job.done.set()
+
+	def _critical_path(self, ordered, jobs):
+		"""Walk Back From The Last Job To Finish Through Whatever Held Each Job Up"""
+
+		if len(ordered) == 0:
+			return list()
+
+		path = list()
+		job = max(ordered, key=lambda item : item.finished)
+
+		while job is not None:
+			path.insert(0, job.label)
+
+			blockers = [ jobs[dep] for dep in job.depends ]
+			blockers.extend([ other for other in ordered if other.lane == job.lane and other.finished <= job.started and other is not job ])
+
+			job = max(blockers, key=lambda item : item.finished) if len(blockers) > 0 else None
+
+		return path
+
 	def get_element_section(self, section_label):
 		"""Get Element Config Section From INI"""
 
@@ -832,15 +4123,20 @@ class Robot(ProductInfo):
 
 		self.name = main.get("name", fallback="robbie")
 		self.description = main.get("description", fallback="Justa robot in a human world")
+		self.scheduler.set_rate(main.getfloat("control_rate", fallback=self.scheduler.rate))
+		self.parallel_build = main.getboolean("parallel_build", fallback=True)
 
-		vendors = main.get("vendors", fallback="").split(",")
-		for vendor in vendors:
-			self.vendors[vendor] = None
+		if "trace" in main and not "RI_TRACE" in os.environ:
+			tracer.enable(main.getboolean("trace", fallback=False))
+
+		if "backend" in main and not "RI_BACKEND" in os.environ:
+			use_backend(main["backend"])
 
-			# check namspace if not there, import
-			# if there OR imported, check for "build_out"
-			# and add to vendors[vendor]
-			#importlib.import_module(vendor)
+		vendors = self.get_specs_sv(main.get("vendors", fallback=""))
+
+		for vendor in vendors:
+			if vendor != "":
+				self.vendors[vendor] = self.registry.load(vendor)
 
 		motor_controls = dict()
 		cameras = dict()
@@ -874,3 +4170,259 @@ class Robot(ProductInfo):
 		elements = robot_elements(motor_controls, cameras, sensors, features)
 
 		return elements
+
+#
+# Functions
+#
+
+def use_backend(name):
+	"""Select Hardware Backend, bk_hardware or bk_sim"""
+
+	global backend
+
+	if not name in [ bk_hardware, bk_sim ]:
+		raise ValueError(f"Unknown hardware backend {name}")
+
+	backend = name
+
+	if backend == bk_sim:
+		import ri_sim
+
+		ri_sim.install_gpiozero()
+
+def simulated():
+	"""Is The Simulation Backend Selected"""
+
+	return backend == bk_sim
+
+def spi_device():
+	"""Get New spidev.SpiDev From The Selected Backend"""
+
+	if simulated():
+		import ri_sim
+
+		return ri_sim.SimSpiDev()
+
+	import spidev
+
+	return spidev.SpiDev()
+
+def smbus_device(bus=1):
+	"""Get smbus.SMBus From The Selected Backend"""
+
+	if simulated():
+		import ri_sim
+
+		return ri_sim.SimSMBus(bus)
+
+	import smbus
+
+	return smbus.SMBus(bus)
+
+def pigpio_device():
+	"""Get pigpio.pi Connection From The Selected Backend"""
+
+	if simulated():
+		import ri_sim
+
+		return ri_sim.SimPigpio()
+
+	import pigpio
+
+	pi = pigpio.pi()
+
+	if not pi.connected:
+		raise OSError("Can't connect to pigpiod, is the daemon running?")
+
+	return pi
+
+def gpio_bank():
+	"""Get Process Wide GPIO Bank"""
+
+	global __gpio__
+
+	with gpio_lock:
+		if __gpio__ is None:
+			__gpio__ = GPIOBank()
+
+	return __gpio__
+
+def spi_bus_manager():
+	"""Get Process Wide SPI Bus Manager"""
+
+	global __spi__
+
+	# Parallel build out attaches devices from several threads
+	with spi_lock:
+		if __spi__ is None:
+			__spi__ = SPIBusManager()
+
+	return __spi__
+
+def spi_bufsiz(default=4096):
+	"""Get spidev Kernel Buffer Size"""
+
+	bufsiz = default
+
+	try:
+		with open("/sys/module/spidev/parameters/bufsiz") as param:
+			bufsiz = int(param.read().strip())
+	except (OSError, ValueError):
+		pass
+
+	return bufsiz
+
+def snapshot_path(config_file, digest):
+	"""Get Snapshot Cache Path For Config File"""
+
+	folder = os.path.join(os.path.dirname(os.path.abspath(config_file)), snapshot_dir)
+	name = os.path.basename(config_file)
+
+	return os.path.join(folder, f"{name}.{digest[:16]}.pickle")
+
+def compile_config(config_file, use_cache=True):
+	"""Load Robot INI As A ConfigSnapshot, From The Snapshot Cache When Unchanged"""
+
+	if not os.path.exists(config_file):
+		DbgMsg(f"INI, {config_file}, File does not exist")
+		return None
+
+	with open(config_file, "rb") as ini:
+		content = ini.read()
+
+	digest = hashlib.sha256(f"{snapshot_version}:".encode() + content).hexdigest()
+	cache_file = snapshot_path(config_file, digest)
+
+	snapshot = None
+
+	if use_cache and os.path.exists(cache_file):
+		try:
+			with open(cache_file, "rb") as cache:
+				snapshot = pickle.load(cache)
+		except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as err:
+			DbgMsg(f"Could not load config snapshot {cache_file} : {err}")
+			snapshot = None
+
+	if snapshot is None or snapshot.digest != digest:
+		config_obj = configparser.ConfigParser()
+		config_obj.read_string(content.decode(), source=config_file)
+
+		snapshot = ConfigSnapshot(config_file, digest)
+		snapshot.compile(config_obj)
+
+		if use_cache:
+			try:
+				folder = os.path.dirname(cache_file)
+				prefix = f"{os.path.basename(config_file)}."
+
+				os.makedirs(folder, exist_ok=True)
+
+				# Drop snapshots of earlier revisions of this INI
+				for stale in os.listdir(folder):
+					if stale.startswith(prefix) and stale.endswith(".pickle"):
+						os.remove(os.path.join(folder, stale))
+
+				with open(cache_file, "wb") as cache:
+					pickle.dump(snapshot, cache, protocol=pickle.HIGHEST_PROTOCOL)
+			except OSError as err:
+				DbgMsg(f"Could not save config snapshot {cache_file} : {err}")
+
+	snapshot.preload()
+
+	return snapshot
+
+def hardware_key(hardware):
+	"""Normalize Hardware Type Name, SparkfunLumenati3x3 == sparkfun_lumenati3x3"""
+
+	return hardware.lower().replace("_", "")
+
+def device_bus(label, entry, section):
+	"""Get Bus Key A Device Is Initialized On, Devices Sharing A Key Build One After Another"""
+
+	if "bus" in section:
+		return section["bus"]
+
+	if entry.bus == "spi":
+		return f"spi:{section.getint('spi_bus', fallback=0)}"
+	elif entry.bus == "i2c":
+		return f"i2c:{section.getint('i2c_bus', fallback=1)}"
+	elif entry.bus is not None:
+		return entry.bus
+
+	return f"local:{label}"
+
+def build_led(label, description, section):
+	"""Build LED Element"""
+
+	led = LED(None, pin=section.getint("pin", fallback=None), name=label, description=description)
+
+	led.name = label
+	led.description = description
+
+	return led
+
+def build_camera(label, description, section):
+	"""Build Camera Element, Capture Starts With The Robot"""
+
+	camera = Camera(name=label, description=description, config_section=section)
+
+	return camera
+
+def encode_dc_jpeg(blocks):
+	"""Encode Block Levels (rows x cols uint8) As A Baseline Grayscale JPEG of Flat 8x8 Blocks"""
+
+	rows, cols = blocks.shape
+
+	# All ones quantization, so a flat block's DC coefficient is 8 * (level - 128)
+	dc = (blocks.astype(np.int32).ravel() - 128) * 8
+	diffs = np.diff(dc, prepend=0).tolist()
+
+	# Huffman tables: DC category N is the 4 bit code N, the only AC symbol is end of block, code 0
+	header = bytearray(b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00")
+	header += b"\xff\xdb\x00\x43\x00" + (b"\x01" * 64)
+	header += b"\xff\xc0\x00\x0b\x08" + (rows * 8).to_bytes(2, "big") + (cols * 8).to_bytes(2, "big") + b"\x01\x01\x11\x00"
+	header += b"\xff\xc4\x00\x1f\x00" + bytes([ 0, 0, 0, 12 ] + [ 0 ] * 12) + bytes(range(12))
+	header += b"\xff\xc4\x00\x14\x10" + bytes([ 1 ] + [ 0 ] * 15) + b"\x00"
+	header += b"\xff\xda\x00\x08\x01\x01\x00\x00\x3f\x00"
+
+	scan = bytearray()
+	bits = 0
+	count = 0
+
+	for value in diffs:
+		category = abs(value).bit_length()
+
+		if value < 0:
+			value += (1 << category) - 1
+
+		bits = (bits << (category + 5)) | (category << (category + 1)) | (value << 1)
+		count += category + 5
+
+		while count >= 8:
+			count -= 8
+
+			byte = (bits >> count) & 0xff
+
+			scan.append(byte)
+
+			if byte == 0xff:
+				scan.append(0)
+
+		bits &= (1 << count) - 1
+
+	if count > 0:
+		byte = ((bits << (8 - count)) | ((1 << (8 - count)) - 1)) & 0xff
+
+		scan.append(byte)
+
+		if byte == 0xff:
+			scan.append(0)
+
+	return bytes(header + scan + b"\xff\xd9")
+
+# Process Wide Command Tracer, RI_TRACE=1 or [main] trace = true turns it on
+tracer = Tracer(enabled=os.environ.get("RI_TRACE", "0") not in [ "", "0", "false", "no" ])
+
+# A backend picked through RI_BACKEND still needs its set up run
+if simulated():
+	use_backend(backend)
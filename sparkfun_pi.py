@@ -2,17 +2,13 @@
 # Sparkfun Technology Module
 #
 
-import py_helper as ph
-from py_helper import DebugMode, CmdLineMode, DbgMsg, Msg, Taggable
+import struct
+import threading
 
-# SPI/I2C Libs
-import spidev
-import smbus
+import numpy as np
 
-#
-# GPIO Zero Stuff
-#
-import gpiozero as gpz
+import py_helper as ph
+from py_helper import DebugMode, CmdLineMode, DbgMsg, Msg, Taggable
 
 #
 # Robot Industries Module
@@ -23,6 +19,64 @@ from robotindustries_pi import *
 # Constants
 #
 
+# Vendor Plugin Declaration, hardware type : (builder, driver modules[, bus kind])
+hardware_types = {
+	"sparkfun_lumenati3x3" : ("build_lumenati3x3", [], "spi"),
+	"sparkfun_motor_driver" : ("build_motor_driver", [], "gpio"),
+	"sparkfun9dof" : ("build_9dof", [ "smbus" ], "i2c")
+}
+
+# LSM9DS1 Accel/Gyro Registers
+lsm_ctrl_reg1_g = 0x10
+lsm_out_x_l_g = 0x18
+lsm_ctrl_reg6_xl = 0x20
+lsm_ctrl_reg8 = 0x22
+lsm_out_x_l_xl = 0x28
+
+# LSM9DS1 Magnetometer Registers, Bit 7 Of The Register Auto Increments Reads
+lsm_ctrl_reg1_m = 0x20
+lsm_ctrl_reg2_m = 0x21
+lsm_ctrl_reg3_m = 0x22
+lsm_ctrl_reg4_m = 0x23
+lsm_out_x_l_m = 0x28
+lsm_auto_increment_m = 0x80
+
+lsm_ag_registers = {
+	"ctrl_reg1_g" : i2c_register(lsm_ctrl_reg1_g),
+	"ctrl_reg6_xl" : i2c_register(lsm_ctrl_reg6_xl),
+	"ctrl_reg8" : i2c_register(lsm_ctrl_reg8),
+	"out_g" : i2c_register(lsm_out_x_l_g, 6, False, True),
+	"status" : i2c_register(0x27, 1, False, True),
+	"out_xl" : i2c_register(lsm_out_x_l_xl, 6, False, True)
+}
+
+lsm_m_registers = {
+	"ctrl_reg1_m" : i2c_register(lsm_ctrl_reg1_m),
+	"ctrl_reg2_m" : i2c_register(lsm_ctrl_reg2_m),
+	"ctrl_reg3_m" : i2c_register(lsm_ctrl_reg3_m),
+	"ctrl_reg4_m" : i2c_register(lsm_ctrl_reg4_m),
+	"out_m" : i2c_register(lsm_out_x_l_m | lsm_auto_increment_m, 6, False, True)
+}
+
+# Accel/Gyro Output Data Rates, Register Value Is The Index
+lsm_odr = [ 0.0, 14.9, 59.5, 119.0, 238.0, 476.0, 952.0 ]
+
+# Full Scale Per LSB At 2 g, 245 dps And 4 gauss
+lsm_accel_lsb = 0.000061
+lsm_gyro_lsb = 0.00875
+lsm_mag_lsb = 0.00014
+
+# TB6612FNG PWM Backends, the PWM peripheral or pigpio's DMA timed PWM
+tb_pwm_hardware = "hardware"
+tb_pwm_dma = "dma"
+
+# GPIO With The Hardware PWM Peripheral, Pin : PWM Channel
+tb_hardware_pwm_pins = { 12 : 0, 13 : 1, 18 : 0, 19 : 1 }
+
+# pigpio Duty Cycle Ranges, hardware_PWM is in millionths
+tb_hardware_range = 1000000
+tb_dma_range = 1000
+
 #
 # Variables
 #
@@ -35,16 +89,21 @@ class SparkfunLumenati(DeviceInfo, SPIDevice):
 	"""Sparkfun Lumenati Base Class"""
 
 	pixels = None
+	pixel_count = 0
 
 	_max_brightness = 31
 	_min_brightness = 0
 	_max_color = 255
 	_min_color = 0
 
+	# APA102C frame, [ start frame | pixel * (0xe0|brightness, b, g, r) | end frame ]
+	_frame = None
+	_pixel_offset = 4
+	_dirty = True
+	_is_open = False
+
 	white = None
 	black = None
-	off = None
-	on = None
 	red = None
 	green = None
 	blue = None
@@ -60,12 +119,12 @@ class SparkfunLumenati(DeviceInfo, SPIDevice):
 		if device is None:
 			device = 0
 
-		super(SPIDevice,self).__init__(bus, device, bus_speed, config_section=config_section)
+		self._allocate_frame(pixels)
 
-		self.pixels = [[0,0,0,0]] * pixels
+		SPIDevice.__init__(self, bus, device, bus_speed)
 
-		self.white = self.on = ( 255, 255, 255)
-		self.black = self.off = ( 0, 0, 0 )
+		self.white = ( 255, 255, 255)
+		self.black = ( 0, 0, 0 )
 		self.red = ( 255, 0, 0 )
 		self.green = ( 0, 255, 0 )
 		self.blue = ( 0, 0, 255 )
@@ -75,11 +134,34 @@ class SparkfunLumenati(DeviceInfo, SPIDevice):
 		if config_section is not None:
 			self.config(config_section)
 
-	def config(self, section_config):
+	def config(self, config_section):
 		"""Configure Instance"""
 
+		SPIDevice.config(self, config_section)
+
 		if "pixels" in config_section:
-			self.pixels = [[0,0,0,0]] * config_section.getint("pixels", fallback=1)
+			self._allocate_frame(config_section.getint("pixels", fallback=1))
+
+	def _allocate_frame(self, pixels):
+		"""Preallocate APA102C Frame For Given Number of Pixels"""
+
+		prefix = self._start_frame()
+		postfix = self._end_frame(pixels)
+
+		self.pixel_count = pixels
+		self._pixel_offset = len(prefix)
+
+		frame = bytearray(len(prefix) + (pixels * 4) + len(postfix))
+
+		frame[0:len(prefix)] = prefix
+		frame[len(frame) - len(postfix):] = postfix
+
+		for pixel in range(pixels):
+			frame[self._pixel_offset + (pixel * 4)] = 0xe0
+
+		self._frame = frame
+		self.pixels = memoryview(frame)[self._pixel_offset:self._pixel_offset + (pixels * 4)]
+		self._dirty = True
 
 	def _start_frame(self):
 		"""Start Frame of APA102C Pixels"""
@@ -88,10 +170,11 @@ class SparkfunLumenati(DeviceInfo, SPIDevice):
 
 		return data
 
-	def _end_frame():
+	def _end_frame(self, pixels=0):
 		"""End Frame of APA102C Pixels"""
 
-		data = [ 0xff, 0xff, 0xff, 0xff ]
+		# Need at least one clock edge per 2 pixels to push data through the chain
+		data = [ 0xff ] * max(4, (pixels + 15) // 16)
 
 		return data
 
@@ -105,54 +188,65 @@ class SparkfunLumenati(DeviceInfo, SPIDevice):
 	def _color_check(self, color):
 		"""Enforce Color Value Min/Max"""
 
-		color = 128 if color > self._max_color or color < self.min_color else color
+		color = 128 if color > self._max_color or color < self._min_color else color
 
 		return color
 
-	def write_pixels(self):
-		"""Write Pixels to Device"""
+	def _set_byte(self, index, value):
+		"""Update Frame Byte In Place, Flag Frame As Dirty On Change"""
 
-		prefix = self._start_frame()
-		postfix = self._end_frame()
+		if self.pixels[index] != value:
+			self.pixels[index] = value
+			self._dirty = True
 
-		self.open()
+	@property
+	def dirty(self):
+		"""Has Frame Changed Since Last Write"""
 
-		packet = list()
+		return self._dirty
 
-		packet.extend(prefix)
+	def write_pixels(self, force=False):
+		"""Write Pixels to Device"""
+
+		if not (self._dirty or force):
+			return False
+
+		if not self._is_open:
+			self.open()
+			self._is_open = True
 
-		for r,g,b,brightness in self.pixels:
-			pixel_data = [ brightness | 0xe0, b, g, r ]
+		self.write_queued(self._frame)
 
-			packet.extend(pixel_data)
+		self._dirty = False
 
-		packet.extend(postfix)
+		return True
 
-		self.xfer(packet)
+	def close(self):
+		"""Close SPI Bus"""
 
-		self.close()
+		if self._is_open:
+			SPIDevice.close(self)
+			self._is_open = False
 
 	def brightness(self, pixel, brightness):
 		"""Set Brightness of LED"""
 
-		self.pixels[pixel][3] = self._brightness_check(brightness)
+		self._set_byte(pixel * 4, self._brightness_check(brightness) | 0xe0)
 
 	def color(self, pixel, r=None, g=None, b=None, color=None):
 		"""Set Color of Pixel"""
 
-		if r is not None:
-			self.pixels[pixel][0] = self._color_check(r)
-		if g is not None:
-			self.pixels[pixel][1] = self._color_check(g)
-		if b is not None:
-			self.pixels[pixel][2] = self._color_check(b)
-
 		if color is not None:
 			r, g, b = color
 
-			self.pixels[pixel][0] = self._color_check(r)
-			self.pixels[pixel][1] = self._color_check(g)
-			self.pixels[pixel][2] = self._color_check(b)
+		offset = pixel * 4
+
+		if b is not None:
+			self._set_byte(offset + 1, self._color_check(b))
+		if g is not None:
+			self._set_byte(offset + 2, self._color_check(g))
+		if r is not None:
+			self._set_byte(offset + 3, self._color_check(r))
 
 	def set_pixel(self, pixel, r, g, b, brightness):
 		"""Set Pixel"""
@@ -163,7 +257,7 @@ class SparkfunLumenati(DeviceInfo, SPIDevice):
 	def set_all(self, r, g, b, brightness):
 		"""Set all Pixels to Given Color and Brightness"""
 
-		for pixel in range(len(self.pixels)):
+		for pixel in range(self.pixel_count):
 			self.set_pixel(pixel, r, g, b, brightness)
 
 class SparkfunLumenati3x3(SparkfunLumenati):
@@ -174,28 +268,28 @@ class SparkfunLumenati3x3(SparkfunLumenati):
 	def __init__(self, name, description, bus=0, device=0, bus_speed=500000, config_section=None):
 		"""Init Sparkfun Lumenati 3x3 LED Module Instance"""
 
-		super(ProductInfo,self).__init__(
-			"COM-14360",
-			"Sparkfun Lumenati 3x3 LED Panel",
-			"https://www.sparkfun.com/products/retired/14360?_gl=1*hzi0go*_ga*MjEzMjQ1MDQzMy4xNjk4MTg3Mjkw*_ga_T369JS7J9N*MTcwMDEwMTU1OS41LjEuMTcwMDEwMzAyMC42MC4wLjA.",
-			"https://learn.sparkfun.com/tutorials/lumenati-hookup-guide/all")
+		ProductInfo.__init__(self,
+			product_name="Sparkfun Lumenati 3x3 LED Panel",
+			partnumber="COM-14360",
+			url="https://www.sparkfun.com/products/retired/14360?_gl=1*hzi0go*_ga*MjEzMjQ1MDQzMy4xNjk4MTg3Mjkw*_ga_T369JS7J9N*MTcwMDEwMTU1OS41LjEuMTcwMDEwMzAyMC42MC4wLjA.",
+			documentation="https://learn.sparkfun.com/tutorials/lumenati-hookup-guide/all",
+			manufacturer="Sparkfun")
 
-		super(SparkfunLumenati,self).__init__(
+		self.name = name
+		self.description = description
+
+		SparkfunLumenati.__init__(self,
 			pixels=9,
 			bus=bus,
 			device=device,
 			bus_speed=bus_speed,
 			config_section=config_section)
 
-		self.name = name
-		self.description = description
-
-		if config_section is not None:
-			self.config(config_section)
-
 	def config(self,config_section):
 		"""Config Device from INI Section"""
 
+		super().config(config_section)
+
 		if "name" in config_section:
 			self.name = config_section["name"]
 
@@ -218,8 +312,8 @@ class SparkfunLumenati3x3(SparkfunLumenati):
 		"""Set Row Color"""
 
 		for pixel in range(3):
-			self.set_pixel((row * 3) + pixel, color=color)
-			self.set_brightness((row * 3) + pixel, brightness)
+			self.color((row * 3) + pixel, color=color)
+			self.brightness((row * 3) + pixel, brightness)
 
 	def on(self):
 		"""Turn Panel On"""
@@ -245,6 +339,16 @@ class SparkfunLumenati3x3(SparkfunLumenati):
 
 		return self.state
 
+	def telemetry(self):
+		"""Panel State, Pixels As [ r, g, b, brightness ]"""
+
+		pixels = self.pixels
+
+		return {
+			"on" : self.state,
+			"pixels" : [ [ pixels[index + 3], pixels[index + 2], pixels[index + 1], pixels[index] & 0x1f ] for index in range(0, len(pixels), 4) ]
+		}
+
 	def test_module(self):
 		"""Test Function"""
 
@@ -256,21 +360,198 @@ class SparkfunLumenati3x3(SparkfunLumenati):
 		self.set_row(1, self.white)
 		self.set_row(2, self.blue)
 
+		self.write_pixels()
+
+class Sparkfun9dof(Sensor):
+	"""Sparkfun 9DoF IMU Breakout, LSM9DS1 Accel/Gyro And Magnetometer On I2C"""
+
+	# Samples are accel in g, gyro in rad/s and magnetometer in gauss, the
+	# gyro and accel output registers are read together in one block read
+
+	channels = [ "ax", "ay", "az", "gx", "gy", "gz", "mx", "my", "mz" ]
+
+	i2c_bus = 1
+	ag_address = 0x6B
+	m_address = 0x1E
+	mag_rate = 80.0
+
+	# Fused every block samples on the sensor thread, one orientation row per sample
+	block = 16
+	ahrs = None
+	orientation_ring = None
+
+	_ag = None
+	_mag = None
+	_mag_every = 1
+	_reads = 0
+	_fused = 0
+
+	def __init__(self, name=None, description=None, rate=None, capacity=None, config_section=None):
+		"""Init 9DoF"""
+
+		self.ahrs = ComplementaryAHRS()
+		self._fused = 0
+		self._fusion_lock = threading.Lock()
+
+		super().__init__(name, description, rate, capacity, config_section)
+
+		self.orientation_ring = SampleRing(3, self.capacity)
+
+	def open(self):
+		"""Configure Both Dies For The Sampling Rate"""
+
+		if simulated():
+			import ri_sim
+
+			if not self.ag_address in ri_sim.i2c_bus(self.i2c_bus).targets:
+				ri_sim.install_lsm9ds1(self.i2c_bus, self.ag_address, self.m_address)
+
+		self._ag = I2CDevice(self.ag_address, self.i2c_bus, registers=lsm_ag_registers, name=f"{self.name}:ag")
+		self._mag = I2CDevice(self.m_address, self.i2c_bus, registers=lsm_m_registers, name=f"{self.name}:m")
+
+		odr = next((index for index, rate in enumerate(lsm_odr) if rate >= self.rate), len(lsm_odr) - 1)
+
+		# Block data update and register auto increment
+		self._ag.write_register("ctrl_reg8", 0x44)
+		self._ag.write_register("ctrl_reg1_g", odr << 5)
+		self._ag.write_register("ctrl_reg6_xl", odr << 5)
+
+		# Temperature compensated, ultra high performance XY and Z, 80 Hz, 4 gauss, continuous
+		self._mag.write_register("ctrl_reg1_m", 0xFC)
+		self._mag.write_register("ctrl_reg2_m", 0x00)
+		self._mag.write_register("ctrl_reg3_m", 0x00)
+		self._mag.write_register("ctrl_reg4_m", 0x0C)
+
+		self._mag_every = max(1, int(np.ceil(self.rate / self.mag_rate)))
+		self._reads = 0
+		self._fused = self.ring.count
+
+		self.ahrs.reset()
+
+	def read_sample(self, row):
+		"""Gyro Through Accel Output Registers In One Read, Magnetometer At Its Own Slower Rate"""
+
+		block = self._ag.read(lsm_out_x_l_g, (lsm_out_x_l_xl - lsm_out_x_l_g) + 6)
+
+		row[0:3] = struct.unpack_from("<3h", block, lsm_out_x_l_xl - lsm_out_x_l_g)
+		row[0:3] *= lsm_accel_lsb
+		row[3:6] = struct.unpack_from("<3h", block, 0)
+		row[3:6] *= np.radians(lsm_gyro_lsb)
+
+		# Between magnetometer reads the row keeps its last field values
+		if self._reads % self._mag_every == 0:
+			mag = self._mag.read(lsm_out_x_l_m | lsm_auto_increment_m, 6)
+
+			row[6:9] = struct.unpack_from("<3h", mag, 0)
+			row[6:9] *= lsm_mag_lsb
+
+		self._reads += 1
+
+	def close(self):
+		"""Release Bus"""
+
+		for device in [ self._ag, self._mag ]:
+			if device is not None:
+				device.close()
+
+		self._ag = self._mag = None
+
+	def process(self):
+		"""Fuse On The Sensor Thread"""
+
+		self.fuse()
+
+	def fuse(self):
+		"""Run AHRS Over Every Sample Not Yet Fused"""
+
+		with self._fusion_lock:
+			times, rows, count = self.ring.since(self._fused)
+
+			if len(times) > 0:
+				angles = self.ahrs.update(times, rows[:, 0:3], rows[:, 3:6], rows[:, 6:9])
+
+				self.orientation_ring.extend(times, angles)
+
+			self._fused = count
+
+	def orientation(self, length=None):
+		"""Roll, Pitch, Heading In Radians As (times, rows), Up To The Newest Sample"""
+
+		self.fuse()
+
+		return self.orientation_ring.latest(length)
+
+	def telemetry(self):
+		"""Newest Sample And Orientation In Degrees"""
+
+		state = super().telemetry()
+
+		times, angles = self.orientation_ring.latest(1)
+
+		if len(angles) > 0:
+			state["orientation"] = dict(zip([ "roll", "pitch", "heading" ], np.degrees(angles[0]).tolist()))
+
+		return state
+
+	def config(self, config_section):
+		"""Config 9DoF From INI Section"""
+
+		super().config(config_section)
+
+		self.i2c_bus = config_section.getint("i2c_bus", fallback=self.i2c_bus)
+		self.ag_address = int(str(config_section.get("ag_address", fallback=self.ag_address)), 0)
+		self.m_address = int(str(config_section.get("m_address", fallback=self.m_address)), 0)
+		self.mag_rate = config_section.getfloat("mag_rate", fallback=self.mag_rate)
+		self.block = config_section.getint("fusion_block", fallback=self.block)
+		self.ahrs.tau = config_section.getfloat("fusion_tau", fallback=self.ahrs.tau)
+
+class TB6612Channel():
+	"""One H Bridge Of A TB6612FNG, Motor Objects Drive It Through throttle"""
+
+	driver = None
+	name = None
+
+	def __init__(self, driver, name):
+		"""Init Channel"""
+
+		self.driver = driver
+		self.name = name
+		self._throttle = 0.0
+
+	@property
+	def throttle(self):
+		"""Current Throttle, -1.0 To 1.0"""
+
+		return self._throttle
+
+	@throttle.setter
+	def throttle(self, value):
+		"""Set Throttle"""
+
+		self.driver.write_channels({ self : value })
+
 class SparkfunMotorDriver(MotorController):
 	"""Sparkfun Dual TB6612FNG Motor Driver"""
 
+	# Duty cycles come from the PWM peripheral (GPIO 12/13/18/19, PWMA and
+	# PWMB on different PWM channels) or from pigpio's DMA timed PWM on any
+	# pin, neither depends on Python running on time. Direction pins and
+	# STBY are one GPIO bank group, a direction change is a single group
+	# write that clears before it sets so a bridge passes through coast
+	# (IN1=IN2=L) and never through the opposite direction
+
 	# Motor Config Values
 	offsetA = 1
 	offsetB = 1
 
-	# Pins
-	AIN1 = 2
-	AIN2 = 4
-	BIN1 = 7
-	BIN2 = 8
-	PWMA = 5
-	PWMB = 6
-	STBY = 9
+	# Pins, BCM Numbering
+	AIN1 = 5
+	AIN2 = 6
+	BIN1 = 16
+	BIN2 = 20
+	PWMA = 12
+	PWMB = 13
+	STBY = 26
 
 	# 3 x GND
 	# VM Pin
@@ -287,76 +568,205 @@ class SparkfunMotorDriver(MotorController):
 		"STBY": STBY
 	}
 
-	def __init__(self, name, description, config_section=None):
+	pwm = tb_pwm_hardware
+	frequency = 20000
+	brake = True
+
+	channels = None
+	direction = None
+
+	_pi = None
+
+	def __init__(self, name, description, config_section=None, bank=None):
 		"""Initialize Instance of Motor Driver"""
 
-		super(ProductInfo,self).__init__(
-			"ROB-14451",
-			"SparkFun Motor Driver - Dual TB6612FNG",
-			"https://www.sparkfun.com/products/14451",
-			"https://learn.sparkfun.com/tutorials/tb6612fng-hookup-guide?_gl=1*1a9ry0v*_ga*MjEzMjQ1MDQzMy4xNjk4MTg3Mjkw*_ga_T369JS7J9N*MTcwMDA5MzA0NC40LjAuMTcwMDA5MzA0NC42MC4wLjA."
-			)
+		ProductInfo.__init__(self,
+			product_name="SparkFun Motor Driver - Dual TB6612FNG",
+			partnumber="ROB-14451",
+			url="https://www.sparkfun.com/products/14451",
+			documentation="https://learn.sparkfun.com/tutorials/tb6612fng-hookup-guide?_gl=1*1a9ry0v*_ga*MjEzMjQ1MDQzMy4xNjk4MTg3Mjkw*_ga_T369JS7J9N*MTcwMDA5MzA0NC40LjAuMTcwMDA5MzA0NC42MC4wLjA.",
+			manufacturer="Sparkfun")
 
-		self.name = name
-		seld.description = description
+		MotorController.__init__(self, name, description)
+
+		self.pins = dict(self.pins)
+		self.bank = bank
+		self.direction = None
+
+		self.channels = { "A" : TB6612Channel(self, "A"), "B" : TB6612Channel(self, "B") }
+
+		self._duty = { "A" : None, "B" : None }
+		self._lock = threading.Lock()
+
+		m1 = Motor(name="m1", motor=self.channels["A"], motor_type="dc", polarity=self.offsetA)
+		m2 = Motor(name="m2", motor=self.channels["B"], motor_type="dc", polarity=self.offsetB)
+
+		self.motors.extend([ m1, m2 ])
 
 		if config_section is not None:
 			self.config(config_section)
 
-	def config(self, section):
-		"""Configure Motor Controller"""
+		self.open()
 
-		pass
+	def _pwm_pins(self):
+		"""Channel Name : PWM Pin"""
 
-#
-# Functions
-#
+		return { "A" : self.pins["PWMA"], "B" : self.pins["PWMB"] }
 
-def sparkfun_build_out(robot):
-	"""Run through elements, pick out Sparkfun Hardware and build them out"""
+	def open(self):
+		"""Claim Pins, Start PWM At Zero Duty And Take The Driver Out Of Standby"""
+
+		pwm_pins = self._pwm_pins()
+
+		if self.pwm == tb_pwm_hardware:
+			pwm_channels = [ tb_hardware_pwm_pins.get(pin) for pin in pwm_pins.values() ]
+
+			if None in pwm_channels or pwm_channels[0] == pwm_channels[1]:
+				DbgMsg(f"{self.name} PWMA/PWMB {list(pwm_pins.values())} are not on separate hardware PWM channels, using DMA PWM")
+				self.pwm = tb_pwm_dma
+
+		self._pi = pigpio_device()
 
-	built_elements = list()
+		for pin in pwm_pins.values():
+			self._pi.set_mode(pin, gpio_output)
 
-	my_devices = list(["sparkfun_lumenati3x3", "sparkfun_motor_driver"])
+			if self.pwm == tb_pwm_dma:
+				self.frequency = self._pi.set_PWM_frequency(pin, self.frequency)
+				self._pi.set_PWM_range(pin, tb_dma_range)
 
-	elements = [
-		robot.elements.motor_controls,
-		robot.elements.cameras,
-		robot.elements.sensors,
-		robot.elements.features ]
+		self.direction = DigitalGPIOGroup({ name : self.pins[name] for name in [ "AIN1", "AIN2", "BIN1", "BIN2", "STBY" ] }, bank=self.bank)
 
-	for element in elements:
-		for device in element:
-			section_label = element[device]
+		self._duty = { "A" : None, "B" : None }
 
-			section = robot.get_element_section(section_label)
+		self.write_channels({ channel : 0.0 for channel in self.channels.values() })
 
-			if section is not None:
-				if "hardware" in section:
-					description = section.get("description", fallback="No description")
-					device_type = section["hardware"]
+		self.direction.write(STBY=1)
 
-					if device_type in my_devices:
-						if device_type == my_devices[0]:
-							panel = SparkfunLumenati3x3(section_label, description, config_section=section)
+	def _levels(self, name, throttle):
+		"""Direction Pin Levels For A Channel"""
 
-							built_elements.append(panel)
+		if throttle > 0:
+			in1, in2 = 1, 0
+		elif throttle < 0:
+			in1, in2 = 0, 1
+		elif self.brake:
+			in1, in2 = 1, 1
+		else:
+			in1, in2 = 0, 0
 
-							robot.add(panel)
-						elif device_type == mydevices[1]:
-							mc = SparkfunMotorDriver(section_label, description, config_section=section)
+		return { f"{name}IN1" : in1, f"{name}IN2" : in2 }
 
-							built_elements.append(mc)
+	def _set_duty(self, name, duty):
+		"""Set One Channel's Duty Cycle, 0.0 To 1.0, Unchanged Duties Are Skipped"""
 
-							robot.add(mc)
-					else:
-						pass
-				else:
-					DbgMsg("'hardware' not in section")
+		if self._duty[name] == duty:
+			return
+
+		pin = self._pwm_pins()[name]
+
+		if self.pwm == tb_pwm_hardware:
+			self._pi.hardware_PWM(pin, self.frequency, int(round(duty * tb_hardware_range)))
+		else:
+			self._pi.set_PWM_dutycycle(pin, int(round(duty * tb_dma_range)))
+
+		self._duty[name] = duty
+
+	def write_channels(self, throttles):
+		"""Set { channel : throttle }, Direction Pins First In One Group Write, Then Duty Cycles"""
+
+		levels = dict()
+
+		for channel, throttle in throttles.items():
+			throttle = max(-1.0, min(1.0, throttle))
+
+			channel._throttle = throttle
+			levels.update(self._levels(channel.name, throttle))
+
+		with self._lock:
+			self.direction.write(levels)
+
+			for channel in throttles:
+				self._set_duty(channel.name, abs(channel._throttle))
+
+	def apply(self, updates):
+		"""Apply (motor, speed) Updates For Both Bridges Together"""
+
+		throttles = dict()
+		others = list()
+
+		for motor, speed in updates:
+			if isinstance(motor.motor_obj, TB6612Channel) and motor.motor_obj.driver is self:
+				motor.speed = motor.output(speed)
+				throttles[motor.motor_obj] = motor.speed
 			else:
-				DbgMsg(f"Attempt to get element section, {section_label}, from robot INI failed")
+				others.append((motor, speed))
+
+		if len(throttles) > 0:
+			with tracer.span(tr_motor, self.name):
+				self.write_channels(throttles)
+
+		super().apply(others)
+
+	def standby(self):
+		"""Zero Both Bridges And Put The Driver In Standby"""
+
+		self.write_channels({ channel : 0.0 for channel in self.channels.values() })
+		self.direction.write(STBY=0)
+
+	def close(self):
+		"""Standby And Release pigpio"""
+
+		if self._pi is not None:
+			self.standby()
+
+			self._pi.stop()
+			self._pi = None
+
+	def telemetry(self):
+		"""Motor Speeds, Motion State And PWM Backend"""
+
+		telemetry = super().telemetry()
+
+		telemetry["pwm"] = self.pwm
+		telemetry["frequency"] = self.frequency
+
+		return telemetry
+
+	def config(self, section):
+		"""Configure Motor Controller"""
+
+		for name in self.pins:
+			self.pins[name] = section.getint(name.lower(), fallback=self.pins[name])
+
+		self.pwm = section.get("pwm", fallback=self.pwm)
+		self.frequency = section.getint("pwm_frequency", fallback=self.frequency)
+		self.brake = section.getboolean("brake", fallback=self.brake)
+
+		super().config(section)
+
+#
+# Functions
+#
+
+def build_lumenati3x3(label, description, section):
+	"""Build Lumenati 3x3 LED Panel"""
+
+	return SparkfunLumenati3x3(label, description, config_section=section)
+
+def build_motor_driver(label, description, section):
+	"""Build TB6612FNG Motor Driver"""
+
+	return SparkfunMotorDriver(label, description, config_section=section)
+
+def build_9dof(label, description, section):
+	"""Build LSM9DS1 9DoF IMU"""
+
+	return Sparkfun9dof(label, description, config_section=section)
+
+def sparkfun_build_out(robot):
+	"""Build Out Only Sparkfun Hardware, See Robot.build_out"""
 
-	return built_elements
+	return robot.build_out(vendors=[ __name__ ])
 
 def sparkfun_module_tests():
 	"""Test Function"""
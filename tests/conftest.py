@@ -0,0 +1,57 @@
+#
+# Test Setup, Every Test Runs On The Simulated Backend
+#
+
+import os
+import sys
+import threading
+import time
+
+os.environ["RI_BACKEND"] = "sim"
+os.environ["RI_SIM_TIMING"] = "none"
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if root not in sys.path:
+	sys.path.insert(0, root)
+
+import pytest
+
+from py_helper import DebugMode
+
+from robotindustries_pi import Robot, compile_config
+
+DebugMode(False)
+
+@pytest.fixture
+def arwen():
+	"""Compiled arwen.ini"""
+
+	return compile_config(os.path.join(root, "arwen.ini"), use_cache=False)
+
+@pytest.fixture
+def robot(arwen):
+	"""Robot Built From arwen.ini, Watchdogs Off So Sleeps Between Steps Can't Trip Them"""
+
+	robot = Robot(config_info=arwen)
+	robot.build_out(parallel=False)
+
+	for mc in robot.motor_controls.values():
+		mc.set_watchdog(None)
+
+	return robot
+
+@pytest.fixture
+def running(robot):
+	"""Robot With Its Control Loop Running On A Thread"""
+
+	thread = threading.Thread(target=robot.scheduler.run)
+	thread.start()
+
+	while not robot.scheduler.running:
+		time.sleep(0.001)
+
+	yield robot
+
+	robot.stop()
+	thread.join()
@@ -0,0 +1,27 @@
+#
+# Latest Wins Command Queue And The JSON Command API
+#
+
+from robotindustries_pi import CommandQueue
+
+def test_replaced_command_moves_to_back():
+	queue = CommandQueue()
+	ran = list()
+
+	queue.submit("a", "a1", ran.append, "a1")
+	queue.submit("b", "b1", ran.append, "b1")
+
+	assert queue.submit("a", "a2", ran.append, "a2")
+	assert queue.drain() == 2
+	assert ran == [ "b1", "a2" ]
+	assert queue.coalesced == 1
+
+def test_servo_rejected(robot, monkeypatch):
+	import ri_flask
+
+	monkeypatch.setattr(ri_flask, "robot", robot)
+
+	result = ri_flask.queue_commands([ { "cmd" : "servo", "direction" : "left" }, { "cmd" : "halt" } ])
+
+	assert result["accepted"] == 1
+	assert result["errors"] == [ { "index" : 0, "error" : "Unknown command" } ]
@@ -0,0 +1,124 @@
+#
+# Motion Profiles And Timed Maneuvers
+#
+
+import time
+
+import numpy as np
+
+from robotindustries_pi import MotionProfile, mp_scurve, mp_trapezoid
+
+def wait_for(check, timeout=2.0):
+	"""Poll check Until True Or timeout Seconds Pass"""
+
+	expires = time.monotonic() + timeout
+
+	while not check():
+		if time.monotonic() > expires:
+			return False
+
+		time.sleep(0.005)
+
+	return True
+
+def test_trapezoid_ramp():
+	profile = MotionProfile(2, mp_trapezoid, accel=5.0)
+
+	# 5.0 full scale per second at 50Hz is 0.1 per tick
+	assert profile.plan([ 1.0, -0.5 ], 50.0) == 10
+
+	rows = list()
+
+	while profile.active:
+		rows.append(profile.next().copy())
+
+	assert len(rows) == 10
+	assert np.allclose(rows[0], [ 0.1, -0.05 ])
+	assert rows[-1].tolist() == [ 1.0, -0.5 ]
+	assert profile.next() is None
+
+def test_scurve_stays_within_accel():
+	profile = MotionProfile(1, mp_scurve, accel=5.0)
+
+	steps = profile.plan([ 1.0 ], 50.0)
+	rows = [ profile.next()[0] for step in range(steps) ]
+
+	assert steps == 15
+	assert max(np.diff([ 0.0 ] + rows)) <= 0.1 + 1e-9
+	assert rows[-1] == 1.0
+
+def test_plan_blends_from_current():
+	profile = MotionProfile(1, mp_trapezoid, accel=5.0)
+
+	profile.plan([ 1.0 ], 50.0)
+
+	for step in range(4):
+		profile.next()
+
+	assert profile.plan([ 0.0 ], 50.0) == 4
+	assert profile.target.tolist() == [ 0.0 ]
+
+def test_hold_drops_ramp():
+	profile = MotionProfile(2, mp_trapezoid, accel=5.0)
+
+	profile.plan([ 1.0, 1.0 ], 50.0)
+	profile.next()
+	profile.hold(1, 0.5)
+
+	assert not profile.active
+	assert profile.current.tolist() == [ 0.1, 0.5 ]
+	assert profile.target.tolist() == [ 0.1, 0.5 ]
+
+def test_maneuver_without_loop(robot):
+	mc = robot.motor_controls["primary_drive"]
+
+	maneuver = mc.left_turn(1.0, duration=0.05, stop=True)
+
+	assert mc.timeline.busy
+	assert maneuver.wait(2.0)
+	assert not mc.timeline.busy
+	assert all(motor.speed == 0 for motor in mc.motors)
+
+def test_command_cancels_maneuver(running):
+	mc = running.motor_controls["primary_drive"]
+
+	maneuver = mc.right_turn(1.0, duration=0.5, stop=True)
+	mc.forward(0.5)
+
+	assert maneuver.done()
+	assert maneuver.cancelled
+	assert wait_for(lambda : not mc.profile.active)
+
+	time.sleep(0.6)
+
+	assert mc.profile.current.tolist() == [ 0.5 ] * len(mc.motors)
+
+def test_turn_finish_lands(running):
+	mc = running.motor_controls["primary_drive"]
+
+	maneuver = mc.left_turn(1.0, duration=0.1)
+
+	assert maneuver.wait(2.0)
+	assert wait_for(lambda : not mc.profile.active)
+	assert mc.profile.current.tolist() == [ 1.0 ] * len(mc.motors)
+	assert mc.profile.target.tolist() == mc.profile.current.tolist()
+	assert [ motor.speed for motor in mc.motors ] == [ motor.output(1.0) for motor in mc.motors ]
+
+def test_turn_stop_halts(running):
+	mc = running.motor_controls["primary_drive"]
+
+	maneuver = mc.right_turn(1.0, duration=0.1, stop=True)
+
+	assert maneuver.wait(2.0)
+	assert wait_for(lambda : not mc.profile.active)
+	assert mc.profile.current.tolist() == [ 0.0 ] * len(mc.motors)
+	assert all(motor.speed == 0 for motor in mc.motors)
+
+def test_motor_speed_syncs_profile(running):
+	mc = running.motor_controls["primary_drive"]
+
+	mc.motor_speed(0, 0.5)
+
+	assert wait_for(lambda : not mc.profile.active)
+	assert mc.profile.current[0] == 0.5
+	assert mc.profile.target[0] == 0.5
@@ -0,0 +1,71 @@
+#
+# Robot Build Out And Start On arwen.ini
+#
+
+import threading
+
+from robotindustries_pi import Robot
+
+def test_build_out(arwen):
+	robot = Robot(config_info=arwen)
+	built = robot.build_out(parallel=False)
+
+	assert built
+	assert "primary_drive" in robot.motor_controls
+	assert "sparkfun9dof" in robot.sensors
+	assert "camera" in robot.cameras
+
+	for mc in robot.motor_controls.values():
+		mc.set_watchdog(None)
+
+def test_run_starts_devices(arwen):
+	started = threading.Event()
+
+	def runloop(robot, args, kwargs):
+		robot.scheduler.call_later(0.2, started.set)
+		robot.scheduler.call_later(0.25, robot.stop)
+
+	robot = Robot(config_info=arwen, run=runloop)
+	robot.build_out(parallel=False)
+
+	thread = threading.Thread(target=robot.run)
+	thread.start()
+	thread.join(5.0)
+
+	assert not thread.is_alive()
+	assert started.is_set()
+	assert not robot.scheduler.running
+
+	imu = robot.snapshot()["sensors"]["sparkfun9dof"]
+
+	assert imu["samples"] > 0
+	assert "heading" in imu["orientation"]
+
+	for mc in robot.motor_controls.values():
+		assert all(motor.speed == 0 for motor in mc.motors)
+
+def test_run_halts_every_controller(robot):
+	def runloop(robot, args, kwargs):
+		for mc in robot.motor_controls.values():
+			mc.set_watchdog(None)
+			mc.forward(1.0)
+
+		robot.scheduler.call_later(0.1, robot.stop)
+
+	robot.runloop = runloop
+	robot.run()
+
+	for mc in robot.motor_controls.values():
+		assert all(motor.speed == 0 for motor in mc.motors)
+
+def test_hold_tick_only_while_held(robot, monkeypatch):
+	import mastercontrol
+
+	monkeypatch.setattr(mastercontrol, "robot", robot)
+	mc = robot.motor_controls["primary_drive"]
+
+	mastercontrol.hold(mc)
+	assert mastercontrol.hold_tick in robot.scheduler._tick_handlers
+
+	mastercontrol.hold(None)
+	assert mastercontrol.hold_tick not in robot.scheduler._tick_handlers
@@ -0,0 +1,75 @@
+#
+# Scheduler Control Loop
+#
+
+import threading
+
+from robotindustries_pi import Scheduler
+
+def fail(*args):
+	raise RuntimeError("boom")
+
+def test_failing_callbacks_keep_running():
+	scheduler = Scheduler(200.0)
+	ran = list()
+
+	scheduler.post(fail)
+	scheduler.call_later(0.0, fail)
+	scheduler.on_tick(fail)
+	scheduler.on_stop(fail)
+	scheduler.on_stop(lambda : ran.append("stop"))
+
+	scheduler.call_later(0.05, lambda : ran.append("timer"))
+	scheduler.call_later(0.1, scheduler.stop)
+
+	thread = threading.Thread(target=scheduler.run)
+	thread.start()
+	thread.join(2.0)
+
+	assert not thread.is_alive()
+	assert ran == [ "timer", "stop" ]
+	assert scheduler.stats()["errors"] >= 4
+
+def test_timers_and_posts_run_in_order():
+	scheduler = Scheduler(100.0)
+	ran = list()
+
+	scheduler.call_later(0.02, ran.append, "later")
+	scheduler.post(ran.append, "posted")
+	scheduler.call_later(0.05, scheduler.stop)
+
+	scheduler.run()
+
+	assert ran == [ "posted", "later" ]
+	assert not scheduler.running
+
+def test_call_every_and_cancel():
+	scheduler = Scheduler(100.0)
+	ran = list()
+
+	timer = scheduler.call_every(0.01, ran.append, "every")
+	scheduler.call_later(0.055, scheduler.cancel, timer)
+	scheduler.call_later(0.1, scheduler.stop)
+
+	scheduler.run()
+
+	assert 3 <= len(ran) <= 6
+
+def test_ticks_only_while_registered():
+	scheduler = Scheduler(200.0)
+	ticks = list()
+
+	def tick(now):
+		ticks.append(now)
+
+		if len(ticks) == 5:
+			scheduler.remove_tick(tick)
+
+	scheduler.on_tick(tick)
+	scheduler.call_later(0.1, scheduler.stop)
+
+	scheduler.run()
+
+	assert len(ticks) == 5
+	assert scheduler.stats()["ticks"] == 5
+	assert all(later > earlier for earlier, later in zip(ticks, ticks[1:]))
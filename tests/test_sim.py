@@ -0,0 +1,13 @@
+#
+# Simulated Backend
+#
+
+import ri_sim
+
+def test_recorder_keeps_last_transfers():
+	recorder = ri_sim.SimRecorder(timing=ri_sim.tm_none, limit=3)
+
+	for index in range(5):
+		recorder.record("spi", 0, 0, "xfer3", bytes([ index ]), 0.0)
+
+	assert [ entry.data for entry in recorder.transfers() ] == [ b"\x02", b"\x03", b"\x04" ]
@@ -0,0 +1,27 @@
+#
+# SPI Transaction Queue
+#
+
+import ri_sim
+
+from robotindustries_pi import Scheduler, SPIDevice, SPITransactionQueue
+
+def test_latest_frame_wins():
+	scheduler = Scheduler()
+	scheduler.running = True
+
+	queue = SPITransactionQueue(scheduler)
+	first = SPIDevice(0, 0)
+	second = SPIDevice(0, 1)
+
+	queue.write(first, b"\x01\x01")
+	queue.write(second, b"\x02")
+	queue.write(first, b"\x03\x03")
+
+	assert queue.pending() == 2
+	assert queue.superseded == 1
+
+	ri_sim.recorder.clear()
+
+	assert queue.flush() == 2
+	assert [ entry.data for entry in ri_sim.recorder.transfers("spi") ] == [ b"\x02", b"\x03\x03" ]